@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+# vcd.py and timeline.py are scripts next to this directory, not a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def write_vcd(path, rows, period=10, names=("pc_if", "pc_id", "pc_ex", "pc_mem", "pc_wb"), extra=""):
+    """A dump of the given signals, one row of values per cycle (changes only, at period * cycle)."""
+    ids = [chr(34 + i) for i in range(len(names))]
+    out = ["$timescale 1ns $end", "$scope module TOP $end", "$scope module core $end", "$var wire 1 ! clock $end"]
+    out += [f"$var wire 32 {i} {n} $end" for i, n in zip(ids, names)]
+    out += ["$upscope $end", "$upscope $end", "$enddefinitions $end"]
+    prev = [None] * len(names)
+    for c, row in enumerate(rows):
+        out.append(f"#{period * c}")
+        out.append("1!")
+        for j, v in enumerate(row):
+            if v != prev[j]:
+                out.append(f"b{v:b} {ids[j]}")
+                prev[j] = v
+        if c == 2 and extra: out.append(extra)
+        out.append(f"#{period * c + period // 2}")
+        out.append("0!")
+    Path(path).write_text("\n".join(out) + "\n")
+    return str(path)
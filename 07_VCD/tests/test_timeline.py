@@ -0,0 +1,53 @@
+import sys
+import numpy as np
+from conftest import write_vcd
+import timeline
+from timeline import Timeline, open_stages, window
+
+
+def pipeline(n, stall_every=7, base=0x100):
+    """Stage PCs of a 5-stage pipeline running a 6-instruction loop, with a load-use stall every few
+    cycles (IF/ID hold, a bubble (0) goes into EX)."""
+    stages, nxt, rows = [0] * 5, 0, []
+    for c in range(n):
+        if c % stall_every == 3: stages = stages[:2] + [0] + stages[2:4]
+        else:
+            stages = [base + 4 * (nxt % 6)] + stages[:4]
+            nxt += 1
+        rows.append(tuple(stages))
+    return rows
+
+
+def test_instances_follow_stalls_and_loops(tmp_path):
+    stream, names = open_stages(write_vcd(tmp_path / "p.vcd", pipeline(60)))
+    tl = Timeline(stream.load(), names)
+    assert (tl.period, tl.n_cycles) == (10, 60)
+    first = np.flatnonzero(tl.pc == 0x100)[0]
+    assert tl.start[first].tolist() == [0, 1, 2, 3, 4]
+    held = np.flatnonzero(tl.start[:, 0] == 2)[0]                  # in IF when the stall at cycle 3 hit
+    assert tl.start[held].tolist() == [2, 4, 5, 6, 7] and tl.end[held, 0] == 4
+    assert (tl.pc == 0x100).sum() > 5                               # the loop comes round again: new instances
+    text = tl.render_text(0, 8, {0x100: "addi x1, x1, 1"})
+    assert text.splitlines()[1].startswith("0x0100 addi x1, x1, 1") and " IF " in text
+
+
+def test_a_window_matches_the_whole_dump(tmp_path):
+    stream, names = open_stages(write_vcd(tmp_path / "p.vcd", pipeline(3000)))
+    whole = Timeline(stream.load(), names)
+    for c0 in (0, 5, 1234, 2960):
+        tl = window(stream, names, c0, c0 + 40)
+        assert tl.n_cycles <= c0 + 41                                 # nothing after the window was read
+        assert tl.render_text(c0, c0 + 40, {}) == whole.render_text(c0, c0 + 40, {}), c0
+
+
+def test_main_renders_one_labelled_window(tmp_path, capsys):
+    path = write_vcd(tmp_path / "p.vcd", pipeline(500))
+    rom = tmp_path / "rom.hex"
+    rom.write_text("\n".join(["00000013"] * 64 + ["00108093 // addi x1, x1, 1"] + ["00000013"] * 5) + "\n")
+    timeline.main([path, "--rom", str(rom), "--from-cycle", "200", "--cycles", "10"])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].split()[1:] == [str(c) for c in range(200, 210)]
+    assert any(l.startswith("0x0100 addi x1, x1, 1") for l in out)
+    timeline.main([path, "--rom", str(rom), "--from-cycle", "200", "--html", str(tmp_path / "t.html")])
+    assert "<td style=" in (tmp_path / "t.html").read_text()
+    assert str(timeline.RISCV_CORE) not in sys.path and timeline.decode_rv32i(0x13) == "nop"
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from conftest import write_vcd
+from vcd import VCDStream, value_at
+
+
+def counters(n):
+    return [(c, 2 * c, c // 3) for c in range(n)]
+
+
+def test_selected_signals_by_short_or_full_name(tmp_path):
+    path = write_vcd(tmp_path / "a.vcd", counters(50), names=("a", "b", "c"))
+    s = VCDStream(path, ["a", "TOP.core.c"])
+    assert s.timescale == "1ns" and s.widths == {"a": 32, "TOP.core.c": 32}
+    sig = s.load()
+    assert sig["a"][0].tolist() == list(range(0, 500, 10)) and sig["a"][1].tolist() == list(range(50))
+    assert sig["TOP.core.c"][1].tolist() == list(range(17))              # changes only
+    with pytest.raises(KeyError):
+        VCDStream(path, ["a", "missing"])
+
+
+def test_windows_start_defined_with_or_without_the_index(tmp_path):
+    path = write_vcd(tmp_path / "a.vcd", counters(2000), names=("a", "b", "c"), extra="bx101 $")
+    s = VCDStream(path, ["a", "c"], index_every=4096)
+    plain = s.load(7005, 7200)
+    assert plain["c"][0].tolist() == [7005, 7020, 7050, 7080, 7110, 7140, 7170, 7200]
+    assert plain["c"][1][0] == 700 // 3                                 # the value in effect at t0
+    assert plain["a"][1].tolist() == list(range(700, 721)) and plain["a"][0][0] == 7005
+
+    assert len(s.build_index()) > 3
+    indexed = s.load(7005, 7200)
+    for name in ("a", "c"):
+        assert all(np.array_equal(x, y) for x, y in zip(plain[name], indexed[name]))
+    assert s.head(4)["a"][1].tolist() == [0, 1, 2] and s.head(4)["c"][1].tolist() == [0]
+    t, v = s.load()["c"]
+    assert value_at(t, v, np.array([0, 15, 35, 19990])).tolist() == [0, 0, 1, 666]
+
+
+def test_x_and_z_bits_read_as_zero(tmp_path):
+    path = write_vcd(tmp_path / "a.vcd", counters(5), names=("a", "b", "c"), extra="bx1z1 #")
+    assert VCDStream(path, ["b"]).load()["b"][1].tolist() == [0, 2, 5, 6, 8]      # x1z1 replaces 4 at #20
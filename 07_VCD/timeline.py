@@ -0,0 +1,199 @@
+import argparse
+import html
+import importlib.util
+from pathlib import Path
+import numpy as np
+from vcd import VCDStream, STAGES
+
+# The decoder lives with the live debugger of the pipelined core
+RISCV_CORE = Path(__file__).resolve().parent.parent / "08_pipelined_RISC-V_core_LOAD_STORE" / "RISC-V_Core"
+
+
+def _load_decoder():
+    """live_debug.decoder when it is importable, else that one module loaded from the core's tree
+    (it has no package-relative imports), leaving sys.path alone."""
+    try:
+        from live_debug import decoder
+        return decoder
+    except ImportError:
+        spec = importlib.util.spec_from_file_location("live_debug_decoder", RISCV_CORE / "live_debug" / "decoder.py")
+        decoder = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(decoder)
+        return decoder
+
+
+decode_rv32i = _load_decoder().decode_rv32i
+
+# Stage PC signal names of the hazard-detection core and of the debug bus of PipelinedRV32I
+DBG_STAGES = ["io_dbg_if_pc", "io_dbg_id_pc", "io_dbg_ex_pc", "io_dbg_mem_pc", "io_dbg_wb_pc"]
+NAMES = ["IF", "ID", "EX", "MEM", "WB"]
+LEAD = 16            # cycles loaded before a window, so instructions already in flight are linked
+COLORS = ["#fff3a8", "#8df28d", "#8fd3ff", "#ff8ff0", "#aef7f7"]
+
+
+def load_rom(path):
+    """Instruction words of a hex program file (one word per line, // comments allowed)."""
+    words = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("//")[0].strip()
+            if line: words.append(int(line, 16))
+    return words
+
+
+def rom_labels(words):
+    return {4 * i: decode_rv32i(w) for i, w in enumerate(words)}
+
+
+class Timeline:
+    """Per-instruction stage intervals built from the five stage-PC signals.
+
+    Every instruction instance has a [start, end) cycle interval per stage (-1 if it never got
+    there, e.g. because it was flushed). Instances are linked stage to stage by PC and by the
+    next stage starting exactly where the previous one ended, so stalls and repeated PCs in loops
+    are tracked correctly. Cycles count from `t0` (default: the first change), so a Timeline of a
+    window of the dump keeps the cycle numbers of the whole dump.
+    """
+
+    def __init__(self, signals, stages=STAGES, period=None, t0=None):
+        pcs = [signals[s] for s in stages]
+        t_first = min(int(t[0]) for t, _ in pcs if len(t)) if t0 is None else t0    # time of cycle 0
+        if period is None: period = infer_period(pcs)
+        self.period, self.t0 = period, t_first
+
+        runs = []
+        for times, values in pcs:
+            cyc = (times.astype(np.int64) - t_first) // period
+            last = np.append(cyc[1:] != cyc[:-1], True)          # settle glitches within a cycle
+            cyc, vals = cyc[last], values[last]
+            first = np.insert(vals[1:] != vals[:-1], 0, True)    # drop re-dumps of the same PC
+            cyc, vals = cyc[first], vals[first]
+            ends = np.append(cyc[1:], cyc[-1] + 1 if len(cyc) else 0)
+            runs.append((cyc, ends, vals))
+        self.n_cycles = int(max(r[1][-1] for r in runs if len(r[1])))
+
+        # IF runs open the instances; later stages are matched in a single pass each
+        if_start, if_end, if_pc = runs[0]
+        n = len(if_start)
+        self.pc = if_pc.astype(np.int64)
+        self.start = np.full((n, len(stages)), -1, dtype=np.int64)
+        self.end = np.full((n, len(stages)), -1, dtype=np.int64)
+        self.start[:, 0], self.end[:, 0] = if_start, if_end
+        for k in range(1, len(stages)):
+            s, e, v = runs[k]
+            order = np.argsort(self.end[:, k - 1], kind="stable")
+            pending = {}
+            for i in order:
+                if self.end[i, k - 1] >= 0: pending.setdefault(int(self.pc[i]), []).append(i)
+            heads = dict.fromkeys(pending, 0)
+            for rs, re_, pc in zip(s.tolist(), e.tolist(), v.tolist()):
+                q = pending.get(pc)
+                if q is None: continue
+                h = heads[pc]
+                while h < len(q) and self.end[q[h], k - 1] < rs: h += 1
+                if h < len(q) and self.end[q[h], k - 1] == rs:
+                    self.start[q[h], k], self.end[q[h], k] = rs, re_
+                    h += 1
+                heads[pc] = h
+
+    def select(self, c0, c1, i0=0, i1=None):
+        """Indices of instances with any stage in [c0, c1), optionally limited to rows [i0, i1)."""
+        live = (self.start < c1) & (self.end > c0) & (self.start >= 0)
+        rows = np.flatnonzero(live.any(axis=1))
+        return rows[i0:i1]
+
+    def grid(self, rows, c0, c1):
+        """(len(rows), c1-c0) array of stage numbers (1..5, 0 = empty)."""
+        g = np.zeros((len(rows), c1 - c0), dtype=np.int8)
+        st = np.clip(self.start[rows] - c0, 0, c1 - c0)
+        en = np.clip(self.end[rows] - c0, 0, c1 - c0)
+        for r in range(len(rows)):
+            for k in range(self.start.shape[1]):
+                if self.start[rows[r], k] >= 0: g[r, st[r, k]:en[r, k]] = k + 1
+        return g
+
+    def label(self, i, labels):
+        pc = int(self.pc[i])
+        return f"0x{pc:04x} {labels.get(pc, '?')}"
+
+    def render_text(self, c0, c1, labels, i0=0, i1=None):
+        width = max(5, len(str(c1)) + 1)
+        rows = self.select(c0, c1, i0, i1)
+        g = self.grid(rows, c0, c1)
+        cells = np.array([" " * width] + [n.center(width) for n in NAMES])
+        head = "Instruction".ljust(28) + "".join(f"{c:>{width}}" for c in range(c0, c1))
+        lines = [head]
+        for r, i in enumerate(rows):
+            lines.append(self.label(i, labels)[:27].ljust(28) + "".join(cells[g[r]]))
+        return "\n".join(lines)
+
+    def render_html(self, c0, c1, labels, i0=0, i1=None):
+        rows = self.select(c0, c1, i0, i1)
+        g = self.grid(rows, c0, c1)
+        cells = [""] + [f'<td style="background:{c}">{n}</td>' for n, c in zip(NAMES, COLORS)]
+        out = ["<!DOCTYPE html><html><head><meta charset='utf-8'><title>Pipeline timeline</title>",
+               "<style>body{font-family:monospace;background:#1e1e1e;color:#ddd}"
+               "table{border-collapse:collapse}td,th{border:1px solid #333;padding:1px 4px;text-align:center;color:#000}"
+               "th,td.l{color:#ddd;text-align:left;white-space:nowrap}</style></head><body><table>",
+               "<tr><th>Instruction</th>" + "".join(f"<th>{c}</th>" for c in range(c0, c1)) + "</tr>"]
+        for r, i in enumerate(rows):
+            tds = "".join(cells[k] or "<td></td>" for k in g[r])
+            out.append(f'<tr><td class="l">{html.escape(self.label(i, labels))}</td>{tds}</tr>')
+        out.append("</table></body></html>")
+        return "\n".join(out)
+
+
+def infer_period(pcs):
+    """Clock period: the smallest gap between successive stage-PC changes."""
+    gaps = [np.diff(t.astype(np.int64)) for t, _ in pcs if len(t) > 1]
+    gaps = np.concatenate(gaps) if gaps else np.array([1])
+    gaps = gaps[gaps > 0]
+    return int(gaps.min()) if len(gaps) else 1
+
+
+def window(stream, names, c0, c1, period=None):
+    """Timeline of cycles [c0, c1) (and LEAD cycles before), loading only that part of the dump."""
+    first = stream.head()
+    origin = min(int(t[0]) for t, _ in first.values() if len(t))
+    if period is None: period = infer_period([first[s] for s in names])
+    t0 = origin + max(0, c0 - LEAD) * period
+    return Timeline(stream.load(t0, origin + c1 * period), names, period, t0=origin)
+
+
+def open_stages(path):
+    """Load the stage-PC signals, trying the hazard-detection names first, then the debug bus."""
+    for names in (STAGES, DBG_STAGES):
+        try:
+            return VCDStream(path, names), names
+        except KeyError:
+            continue
+    raise KeyError(f"no stage PC signals found in {path}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pipeline occupancy timeline from a VCD trace")
+    ap.add_argument("vcd", nargs="?", default="HazardDetectionRV32I.vcd")
+    ap.add_argument("--rom", default=str(RISCV_CORE / "src/test/programs/BinaryFile"))
+    ap.add_argument("--from-cycle", type=int, default=0)
+    ap.add_argument("--cycles", type=int, default=40)
+    ap.add_argument("--first-row", type=int, default=0)
+    ap.add_argument("--rows", type=int, default=None)
+    ap.add_argument("--period", type=int, default=None, help="VCD time units per cycle (inferred if omitted)")
+    ap.add_argument("--html", default=None, help="write a self-contained HTML file instead of text")
+    args = ap.parse_args(argv)
+
+    stream, names = open_stages(args.vcd)
+    c0 = args.from_cycle
+    tl = window(stream, names, c0, c0 + args.cycles, args.period)
+    labels = rom_labels(load_rom(args.rom)) if Path(args.rom).exists() else {}
+    c1 = min(c0 + args.cycles, tl.n_cycles)
+    i1 = None if args.rows is None else args.first_row + args.rows
+    if args.html:
+        Path(args.html).write_text(tl.render_html(c0, c1, labels, args.first_row, i1))
+        print(f"Wrote {args.html}")
+    else:
+        print(tl.render_text(c0, c1, labels, args.first_row, i1))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,161 @@
-from vcdvcd import VCDVCD
-import collections
-
-vcd = VCDVCD("HazardDetectionRV32I.vcd", signals=["pc_if", "pc_id", "pc_ex", "pc_mem", "pc_wb"], store_tvs=True)
-
-# Reverse map: pc → instruction label (optional, if you know them)
-pc_to_instr = {
-    0x00: "0x00000013",  # NOP
-    0x04: "0x00400093",  # ADDI x1, x0, 4
-    0x08: "0x00500113",  # ADDI x2, x0, 5
-    # ...
-}
-
-# Create a structure: instr → list of stage per cycle
-instr_timeline = collections.defaultdict(lambda: {})
-
-# Get time steps
-times = sorted(set(t for sig in vcd.data.values() for t, _ in sig.tv))
-
-# For each stage
-stages = ["pc_if", "pc_id", "pc_ex", "pc_mem", "pc_wb"]
-for stage in stages:
-    tv = vcd[stage].tv  # [(time, value)]
-
-    last_value = None
-    for t, val in tv:
-        pc = int(val, 16)
-        instr = pc_to_instr.get(pc, f"0x{pc:08x}")
-        instr_timeline[instr][t] = stage
-
-# Print a timeline table
-print("Instruction".ljust(15), end="")
-for t in times:
-    print(f"{t:>8}", end="")
-print()
-for instr, time_dict in instr_timeline.items():
-    print(instr.ljust(15), end="")
-    for t in times:
-        stage = time_dict.get(t, "")
-        print(stage.replace("pc_", "").center(8), end="")
-    print()
+import bisect
+import itertools
+import re
+from array import array
+import numpy as np
+
+STAGES = ["pc_if", "pc_id", "pc_ex", "pc_mem", "pc_wb"]
+CHUNK = 1 << 22
+
+
+class VCDStream:
+    """Streaming VCD reader that only keeps the requested signals.
+
+    The dump is scanned in fixed-size chunks with a regex that only matches timestamps and the
+    selected id codes. Changes go into compact uint64 arrays (signals up to 64 bits wide), so
+    memory grows with the changes of the selected signals, not with the size of the dump.
+    A sparse (time, byte offset) index lets window queries seek instead of rescanning.
+    """
+
+    def __init__(self, path, signals, index_every=1 << 22):
+        self.path = path
+        self.signals = list(signals)
+        self.index_every = index_every
+        self.ids = {}          # id code -> requested names
+        self.widths = {}
+        self.timescale = ""
+        self.data_offset = 0
+        self._index = None     # [(time, offset, {name: value})]
+        self._parse_header()
+
+    def _parse_header(self):
+        scope, found = [], {}
+        with open(self.path, "rb") as f:
+            offset, in_timescale = 0, False
+            for raw in f:
+                offset += len(raw)
+                tok = raw.split()
+                if not tok: continue
+                if in_timescale:
+                    if tok[0] != b"$end": self.timescale += b" ".join(t for t in tok if t != b"$end").decode()
+                    in_timescale = tok[-1] != b"$end"
+                elif tok[0] == b"$timescale":
+                    self.timescale = b" ".join(tok[1:-1] if tok[-1] == b"$end" else tok[1:]).decode()
+                    in_timescale = tok[-1] != b"$end"
+                elif tok[0] == b"$scope": scope.append(tok[2].decode())
+                elif tok[0] == b"$upscope": scope.pop()
+                elif tok[0] == b"$var":
+                    width, code, name = int(tok[2]), tok[3].decode(), tok[4].decode()
+                    full = ".".join(scope + [name])
+                    for want in self.signals:
+                        if want not in found and want in (full, name):
+                            found[want] = code
+                            self.ids.setdefault(code, []).append(want)
+                            self.widths[want] = width
+                elif tok[0] == b"$enddefinitions":
+                    self.data_offset = offset
+                    break
+        missing = [s for s in self.signals if s not in found]
+        if missing: raise KeyError(f"signals not in {self.path}: {missing}")
+
+    def _changes(self, offset=None, t_stop=None, index=False):
+        """Yield (time, name, value) for the selected signals, optionally recording index checkpoints."""
+        ids, t, values = self.ids, 0, {}
+        codes = b"|".join(re.escape(c.encode()) for c in sorted(ids, key=len, reverse=True))
+        pat = re.compile(rb"^(?:#(\d+)|[bB]([01xXzZ]+) (" + codes + rb")|([01xXzZ])(" + codes + rb"))\r?$", re.M)
+        next_mark = 0
+        with open(self.path, "rb") as f:
+            pos = self.data_offset if offset is None else offset
+            f.seek(pos)
+            tail = b""
+            while True:
+                chunk = f.read(CHUNK)
+                buf = tail + chunk
+                cut = buf.rfind(b"\n") + 1 if chunk else len(buf)
+                base = pos - len(tail)
+                for m in pat.finditer(buf, 0, cut):
+                    ts, vec, vcode, bit, bcode = m.groups()
+                    if ts is not None:
+                        t = int(ts)
+                        if t_stop is not None and t > t_stop: return
+                        if index and base + m.start() >= next_mark:
+                            self._index.append((t, base + m.start(), dict(values)))
+                            next_mark = base + m.start() + self.index_every
+                        continue
+                    if vec is not None:
+                        names, v = ids[vcode.decode()], int(vec, 2) if vec.isdigit() else _bits(vec)
+                    else:
+                        names, v = ids[bcode.decode()], 1 if bit == b"1" else 0
+                    for name in names:
+                        if index: values[name] = v
+                        yield t, name, v
+                if not chunk: return
+                tail = buf[cut:]
+                pos += len(chunk)
+
+    def build_index(self):
+        """One streaming pass that records a checkpoint every `index_every` bytes."""
+        self._index = []
+        for _ in self._changes(index=True): pass
+        return self._index
+
+    def load(self, t0=None, t1=None):
+        """Return {signal: (times, values)} as uint64 arrays, restricted to [t0, t1] if given.
+
+        The value in effect at t0 is reported at t0, so every window starts fully defined.
+        Without an index the scan starts at the top of the file; call build_index() once
+        before issuing many windows deep into a large dump.
+        """
+        times = {s: array("Q") for s in self.signals}
+        vals = {s: array("Q") for s in self.signals}
+
+        def put(name, t, v):
+            ts = times[name]
+            if ts and ts[-1] == t: vals[name][-1] = v
+            else: ts.append(t); vals[name].append(v)
+
+        offset, before = None, None
+        if t0 is not None:
+            before = {}
+            if self._index:
+                k = bisect.bisect_right([c[0] for c in self._index], t0) - 1
+                if k >= 0: offset, before = self._index[k][1], dict(self._index[k][2])
+        for t, name, v in self._changes(offset, t1):
+            if before is not None:
+                if t < t0:
+                    before[name] = v
+                    continue
+                for n, bv in before.items(): put(n, t0, bv)
+                before = None
+            put(name, t, v)
+        for n, bv in (before or {}).items(): put(n, t0, bv)
+        return {s: (np.frombuffer(times[s], dtype=np.uint64), np.frombuffer(vals[s], dtype=np.uint64))
+                for s in self.signals}
+
+    def window(self, t0, t1):
+        return self.load(t0, t1)
+
+    def head(self, n=256):
+        """{signal: (times, values)} of the first n changes only: a cheap look at the start of the dump."""
+        out = {s: ([], []) for s in self.signals}
+        for t, name, v in itertools.islice(self._changes(), n):
+            out[name][0].append(t)
+            out[name][1].append(v)
+        return {s: (np.array(ts, dtype=np.uint64), np.array(vs, dtype=np.uint64)) for s, (ts, vs) in out.items()}
+
+
+def _bits(val):
+    """Binary vector value with x/z bits read as 0."""
+    return int(val.translate(bytes.maketrans(b"xXzZ", b"0000")), 2)
+
+
+def value_at(times, values, t):
+    """Value of a (times, values) signal at time t (0 before its first change)."""
+    i = np.searchsorted(times, t, side="right") - 1
+    return np.where(i >= 0, values[np.maximum(i, 0)], 0)
+
+
+if __name__ == "__main__":
+    # The table printer grew into timeline.py (windowed, ROM-labelled, text or HTML)
+    from timeline import main
+    main()
@@ -0,0 +1,56 @@
+"""Pipeline analytics on a 1M-cycle trace: vectorized columns vs a per-snapshot Python loop.
+
+    python -m benchmarks.bench_analytics --cycles 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from live_debug import trace
+from live_debug.analytics import analyze, trace_columns
+from .synthetic import synthetic_records
+
+def loop_stats(snaps):
+    """The same totals the straightforward way: one dict per cycle."""
+    retired = stall = flush = 0
+    caused = Counter()
+    for s in snaps:
+        if s["instr"]["wb"] != 0x13 or s["pc"]["wb"]: retired += 1
+        if s["hazard"]["if_stall"] or s["hazard"]["id_stall"]:
+            stall += 1
+            caused[s["pc"]["ex"]] += 1
+        flush += s["hazard"]["flush"]
+    return retired, stall, flush, caused
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=1_000_000)
+    ap.add_argument("--loop-cycles", type=int, default=100_000, help="cycles for the (slow) loop baseline")
+    args = ap.parse_args()
+    n = args.cycles
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "run.rvt")
+        with trace.TraceWriter(path, [0x002081B3] * 16) as w:
+            w.f.write(synthetic_records(n).tobytes())   # records are plain DTYPE rows after the header
+
+        t0 = time.perf_counter()
+        r = trace.TraceReader(path)
+        report = analyze(trace_columns(r), r.rom)
+        t_vec = time.perf_counter() - t0
+
+        m = min(n, args.loop_cycles)
+        t0 = time.perf_counter()
+        retired, stall, flush, _ = loop_stats(r[i] for i in range(m))
+        t_loop = (time.perf_counter() - t0) * n / m
+        sub = analyze({k: v[:m] for k, v in trace_columns(r).items()}, stop_at_done=False)
+        assert (sub["retired"], sub["stall_cycles"], sub["flush_cycles"]) == (retired, stall, flush)
+
+        print(f"{n} cycles: CPI {report['cpi']:.3f}, {report['stall_cycles']} stall / {report['flush_cycles']} flush cycles")
+        print(f"vectorized  {t_vec*1e3:8.0f} ms ({n/t_vec/1e6:.1f} M cycles/s)")
+        print(f"dict loop   {t_loop*1e3:8.0f} ms (extrapolated from {m} cycles)   {t_loop/t_vec:5.1f}x slower")
+        del r
+
+if __name__ == "__main__":
+    main()
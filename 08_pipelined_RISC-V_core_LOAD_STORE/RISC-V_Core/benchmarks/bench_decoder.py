@@ -0,0 +1,38 @@
+
+"""Table-driven, cached decoder vs the original closure-per-call decode_rv32i
+(tests/test_decoder.py checks that they agree).
+
+    python -m benchmarks.bench_decoder
+"""
+import random
+import time
+import numpy as np
+from live_debug import decoder
+from . import legacy_decoder
+
+def rate(fn, words):
+    t0 = time.perf_counter()
+    for w in words: fn(w)
+    return len(words) / (time.perf_counter() - t0)
+
+def main():
+    rom = [int(l, 16) for l in open("src/test/programs/BinaryFile") if l.strip()]
+    random.seed(0)
+    # 5 stage decodes per snapshot over a few hundred distinct words, like the live tools
+    pool = rom + [random.getrandbits(32) for _ in range(300)]
+    hot = [random.choice(pool) for _ in range(200000)]
+    cold = [random.getrandbits(32) for _ in range(200000)]
+
+    old, new = rate(legacy_decoder.decode_rv32i, hot), rate(decoder.decode_rv32i, hot)
+    print(f"hot words   legacy {old:12.0f}/s   cached {new:12.0f}/s   {new/old:5.1f}x")
+    decoder.clear_cache()
+    old, new = rate(legacy_decoder.decode_rv32i, cold), rate(decoder.decode_rv32i, cold)
+    print(f"cold words  legacy {old:12.0f}/s   tables {new:12.0f}/s   {new/old:5.1f}x")
+
+    trace = np.array(hot * 5, dtype=np.uint32)
+    t0 = time.perf_counter()
+    decoder.decode_array(trace)
+    print(f"decode_array {len(trace)/(time.perf_counter()-t0):11.0f}/s on a {len(trace)}-word trace")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Per-cycle CPU time and memory of the web server's snapshot handling.
+
+before: every simulated cycle is deep-copied, enriched and kept as a raw+enriched packet
+after:  the history keeps one compact copy; only the cycles a viewer looks at are enriched (memoized)
+
+    python -m benchmarks.bench_enrichment --cycles 20000 --view-every 100
+"""
+import argparse
+import copy
+import time
+import tracemalloc
+from live_debug.history import SnapshotHistory
+from web_visualizer import server
+from web_visualizer.server import process_snapshot, extract_registers, safe_int, decode_rv32i
+from .fake_chisel import make_snapshot
+
+def legacy_process_snapshot(raw_data):
+    """The deepcopy-based enrichment the server used to run on every cycle."""
+    data = copy.deepcopy(raw_data)
+    data['asm'], data['pc_hex'] = {}, {}
+    for stage in ['if', 'id', 'ex', 'mem', 'wb']:
+        data['asm'][stage] = decode_rv32i(safe_int(data.get('instr', {}).get(stage, 0)))
+        data['pc_hex'][stage] = f"0x{safe_int(data.get('pc', {}).get(stage, 0)):08x}"
+    regs_list = [0] * 32
+    for k, v in data.get("regs", {}).items():
+        regs_list[int(k.replace("x", ""))] = safe_int(v)
+    data['ex']['val_a'] = safe_int(data['ex'].get('alu_op_a', 0))
+    data['ex']['val_b'] = safe_int(data['ex'].get('alu_op_b', 0))
+    data['id_info'] = extract_registers(data.get('instr', {}).get('id', 0))
+    return {"raw": raw_data, "enriched": data, "registers": regs_list}
+
+def traced(fn):
+    tracemalloc.start()
+    t0 = time.process_time()
+    obj = fn()
+    dt = time.process_time() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, mem, dt
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=20000)
+    ap.add_argument("--view-every", type=int, default=100, help="a viewer looks at every k-th cycle (run N)")
+    args = ap.parse_args()
+    snaps = [make_snapshot(c) for c in range(args.cycles)]
+    n = args.cycles
+
+    _, mem, dt = traced(lambda: [legacy_process_snapshot(s) for s in snaps])
+    print(f"before  {dt/n*1e6:8.1f} us/cycle  {mem/n:8.0f} B/cycle")
+
+    def after():
+        server.session.history = h = SnapshotHistory()
+        server._packets.clear()
+        for c, s in enumerate(snaps):
+            h.append(s)
+            if c % args.view_every == 0: server.packet_at(c)
+        return h
+    _, mem, dt = traced(after)
+    print(f"after   {dt/n*1e6:8.1f} us/cycle  {mem/n:8.0f} B/cycle  (view every {args.view_every})")
+
+    # Per-call cost of building one packet, and of serving it again from the memo
+    k = min(n, 5000)
+    t0 = time.process_time()
+    for s in snaps[:k]: legacy_process_snapshot(s)
+    t1 = time.process_time()
+    for s in snaps[:k]: process_snapshot(s)
+    t2 = time.process_time()
+    for c in range(0, n, args.view_every): server.packet_at(c)
+    t3 = time.process_time()
+    hits = len(range(0, n, args.view_every))
+    print(f"enrich  deepcopy {(t1-t0)/k*1e6:6.1f} us   shallow {(t2-t1)/k*1e6:6.1f} us   memo hit {(t3-t2)/hits*1e6:6.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Long run to an interesting cycle: `ff` (every snapshot comes back) vs `sub` + `go` (only events).
+
+    python -m benchmarks.bench_events --cycles 200000
+
+The simulator is the replay server in a child process, serving the synthetic trace of
+bench_analytics (a taken branch every 40 cycles). Python-side cost and bytes received are compared;
+LivePipelineTest also skips serializing the cycles it does not send.
+"""
+import argparse
+import os
+import tempfile
+import time
+from live_debug import trace
+from live_debug.client import LiveClient
+from live_debug.replay import serve_in_background
+from live_debug.launcher import free_port
+from .synthetic import synthetic_records
+
+class CountingClient(LiveClient):
+    """LiveClient that counts the bytes it reads."""
+    received = 0
+
+    def read_raw(self):
+        raw = super().read_raw()
+        self.received += len(raw) if isinstance(raw, bytes) else 5 + len(raw[1])
+        return raw
+
+def session(port, proto, run):
+    c = CountingClient("localhost", port, proto=proto)
+    c.connect()
+    c.hello()
+    c.received = 0
+    t0 = time.perf_counter()
+    run(c)
+    dt = time.perf_counter() - t0
+    n, got = len(c.history) - 1, c.received
+    c.close()
+    return dt, n, got
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=200_000)
+    ap.add_argument("--events", default="write=x31", help="subscription for go (default: never fires)")
+    args = ap.parse_args()
+    n = args.cycles
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "run.rvt")
+        with trace.TraceWriter(path, [0x002081B3] * 16) as w:
+            w.f.write(synthetic_records(n + 1).tobytes())
+        port = free_port()
+        proc = serve_in_background(path, "localhost", port)
+        time.sleep(0.5)
+        try:
+            for proto in ("json", "binary"):
+                dt, kept, got = session(port, proto, lambda c: c.fast_forward(n))
+                print(f"ff {n} ({proto:6})           {dt:6.2f}s  {kept:7} snapshots kept  {got / 2**20:7.1f} MiB")
+            for events in (args.events, "flush"):
+                def go(c):
+                    c.subscribe(events)
+                    c.go(n, 0)
+                dt, kept, got = session(port, "binary", go)
+                print(f"go {n} sub {events:<10} {dt:6.2f}s  {kept:7} snapshots kept  {got / 2**20:7.1f} MiB")
+        finally:
+            proc.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+
+"""Memory per cycle of a plain snapshot list vs SnapshotHistory.
+
+    python -m benchmarks.bench_history --cycles 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from live_debug.history import SnapshotHistory
+from .fake_chisel import make_snapshot
+
+def traced(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = fn()
+    dt = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, mem, dt
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=1000000)
+    ap.add_argument("--list-cycles", type=int, default=20000, help="the plain list is measured on fewer cycles")
+    ap.add_argument("--keyframe-every", type=int, default=64)
+    ap.add_argument("--max-mb", type=int, default=0)
+    args = ap.parse_args()
+
+    _, mem, _ = traced(lambda: [make_snapshot(c) for c in range(args.list_cycles)])
+    print(f"list of dicts      {mem/args.list_cycles:10.0f} B/cycle  (~{mem/args.list_cycles*args.cycles/2**20:.0f} MiB for {args.cycles} cycles)")
+
+    def fill():
+        h = SnapshotHistory(args.keyframe_every, args.max_mb * 2**20 or None)
+        for c in range(args.cycles): h.append(make_snapshot(c))
+        return h
+    h, mem, dt = traced(fill)
+    kept = len(h) - h.start
+    print(f"SnapshotHistory    {mem/kept:10.0f} B/cycle  ({mem/2**20:.0f} MiB for {kept} retained cycles, "
+          f"estimate {h.bytes_per_entry():.0f} B/cycle, append {dt/args.cycles*1e6:.1f} us/cycle)")
+
+    idx = [random.randrange(h.start, len(h)) for _ in range(2000)]
+    t0 = time.perf_counter()
+    for i in idx: h[i]
+    print(f"random access      {(time.perf_counter()-t0)/len(idx)*1e6:10.1f} us/lookup")
+    t0 = time.perf_counter()
+    for i in range(len(h) - 2000, len(h)): h[i]
+    print(f"sequential access  {(time.perf_counter()-t0)/2000*1e6:10.1f} us/lookup")
+
+if __name__ == "__main__":
+    main()
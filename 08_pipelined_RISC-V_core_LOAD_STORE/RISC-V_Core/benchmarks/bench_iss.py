@@ -0,0 +1,74 @@
+"""Instruction-set simulator: raw speed, recorded stepping, a fast-forward over the protocol, co-simulation.
+
+    python -m benchmarks.bench_iss --instructions 2000000
+
+The program is a counting loop (addi / addi / bne) that ends with unimp. For scale, compare the
+cycles per second bench_stepping reports for the simulator.
+"""
+import argparse
+import os
+import tempfile
+import time
+from live_debug.client import LiveClient
+from live_debug.iss import Cosim, Iss, serve_in_background
+from live_debug.launcher import free_port
+
+def loop_program(n: int):
+    """x1 counts to x2 = n // 3 (three instructions per iteration), then unimp."""
+    hi, lo = (n // 3 + 0x800) >> 12, (n // 3) & 0xFFF
+    lo -= (lo & 0x800) << 1
+    return [0x00000093, (hi << 12) | 0x137, ((lo & 0xFFF) << 20) | 0x10113,          # x1 = 0, x2 = n // 3
+            0x00108093, 0x00318193, 0xFE209CE3, 0xC0001073]                        # loop: x1++, x3 += 3, bne
+
+def rate(n, dt): return f"{n / dt / 1e6:6.2f} M/s"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--instructions", type=int, default=2_000_000)
+    args = ap.parse_args()
+    n = args.instructions
+    prog = loop_program(n)
+
+    iss = Iss(prog)
+    t0 = time.perf_counter()
+    done = iss.run(10 * n)
+    dt = time.perf_counter() - t0
+    print(f"run (pre-decoded closures)   {done:9} instructions  {dt:6.2f}s  {rate(done, dt)}")
+
+    iss, k = Iss(prog), min(n, 200_000)
+    t0 = time.perf_counter()
+    for _ in range(k): iss.step()
+    dt = time.perf_counter() - t0
+    print(f"step (with retirement info)  {k:9} instructions  {dt:6.2f}s  {rate(k, dt)}")
+
+    snaps = []
+    iss = Iss(prog)
+    for _ in range(k): snaps.append({"cycle": iss.retired, "wb": {"we": 1, "rd": (t := iss.step()).rd, "wdata": t.wdata},
+                                    "pc": {"wb": t.pc}})
+    c = Cosim(prog)
+    t0 = time.perf_counter()
+    for s in snaps: c.add(s)
+    dt = time.perf_counter() - t0
+    print(f"cosim (a write-back a cycle) {k:9} snapshots     {dt:6.2f}s  {rate(k, dt)}  {c.status()}")
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "loop.hex")
+        with open(path, "w") as f: f.write("\n".join(f"{w:08x}" for w in prog) + "\n")
+        port = free_port()
+        proc = serve_in_background(path, "localhost", port)
+        time.sleep(0.3)
+        try:
+            cl = LiveClient("localhost", port)
+            cl.connect()
+            cl.hello()
+            t0 = time.perf_counter()
+            cl.go(10 * n, 0)
+            dt = time.perf_counter() - t0
+            print(f"go over the protocol         {cl.history[-1]['cycle']:9} instructions  {dt:6.2f}s  "
+                  f"{rate(cl.history[-1]['cycle'], dt)}  ({cl.message})")
+            cl.close()
+        finally:
+            proc.terminate()
+
+if __name__ == "__main__":
+    main()
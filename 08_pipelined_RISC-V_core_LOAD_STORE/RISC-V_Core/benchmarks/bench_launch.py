@@ -0,0 +1,65 @@
+"""Time to first snapshot: cold `sbt testOnly`, `java` on the exported classpath, a warm pool claim,
+and a reconnect to a simulator that is already up.
+
+    python -m benchmarks.bench_launch                  # needs sbt and java (run from RISC-V_Core)
+    python -m benchmarks.bench_launch --skip-sbt       # only the fast paths
+
+The old launcher always slept 15 s before the first connect, however long sbt really took.
+"""
+import argparse
+import shutil
+import socket
+import time
+from live_debug import launcher
+
+def first_snapshot(port, host="localhost", timeout=30.0) -> str:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=timeout) as s:
+                return s.makefile("r").readline()
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline: raise
+            time.sleep(0.05)
+
+def launch(mode, program=None):
+    t0 = time.perf_counter()
+    sim = launcher.Simulator(launcher.free_port(), program, mode).wait_ready()
+    first_snapshot(sim.port)
+    dt = time.perf_counter() - t0
+    print(f"{mode:<10} ready {sim.ready_s:6.1f}s   first snapshot {dt:6.1f}s")
+    return sim, dt
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--program", default=None)
+    ap.add_argument("--skip-sbt", action="store_true", help="skip the cold sbt launch")
+    args = ap.parse_args()
+    if not shutil.which("sbt"):
+        print("sbt not found: nothing to measure (the launcher needs it at least once to export the classpath)")
+        return
+
+    if not args.skip_sbt:
+        sim, _ = launch("sbt", args.program)
+        sim.stop()
+
+    t0 = time.perf_counter()
+    launcher.classpath(refresh=True)
+    print(f"classpath export (once per source change) {time.perf_counter() - t0:6.1f}s")
+
+    sim, _ = launch("java", args.program)
+    t0 = time.perf_counter()
+    first_snapshot(sim.port)
+    print(f"reconnect  first snapshot {time.perf_counter() - t0:6.3f}s")
+    sim.stop()
+
+    pool = launcher.SimulatorPool(1, args.program, mode="java")
+    pool.warm[0].wait_ready()                 # warming is off the clock: it happens while you work
+    t0 = time.perf_counter()
+    sim = pool.claim()
+    first_snapshot(sim.port)
+    print(f"pool claim first snapshot {time.perf_counter() - t0:6.3f}s")
+    pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Memory page at a random past cycle: shadow memory (bisect per word) vs replaying the stores from 0.
+
+    python -m benchmarks.bench_shadow_mem --cycles 1000000
+"""
+import argparse
+import random
+import time
+import numpy as np
+from live_debug import trace
+from live_debug.shadow_mem import PAGE_BYTES, ShadowMemory
+
+def synthetic_stores(n: int) -> np.ndarray:
+    """A store every 5 cycles into a 4 KiB working set."""
+    rec = np.zeros(n, dtype=trace.DTYPE)
+    c = np.arange(n)
+    rec["cycle"] = c
+    rec["mem.wr_op"] = np.where(c % 5 == 0, 0, 1)
+    rec["mem.addr"] = (c * 2654435761 >> 8) % 1024 * 4
+    rec["mem.wdata"] = c
+    return rec
+
+def replay_page(rec, base, cycle):
+    """The straightforward way: apply every store up to `cycle`, then read the page."""
+    mem = {}
+    for r in rec[:cycle + 1][rec["mem.wr_op"][:cycle + 1] == 0]:
+        mem[int(r["mem.addr"])] = int(r["mem.wdata"])
+    return [mem.get(base + 4 * i) for i in range(PAGE_BYTES // 4)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=1_000_000)
+    ap.add_argument("--queries", type=int, default=1000)
+    args = ap.parse_args()
+    rec = synthetic_stores(args.cycles)
+
+    t0 = time.perf_counter()
+    m = ShadowMemory()
+    m.add_records(rec)
+    t_build = time.perf_counter() - t0
+
+    random.seed(0)
+    qs = [(random.randrange(0, 4096, PAGE_BYTES), random.randrange(args.cycles)) for _ in range(args.queries)]
+    t0 = time.perf_counter()
+    for base, cyc in qs: m.page(base, cyc)
+    t_q = (time.perf_counter() - t0) / len(qs)
+
+    few = qs[:5]
+    t0 = time.perf_counter()
+    for base, cyc in few:
+        assert replay_page(rec, base, cyc) == [w and w[0] for w in m.page(base, cyc)]
+    t_replay = (time.perf_counter() - t0) / len(few)
+
+    print(f"{args.cycles} cycles, {m.stores} stores: built in {t_build*1e3:.0f} ms")
+    print(f"page at a past cycle   shadow {t_q*1e6:8.1f} us   replay from 0 {t_replay*1e3:8.1f} ms   {t_replay/t_q:8.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+
+"""Cycles/sec of lock-step `step` vs pipelined `batch` stepping.
+
+    python -m benchmarks.bench_stepping                 # against the in-process fake simulator
+    python -m benchmarks.bench_stepping --port 8888     # against a running LivePipelineTest
+"""
+import argparse
+import time
+from web_visualizer.bridge import ChiselBridge
+from .fake_chisel import FakeChisel
+
+def lockstep(bridge, n):
+    for _ in range(n):
+        bridge.send_command("step")
+        bridge.receive_snapshot()
+
+def measure(label, fn, n):
+    t0 = time.perf_counter()
+    fn(n)
+    dt = time.perf_counter() - t0
+    print(f"{label:<24} {n:>8} cycles  {dt:8.3f}s  {n/dt:12.0f} cycles/s")
+    return n / dt
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="localhost")
+    ap.add_argument("--port", type=int, default=None)
+    ap.add_argument("--cycles", type=int, default=20000)
+    args = ap.parse_args()
+
+    port = args.port
+    if port is None: port = FakeChisel(args.host).start().port
+
+    bridge = ChiselBridge(args.host, port)
+    bridge.connect()
+    bridge.receive_snapshot()
+
+    base = measure("lock-step step", lambda n: lockstep(bridge, n), args.cycles)
+    every1 = measure("batch (every cycle)", lambda n: bridge.step(n), args.cycles)
+    every100 = measure("batch (every 100th)", lambda n: bridge.step(n, every=100), args.cycles)
+    print(f"speedup: {every1/base:.1f}x (every cycle), {every100/base:.1f}x (every 100th)")
+    bridge.send_command("quit")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""JSONL recordings vs binary .rvt traces: size, write time, time to reach a late cycle.
+
+    python -m benchmarks.bench_trace --cycles 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+from live_debug import trace
+from .fake_chisel import make_snapshot
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=200000)
+    args = ap.parse_args()
+    n = args.cycles
+    snaps = [make_snapshot(c) for c in range(n)]
+    target = int(n * 0.9)
+
+    with tempfile.TemporaryDirectory() as d:
+        jl, rv, conv = (os.path.join(d, f) for f in ("run.jsonl", "run.rvt", "conv.rvt"))
+
+        t0 = time.perf_counter()
+        rec = trace.JsonlRecorder(jl)
+        for s in snaps: rec.append(s)
+        rec.close()
+        t_jl = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with trace.TraceWriter(rv, snaps[0]["rom"]) as w:
+            for s in snaps: w.append(s)
+        t_rv = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        trace.convert_jsonl(jl, conv)
+        t_conv = time.perf_counter() - t0
+
+        # Reaching cycle `target`: the JSONL has to be parsed up to it, the trace is opened and indexed
+        t0 = time.perf_counter()
+        for s in trace.read_jsonl(jl):
+            if s["cycle"] == target: break
+        t_seek_jl = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        r = trace.TraceReader(rv)
+        snap = r.at_cycle(target)
+        t_seek_rv = time.perf_counter() - t0
+        assert snap["regs"] == snaps[target]["regs"] and snap["pc"] == snaps[target]["pc"]
+
+        t0 = time.perf_counter()
+        full = list(trace.read_jsonl(jl))
+        t_load_jl = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        col = trace.TraceReader(rv).column("pc.ex").copy()
+        t_col = time.perf_counter() - t0
+
+        a, b = os.path.getsize(jl), os.path.getsize(rv)
+        print(f"{n} cycles")
+        print(f"size        JSONL {a/2**20:8.1f} MiB ({a/n:5.0f} B/cycle)   trace {b/2**20:8.1f} MiB ({b/n:4.0f} B/cycle)  {a/b:5.1f}x smaller")
+        print(f"write       JSONL {t_jl/n*1e6:8.1f} us/cycle          trace {t_rv/n*1e6:8.1f} us/cycle")
+        print(f"convert     {t_conv:.2f} s")
+        print(f"cycle {target}: JSONL scan {t_seek_jl*1e3:8.0f} ms   trace open+seek {t_seek_rv*1e3:6.2f} ms")
+        print(f"full load   JSONL {t_load_jl*1e3:8.0f} ms   one trace column (pc.ex) {t_col*1e3:6.2f} ms")
+        del full, r
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Frames per second of the TUI renderer on recorded snapshots.
+
+    python -m benchmarks.bench_ui [--record trace.jsonl] [--frames 20000]
+
+The legacy renderer prints row by row to a line-buffered stream (one write per row, like a
+terminal); FrameRenderer composes the frame, diffs it and issues one write.
+"""
+import argparse
+import contextlib
+import os
+import time
+from live_debug import ui, trace
+from live_debug.decoder import clear_cache
+from . import legacy_ui
+from .fake_chisel import make_snapshot
+
+class CountingSink:
+    """Line-buffered text sink that counts the writes reaching the 'terminal'."""
+    def __init__(self):
+        self.f = open(os.devnull, "w", buffering=1)
+        self.writes = self.bytes = 0
+    def write(self, s):
+        self.writes += s.count("\n")    # a line-buffered stream flushes once per newline
+        self.bytes += len(s.encode())
+        return self.f.write(s)
+    def flush(self): self.f.flush()
+
+def load(path, n):
+    if not path: return [make_snapshot(c) for c in range(n)]
+    snaps = list(trace.load(path))
+    return (snaps * (n // max(1, len(snaps)) + 1))[:n]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--record", default=None, help="recording written by `record on`, binary or JSONL (synthetic if omitted)")
+    ap.add_argument("--frames", type=int, default=20000)
+    args = ap.parse_args()
+    snaps = load(args.record, args.frames)
+    n = len(snaps)
+
+    sink = CountingSink()
+    clear_cache()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        for s in snaps:
+            print("\033[H", end="")
+            legacy_ui.show_snapshot(s)
+    dt = time.perf_counter() - t0
+    print(f"legacy print      {n/dt:9.0f} frames/s  {sink.writes/n:5.1f} writes/frame  {sink.bytes/n:6.0f} B/frame")
+
+    fd = os.open(os.devnull, os.O_WRONLY)
+    for name, full in (("full frame", True), ("diff frame", False)):
+        r = ui.FrameRenderer(fd)
+        clear_cache()
+        t0 = time.perf_counter()
+        for s in snaps:
+            if full: r.invalidate()
+            r.draw(ui.render_snapshot(s))
+        dt = time.perf_counter() - t0
+        print(f"{name:<17} {n/dt:9.0f} frames/s  {1:5.1f} writes/frame  {r.bytes_written/n:6.0f} B/frame")
+
+    # Scrolling back and forth over the same few cycles (held arrow key in history)
+    r = ui.FrameRenderer(fd)
+    window = snaps[:8]
+    t0 = time.perf_counter()
+    for i in range(n):
+        r.draw(ui.render_snapshot(window[i % 8]))
+    dt = time.perf_counter() - t0
+    print(f"history scroll    {n/dt:9.0f} frames/s  {1:5.1f} writes/frame  {r.bytes_written/n:6.0f} B/frame")
+    os.close(fd)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""JSON lines vs the binary frames of `proto binary`: bytes per snapshot and client-side decode.
+
+    python -m benchmarks.bench_wire --cycles 100000
+
+Both sides are Python here (wire.Encoder stands in for LivePipelineTest's frame writer);
+only the client's cost and the bytes on the wire are compared.
+"""
+import argparse
+import io
+import json
+import time
+from live_debug.wire import Decoder, Encoder, read_frame
+from .fake_chisel import make_snapshot
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.cycles
+
+    snaps = [make_snapshot(c) for c in range(n)]
+    lines = io.BytesIO(b"".join(json.dumps(s).encode() + b"\n" for s in snaps))
+    enc = Encoder()
+    frames = io.BytesIO(b"".join(enc.snapshot(s) for s in snaps))
+    del snaps
+
+    t0 = time.perf_counter()
+    for line in lines: json.loads(line)
+    t_json = time.perf_counter() - t0
+
+    dec = Decoder()
+    t0 = time.perf_counter()
+    for _ in range(n): dec.decode(*read_frame(frames))
+    t_bin = time.perf_counter() - t0
+
+    b_json, b_bin = len(lines.getvalue()) / n, len(frames.getvalue()) / n
+    print(f"{n} snapshots")
+    print(f"json lines  {b_json:7.0f} B/snapshot   {t_json/n*1e6:6.1f} us decode")
+    print(f"binary      {b_bin:7.0f} B/snapshot   {t_bin/n*1e6:6.1f} us decode   "
+          f"{b_json/b_bin:4.1f}x smaller, {t_json/t_bin:4.1f}x faster")
+
+if __name__ == "__main__":
+    main()
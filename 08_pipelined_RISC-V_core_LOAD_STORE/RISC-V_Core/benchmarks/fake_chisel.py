@@ -0,0 +1,108 @@
+
+import json
+import socket
+import threading
+import time
+import multiprocessing
+from functools import lru_cache
+
+ROM = [0x00000013, 0x00000013, 0x00A00093, 0x00500113, 0x002081B3]
+
+def reg_value(i: int, cycle: int) -> int:
+    """x1..x31 are written round-robin, one register per cycle, like a real WB stream."""
+    if i == 0 or cycle < i: return 0
+    return cycle - (cycle - i) % 31
+
+def make_snapshot(cycle: int) -> dict:
+    """A LivePipelineTest-shaped snapshot with plausible values for `cycle`."""
+    pc = (cycle * 4) % (len(ROM) * 4)
+    stage_pcs = [max(0, pc - 4 * k) for k in range(5)]
+    stage_ins = [ROM[(p // 4) % len(ROM)] for p in stage_pcs]
+    return {
+        "cycle": cycle,
+        "rom": [f"0x{w:08X}" for w in ROM] if cycle == 0 else [],
+        "coreDone": 0, "gpRegVal": 0, "result": 0,
+        "regs": {f"x{i}": reg_value(i, cycle) for i in range(32)},
+        "until": {"hit": 0, "steps": 0},
+        "pc": dict(zip(["if", "id", "ex", "mem", "wb"], stage_pcs)),
+        "instr": dict(zip(["if", "id", "ex", "mem", "wb"], stage_ins)),
+        "id": {"rs1": 1, "rs2": 2, "rd": 3, "we": 1},
+        "hazard": {"pc_write": 1, "if_stall": 0, "id_stall": int(cycle % 7 == 0), "flush": int(cycle % 11 == 0)},
+        "fwd": {"a_sel": cycle % 3, "b_sel": 0},
+        "ex": {"alu_result": cycle, "alu_op_a": cycle, "alu_op_b": 4, "pc_src": 0, "pc_jb": 0,
+               "rd": 3, "we": 1, "mem_rd_op": 1, "mem_wr_op": 1, "mem_to_reg": 0},
+        "mem": {"addr": 0, "rd_op": 1, "wr_op": 1, "wdata": 0, "rdata": 0, "rd": 2, "we": 1, "mem_to_reg": 0},
+        "wb": {"rd": cycle % 31 + 1, "we": 1, "wdata": cycle + 1, "check_res": 0},
+    }
+
+@lru_cache(maxsize=1024)
+def _line_tail(phase: int) -> str:
+    line = json.dumps(make_snapshot(phase))
+    return line[line.index(","):]
+
+def snapshot_line(cycle: int) -> str:
+    """JSON line for `cycle`, reusing the serialized body of a repeating 1024-cycle pattern."""
+    if cycle == 0: return json.dumps(make_snapshot(0)) + "\n"
+    return f'{{"cycle": {cycle}' + _line_tail(cycle % 1024 or 1024) + "\n"
+
+class FakeChisel:
+    """Stand-in for LivePipelineTest: same line protocol, no JVM.
+
+    Runs in a forked process by default so the fake's JSON work does not share the GIL with the client.
+    `cycles_per_s` caps the simulation speed (the real core under Verilator/treadle is far from free)
+    and `latency` is added to every command round trip, like the JVM's per-command work.
+    """
+
+    def __init__(self, host="localhost", port=0, cycles_per_s=None, latency=0.0):
+        self.cycles_per_s, self.latency = cycles_per_s, latency
+        self.srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.srv.bind((host, port))
+        self.srv.listen(1)
+        self.host, self.port = host, self.srv.getsockname()[1]
+
+    def start(self, process=True):
+        if process:
+            self.worker = multiprocessing.get_context("fork").Process(target=self.serve, daemon=True)
+        else:
+            self.worker = threading.Thread(target=self.serve, daemon=True)
+        self.worker.start()
+        return self
+
+    def serve(self):
+        conn, _ = self.srv.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        rf, wf = conn.makefile("r", encoding="utf-8"), conn.makefile("w", encoding="utf-8")
+        cycle, due = 0, 0.0
+        def pace(n):
+            """Hold the simulated clock to cycles_per_s (idle time is not banked for bursts)."""
+            nonlocal due
+            now = time.perf_counter()
+            due = max(due, now - 5e-3) + n / self.cycles_per_s      # a little slack absorbs oversleep
+            if due - now > 1e-3: time.sleep(due - now)
+        try:
+            while True:
+                wf.write(snapshot_line(cycle))
+                wf.flush()
+                line = rf.readline()
+                if not line: break
+                parts = line.split()
+                if not parts: continue
+                if parts[0] == "quit": break
+                if self.latency: time.sleep(self.latency)
+                before, paced = cycle, bool(self.cycles_per_s)
+                if parts[0] == "step": cycle += 1
+                elif parts[0] == "run": cycle += int(parts[1]) if len(parts) > 1 else 1
+                elif parts[0] == "reset": cycle = 0
+                elif parts[0] == "batch":
+                    n = int(parts[1]) if len(parts) > 1 else 1
+                    every = max(1, int(parts[2])) if len(parts) > 2 else 1
+                    for i in range(1, n + 1):
+                        cycle += 1
+                        if paced: pace(1)
+                        if i < n and i % every == 0: wf.write(snapshot_line(cycle))
+                    paced = False
+                if paced and cycle > before: pace(cycle - before)
+        finally:
+            conn.close()
+            self.srv.close()
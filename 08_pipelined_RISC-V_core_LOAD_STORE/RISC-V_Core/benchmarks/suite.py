@@ -0,0 +1,284 @@
+"""Benchmark suite for the Python side of the debugger, against stored baselines.
+
+    python -m benchmarks.suite                         # every component, compared with baselines.json
+    python -m benchmarks.suite --quick --only decode,enrich
+    python -m benchmarks.suite --quick --save          # record the baseline of this profile
+    python -m benchmarks.suite --sim-rate 50000 --sim-latency 0.0002    # a slower stand-in simulator
+
+Nothing here needs sbt or a JVM: the bridge talks to FakeChisel, and the trace and the VCD are
+synthetic (benchmarks/synthetic.py, cached under target/bench). Every component reports
+cycles/s, per-item latency percentiles and the peak traced memory of a pass. The exit status is 1
+when a metric is worse than the baseline of the same profile by more than --tolerance.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+# The packet log would time the writer thread and fill the working directory (set it to a path to keep it)
+os.environ.setdefault("CHISEL_PACKET_LOG", "")
+
+from live_debug import trace, ui
+from live_debug.analytics import analyze, trace_columns
+from live_debug.decoder import clear_cache, decode_rv32i
+from .fake_chisel import FakeChisel, make_snapshot
+from .synthetic import write_trace, write_vcd
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+DATA_DIR = "target/bench"
+VCD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "07_VCD")
+
+# Items per component: snapshots (decode, enrich, render, emit) or cycles (bridge, trace, vcd)
+PROFILES = {
+    "quick": {"decode": 20_000, "enrich": 5_000, "render": 2_000, "bridge": 5_000, "emit": 2_000,
+              "trace": 1_000_000, "vcd": 100_000},
+    "full": {"decode": 200_000, "enrich": 50_000, "render": 20_000, "bridge": 50_000, "emit": 20_000,
+             "trace": 5_000_000, "vcd": 2_000_000},
+}
+SAMPLE = 2000                    # items timed one by one, and items run under tracemalloc
+REPEAT = 3                       # timed passes; the best one counts, as with timeit (noise only slows things down)
+HIGHER_IS_BETTER = ("cycles_per_s",)
+LOWER_IS_BETTER = ("p50_us", "p90_us", "peak_kib")
+MEM_SLACK_KIB = 64               # allocator noise on small peaks
+
+# --- Measurement -------------------------------------------------------------------------------
+
+def best(fn) -> float:
+    """Seconds of the fastest of REPEAT calls of fn()."""
+    dts = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        dts.append(time.perf_counter() - t0)
+    return min(dts)
+
+def latencies(fn, items) -> dict:
+    """p50/p90/p99 of fn(item) in microseconds, each the best of REPEAT passes."""
+    ns = np.empty((REPEAT, len(items)))
+    for k in range(REPEAT):
+        for i, x in enumerate(items):
+            t0 = time.perf_counter_ns()
+            fn(x)
+            ns[k, i] = time.perf_counter_ns() - t0
+    p50, p90, p99 = np.percentile(ns, [50, 90, 99], axis=1).min(axis=1) / 1e3
+    return {"p50_us": round(p50, 2), "p90_us": round(p90, 2), "p99_us": round(p99, 2)}
+
+def peak_kib(fn) -> float:
+    """Peak traced memory while fn() runs, the smallest of REPEAT runs (background threads move it around)."""
+    peaks = []
+    for _ in range(REPEAT):
+        tracemalloc.start()
+        try:
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return round(min(peaks) / 1024, 1)
+
+def per_item(fn, items, cycles_per_item=1) -> dict:
+    """The usual three passes over a list of work items: throughput, latency, memory."""
+    def run():
+        for x in items: fn(x)
+    dt = best(run)
+    sample = items[:SAMPLE]
+    return {"n": len(items), "cycles_per_s": round(len(items) * cycles_per_item / dt),
+            **latencies(fn, sample), "peak_kib": peak_kib(lambda: [fn(x) for x in sample])}
+
+def snapshots(n):
+    return [make_snapshot(c) for c in range(n)]
+
+# --- Components ----------------------------------------------------------------------------------
+
+def bench_decode(n, args):
+    """decode_rv32i of the five stage instructions of a snapshot (the TUI and the web view both do this)."""
+    words = [list(s["instr"].values()) for s in snapshots(n)]
+    clear_cache()
+    return per_item(lambda ws: [decode_rv32i(w) for w in ws], words)
+
+def bench_enrich(n, args):
+    from web_visualizer.server import process_snapshot
+    return per_item(process_snapshot, snapshots(n))
+
+def bench_render(n, args):
+    """show_snapshot's frame: render_snapshot, diffed and written by FrameRenderer (to /dev/null)."""
+    fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        r = ui.FrameRenderer(fd)
+        return per_item(lambda s: r.draw(ui.render_snapshot(s)), snapshots(n))
+    finally:
+        os.close(fd)
+
+def bench_bridge(n, args):
+    """ChiselBridge against FakeChisel: batch throughput (a snapshot every cycle), lock-step latency."""
+    from web_visualizer.bridge import ChiselBridge
+    fake = FakeChisel(cycles_per_s=args.sim_rate, latency=args.sim_latency).start()
+    bridge = ChiselBridge("localhost", fake.port)
+    with contextlib.redirect_stdout(io.StringIO()):
+        bridge.connect()
+    bridge.receive_snapshot()
+    try:
+        dt = best(lambda: bridge.step(n))
+        def lockstep(_):
+            bridge.send_command("step")
+            bridge.receive_snapshot()
+        row = {"n": n, "cycles_per_s": round(n / dt), **latencies(lockstep, range(min(n, SAMPLE) // 4))}
+        row["peak_kib"] = peak_kib(lambda: bridge.step(min(n, SAMPLE)))
+        return row
+    finally:
+        bridge.send_command("quit")
+
+def bench_emit(n, args):
+    """sio.emit of enriched packets, down to the engine.io packet (the transport is a no-op sink)."""
+    from web_visualizer.server import process_snapshot, sio
+    packets = [process_snapshot(s) for s in snapshots(n)]
+    loop = asyncio.new_event_loop()
+    async def sink(eio_sid, pkt): pass
+    saved, sio.eio.send_packet = sio.eio.send_packet, sink
+    try:
+        sid = loop.run_until_complete(sio.manager.connect("bench", "/"))
+        emit = lambda p: loop.run_until_complete(sio.emit("update", p, to=sid))
+        # One coroutine for the throughput pass, as in send_update; per-item passes pay a loop round trip
+        async def all_():
+            for p in packets: await sio.emit("update", p, to=sid)
+        dt = best(lambda: loop.run_until_complete(all_()))
+        sample = packets[:SAMPLE]
+        return {"n": n, "cycles_per_s": round(n / dt), **latencies(emit, sample),
+                "peak_kib": peak_kib(lambda: [emit(p) for p in sample])}
+    finally:
+        sio.eio.send_packet = saved
+        loop.close()
+
+def data_file(kind, n, write):
+    """Synthetic inputs are slow to write and never change: kept in target/bench by size."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synthetic-{n}.{kind}")
+    if not os.path.exists(path):
+        write(path + ".tmp", n)
+        os.replace(path + ".tmp", path)
+    return path
+
+def bench_trace(n, args):
+    """Whole-trace analytics (memmap columns + analyze), then random cycles out of the .rvt."""
+    path = data_file("rvt", n, write_trace)
+    def analysis():
+        r = trace.TraceReader(path)
+        return analyze(trace_columns(r), r.rom)
+    dt = best(analysis)
+    r = trace.TraceReader(path)
+    idx = np.random.default_rng(0).integers(0, n, SAMPLE).tolist()
+    return {"n": n, "cycles_per_s": round(n / dt), **latencies(lambda i: r[i], idx), "peak_kib": peak_kib(analysis)}
+
+def bench_vcd(n, args):
+    """07_VCD: parse the stage PCs of an n-cycle dump into a Timeline, then render 40-cycle windows."""
+    if not os.path.isdir(VCD_DIR): return {"skipped": f"{os.path.normpath(VCD_DIR)} not found"}
+    if VCD_DIR not in sys.path: sys.path.insert(0, VCD_DIR)
+    from timeline import Timeline, open_stages
+    path = data_file("vcd", n, write_vcd)
+    def build():
+        stream, names = open_stages(path)
+        return Timeline(stream.load(), names)
+    tl = build()
+    dt = best(build)
+    starts = np.random.default_rng(0).integers(0, max(1, tl.n_cycles - 40), SAMPLE // 10).tolist()
+    return {"n": n, "cycles_per_s": round(n / dt), **latencies(lambda c: tl.render_text(c, c + 40, {}), starts),
+            "peak_kib": peak_kib(build)}
+
+COMPONENTS = {"decode": bench_decode, "enrich": bench_enrich, "render": bench_render, "bridge": bench_bridge,
+              "emit": bench_emit, "trace": bench_trace, "vcd": bench_vcd}
+
+# --- Baselines -----------------------------------------------------------------------------------
+
+def meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": platform.python_version(), "machine": f"{platform.system()} {platform.machine()}",
+            "cpus": os.cpu_count(), "commit": commit, "date": time.strftime("%Y-%m-%d")}
+
+def compare(results: dict, base: dict, tolerance: float) -> list:
+    """(component, metric, baseline, now) of every metric worse than the baseline beyond tolerance."""
+    worse = []
+    for name, row in results.items():
+        old = base.get(name)
+        if not old or "skipped" in row or "skipped" in old: continue
+        for m in HIGHER_IS_BETTER:
+            if m in old and row[m] < old[m] * (1 - tolerance): worse.append((name, m, old[m], row[m]))
+        for m in LOWER_IS_BETTER:
+            slack = MEM_SLACK_KIB if m == "peak_kib" else 0
+            if m in old and row[m] > old[m] * (1 + tolerance) + slack: worse.append((name, m, old[m], row[m]))
+    return worse
+
+def load_baselines(path: str) -> dict:
+    if not os.path.exists(path): return {}
+    with open(path) as f: return json.load(f)
+
+def save_baseline(path: str, profile: str, results: dict):
+    """Merge into the stored profile, so `--only` refreshes just the components it ran."""
+    data = load_baselines(path)
+    entry = data.setdefault(profile, {"meta": {}, "results": {}})
+    entry["meta"] = meta()
+    entry["results"].update(results)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def format_row(name, row, old=None) -> str:
+    if "skipped" in row: return f"{name:<8} skipped: {row['skipped']}"
+    delta = ""
+    if old and old.get("cycles_per_s"): delta = f"  ({row['cycles_per_s'] / old['cycles_per_s'] - 1:+.0%} vs baseline)"
+    return (f"{name:<8} {row['n']:>9}  {row['cycles_per_s']:>11,} cycles/s  p50 {row['p50_us']:>9.1f} us  "
+            f"p90 {row['p90_us']:>9.1f}  p99 {row['p99_us']:>9.1f}  peak {row['peak_kib']:>9.1f} KiB{delta}")
+
+def main(argv=None):
+    global REPEAT
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--quick", action="store_true", help="small sizes (the profile CI and the stored baseline use)")
+    ap.add_argument("--only", default=None, help=f"comma-separated subset of {','.join(COMPONENTS)}")
+    ap.add_argument("--baseline", default=BASELINES)
+    ap.add_argument("--save", action="store_true", help="store the results as the baseline of this profile")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed fractional slowdown (default 0.25)")
+    ap.add_argument("--sim-rate", type=float, default=None, help="FakeChisel cycles/s cap (default: unthrottled)")
+    ap.add_argument("--sim-latency", type=float, default=0.0, help="FakeChisel seconds added per command")
+    ap.add_argument("--repeat", type=int, default=REPEAT, help="timed passes per measurement, best counts")
+    ap.add_argument("--json", default=None, help="also write the results here")
+    args = ap.parse_args(argv)
+    REPEAT = max(1, args.repeat)
+
+    profile = "quick" if args.quick else "full"
+    names = args.only.split(",") if args.only else list(COMPONENTS)
+    unknown = [n for n in names if n not in COMPONENTS]
+    if unknown: ap.error(f"unknown component(s): {', '.join(unknown)}")
+    stored = load_baselines(args.baseline).get(profile, {})
+    base = stored.get("results", {})
+    if base and not args.save:
+        m = stored.get("meta", {})
+        print(f"📏 baseline: {profile} @ {m.get('commit') or '?'} ({m.get('date')}, {m.get('machine')}, python {m.get('python')})")
+
+    results = {}
+    for name in names:
+        results[name] = row = COMPONENTS[name](PROFILES[profile][name], args)
+        print(format_row(name, row, base.get(name)), flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f: json.dump({"profile": profile, "meta": meta(), "results": results}, f, indent=1)
+    if args.save:
+        save_baseline(args.baseline, profile, results)
+        print(f"💾 baseline saved: {args.baseline} [{profile}]")
+        return 0
+    worse = compare(results, base, args.tolerance)
+    for name, m, old, now in worse:
+        print(f"❌ {name}.{m}: {old} -> {now}")
+    if base: print("✅ no regressions" if not worse else f"❌ {len(worse)} regression(s) beyond {args.tolerance:.0%}")
+    return 1 if worse else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
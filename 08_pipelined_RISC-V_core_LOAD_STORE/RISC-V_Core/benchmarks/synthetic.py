@@ -0,0 +1,68 @@
+"""Synthetic inputs for the benchmarks: per-cycle trace records, .rvt traces and VCDs of any length.
+
+The pattern is a loop of 16 instructions with a load-use stall every 7 cycles and a taken branch
+every 40 (see synthetic_records), so the analytics and the timeline have something to find.
+"""
+import numpy as np
+from live_debug import trace
+
+ROM = [0x002081B3] * 16
+BLOCK = 1 << 16                  # records generated and written at a time
+
+def synthetic_records(n: int, start: int = 0) -> np.ndarray:
+    """Records of cycles [start, start + n): the loop, its stalls, flushes and bubbles."""
+    rec = np.zeros(n, dtype=trace.DTYPE)
+    c = np.arange(start, start + n, dtype=np.uint64)
+    rec["cycle"] = c
+    pc = (c % 16 * 4).astype(np.uint32)
+    for k, st in enumerate(trace.STAGES):
+        rec[f"pc.{st}"] = np.where(c >= k, pc - 4 * k, 0) % 64
+        rec[f"instr.{st}"] = 0x002081B3
+    rec["hazard.id_stall"] = rec["hazard.if_stall"] = (c % 7 == 3)
+    rec["hazard.flush"] = (c % 40 == 10) | (c % 40 == 11)
+    rec["fwd.a_sel"] = c % 3
+    bubble = (c % 7 == 6) | (c % 40 == 13) | (c % 40 == 14)     # stall / flush bubbles reaching WB
+    rec["pc.wb"][bubble], rec["instr.wb"][bubble] = 0, 0x13
+    return rec
+
+def write_trace(path: str, n: int) -> str:
+    """An n-cycle .rvt trace, written block by block (memory stays flat for any n)."""
+    with trace.TraceWriter(path, ROM) as w:
+        for lo in range(0, n, BLOCK):
+            w.f.write(synthetic_records(min(BLOCK, n - lo), lo).tobytes())
+    return path
+
+# Debug ports of PipelinedRV32I as chiseltest names them, with the record column each one dumps
+VCD_SIGNALS = [("io_dbg_if_pc", "pc.if", 32), ("io_dbg_id_pc", "pc.id", 32), ("io_dbg_ex_pc", "pc.ex", 32),
+               ("io_dbg_mem_pc", "pc.mem", 32), ("io_dbg_wb_pc", "pc.wb", 32), ("io_dbg_wb_inst", "instr.wb", 32),
+               ("io_dbg_if_stall", "hazard.if_stall", 1), ("io_dbg_id_stall", "hazard.id_stall", 1),
+               ("io_dbg_flush", "hazard.flush", 1), ("io_dbg_fwd_a_sel", "fwd.a_sel", 2),
+               ("io_dbg_fwd_b_sel", "fwd.b_sel", 2), ("io_coreDone", "coreDone", 1)]
+
+def write_vcd(path: str, n: int) -> str:
+    """An n-cycle VCD of the debug ports: each cycle's values change on the falling edge at 2c+1,
+    so the rising edge at 2c+2 samples cycle c (what `peek` sees, and what vcd_columns reads)."""
+    ids = [chr(34 + i) for i in range(len(VCD_SIGNALS))]          # '!' is the clock
+    head = ["$timescale 1ns $end", "$scope module TOP $end", "$scope module PipelinedRV32I $end",
+            "$var wire 1 ! clock $end"]
+    head += [f"$var wire {w} {i} {name} $end" for i, (name, _, w) in zip(ids, VCD_SIGNALS)]
+    head += ["$upscope $end", "$upscope $end", "$enddefinitions $end", "#0", "0!"]
+    with open(path, "w") as f:
+        f.write("\n".join(head) + "\n")
+        prev = [None] * len(VCD_SIGNALS)
+        for lo in range(0, n, BLOCK):
+            rec = synthetic_records(min(BLOCK, n - lo), lo)
+            cols = [rec[col].tolist() for _, col, _ in VCD_SIGNALS]
+            out = []
+            for k in range(len(rec)):
+                t = 2 * (lo + k)
+                if t: out.append(f"#{t}\n1!\n")
+                out.append(f"#{t + 1}\n0!\n")
+                for j, (vid, (_, _, w)) in enumerate(zip(ids, VCD_SIGNALS)):
+                    v = cols[j][k]
+                    if v != prev[j]:
+                        out.append(f"{v}{vid}\n" if w == 1 else f"b{v:b} {vid}\n")
+                        prev[j] = v
+            f.write("".join(out))
+        f.write(f"#{2 * n}\n1!\n")
+    return path
@@ -0,0 +1,246 @@
+"""Pipeline performance analytics: CPI, stall and flush attribution, forwarding, per-PC hotspots.
+
+Everything runs on NumPy columns named like the trace columns ("pc.ex", "hazard.flush", ...),
+which come from a recorded trace (memmapped, nothing is rebuilt), a live history (ColumnBuffer,
+fed snapshot by snapshot) or the VCD chiseltest writes next to the test.
+
+    python -m live_debug.analytics run.rvt
+    python -m live_debug.analytics run.jsonl --top 20
+    python -m live_debug.analytics test_run_dir/<test>/PipelinedRV32I.vcd --json
+
+Attribution follows the hazard logic of the core: a load-use stall is caused by the load in EX
+(the stalled instruction waits in ID), and a flush is caused by the branch/jump that was in EX
+when the flush went high (it stays high for two cycles).
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+NOP = 0x00000013     # bubbles are a NOP at PC 0 (see the pipeline barriers)
+FWD_SRC = ("id", "mem", "wb")   # aluOpAMux / aluOpBMux order
+
+# The columns the analysis reads, with their VCD names (top-level ports of PipelinedRV32I)
+COLUMNS = {
+    "cycle": "<u8", "coreDone": "u1",
+    "pc.id": "<u4", "pc.ex": "<u4", "pc.wb": "<u4", "instr.wb": "<u4",
+    "hazard.if_stall": "u1", "hazard.id_stall": "u1", "hazard.flush": "u1",
+    "fwd.a_sel": "u1", "fwd.b_sel": "u1",
+}
+VCD_NAMES = {
+    "coreDone": "io_coreDone", "pc.id": "io_dbg_id_pc", "pc.ex": "io_dbg_ex_pc", "pc.wb": "io_dbg_wb_pc",
+    "instr.wb": "io_dbg_wb_inst", "hazard.if_stall": "io_dbg_if_stall", "hazard.id_stall": "io_dbg_id_stall",
+    "hazard.flush": "io_dbg_flush", "fwd.a_sel": "io_dbg_fwd_a_sel", "fwd.b_sel": "io_dbg_fwd_b_sel",
+}
+DTYPE = np.dtype([(name, dt) for name, dt in COLUMNS.items()])
+_PATHS = [tuple(name.split(".")) for name in COLUMNS]
+TRIM_EVERY = 1 << 16
+
+Columns = Dict[str, np.ndarray]
+
+class ColumnBuffer:
+    """The analysis columns of a growing history, appended to like HistoryIndex.
+
+    Indices follow the history; `evict(start)` drops what the history dropped (compacted now and then).
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.data = np.zeros(capacity, dtype=DTYPE)
+        self.n = 0
+        self.base = 0                # history index of data[0]
+        self.start = 0
+
+    def __len__(self): return self.n - (self.start - self.base)
+
+    def add(self, snap: Dict[str, Any]):
+        if self.n == len(self.data):
+            self.data = np.resize(self.data, 2 * len(self.data))
+        row = []
+        for path in _PATHS:
+            v = snap.get(path[0], 0)
+            if len(path) == 2: v = v.get(path[1], 0) if isinstance(v, dict) else 0
+            row.append(int(v or 0))
+        self.data[self.n] = tuple(row)
+        self.n += 1
+
+    def extend(self, snaps: Iterable[Dict[str, Any]]):
+        for s in snaps: self.add(s)
+        return self
+
+    def evict(self, start: int):
+        self.start = start
+        drop = start - self.base
+        if drop < TRIM_EVERY: return
+        self.data = self.data[drop:].copy()
+        self.n -= drop
+        self.base = start
+
+    def columns(self) -> Columns:
+        rec = self.data[self.start - self.base:self.n]
+        return {name: rec[name] for name in COLUMNS}
+
+    def clear(self):
+        self.__init__()
+
+def trace_columns(trace) -> Columns:
+    """Columns of a TraceReader, straight from the memmap."""
+    return {name: trace.records[name] for name in COLUMNS}
+
+def snapshot_columns(snaps: Iterable[Dict[str, Any]]) -> Columns:
+    return ColumnBuffer().extend(snaps).columns()
+
+def vcd_columns(path: str) -> Columns:
+    """Sample the debug ports of a VCD once per rising clock edge, i.e. what `peek` sees each cycle."""
+    wanted = {v: k for k, v in VCD_NAMES.items()}
+    wanted["clock"] = "clock"
+    best: Dict[str, tuple] = {}      # column -> (scope depth, vcd id); the shallowest scope wins
+    depth = 0
+    with open(path) as f:
+        for line in f:
+            tok = line.split()
+            if not tok: continue
+            if tok[0] == "$scope": depth += 1
+            elif tok[0] == "$upscope": depth -= 1
+            elif tok[0] == "$var" and tok[4] in wanted:
+                col = wanted[tok[4]]
+                if col not in best or depth < best[col][0]: best[col] = (depth, tok[3])
+            elif tok[0] == "$enddefinitions": break
+        cols = [c for c in COLUMNS if c != "cycle"]
+        pos = {vid: cols.index(col) for col, (_, vid) in best.items() if col != "clock"}
+        clk = best.get("clock", (0, None))[1]
+        state, rows, clock, block = [0] * len(cols), [], 0, []
+
+        def end_block():
+            nonlocal clock
+            rising = False
+            for vid, val in block:
+                if vid == clk:
+                    rising = rising or (clock == 0 and val == 1)
+                    clock = val
+            if rising or clk is None: rows.append(tuple(state))
+            for vid, val in block:
+                if vid in pos: state[pos[vid]] = val
+            block.clear()
+
+        for line in f:
+            c = line[:1]
+            if c == "#": end_block()
+            elif c in ("b", "B"):
+                val, vid = line[1:].split()
+                if vid in pos or vid == clk: block.append((vid, int(val, 2) if val.isdigit() else 0))
+            elif c in ("0", "1", "x", "z", "X", "Z"):
+                vid = line[1:].strip()
+                if vid in pos or vid == clk: block.append((vid, 1 if c == "1" else 0))
+        end_block()
+    out = {c: np.array([r[i] for r in rows], dtype=COLUMNS[c]) for i, c in enumerate(cols)}
+    out["cycle"] = np.arange(len(rows), dtype=np.uint64)
+    return out
+
+def _per_pc(pcs: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """How often each of the (sorted, unique) `pcs` occurs in `values`."""
+    u, c = np.unique(values, return_counts=True)
+    out = np.zeros(len(pcs), dtype=np.int64)
+    out[np.searchsorted(pcs, u)] = c
+    return out
+
+def analyze(cols: Columns, rom: Optional[List[Any]] = None, top: int = 10, stop_at_done: bool = True) -> Dict[str, Any]:
+    """CPI, stall/flush cycles, forwarding counts and the `top` per-PC hotspots of one run."""
+    n = len(cols["cycle"])
+    if stop_at_done and n:
+        done = np.flatnonzero(cols["coreDone"])
+        if len(done): n = int(done[0]) + 1
+    c = {k: np.asarray(v[:n]) for k, v in cols.items()}
+    cyc = c["cycle"]
+    stall = (c["hazard.if_stall"] != 0) | (c["hazard.id_stall"] != 0)
+    flush = c["hazard.flush"] != 0
+    retired = (c["instr.wb"] != NOP) | (c["pc.wb"] != 0)
+
+    # 1. flushes: each rising edge is one redirect, caused by the instruction in EX at that edge
+    rise = flush & ~np.concatenate(([False], flush[:-1]))
+    edge = np.flatnonzero(rise)
+    group = np.cumsum(rise) - 1
+    flush_pc = c["pc.ex"][edge][group[flush]] if len(edge) else np.zeros(0, dtype=np.uint32)
+
+    # 2. per-PC table: retirements, stall cycles caused (EX) and suffered (ID), flush cycles caused
+    ret_pc, stall_pc, wait_pc = c["pc.wb"][retired], c["pc.ex"][stall], c["pc.id"][stall]
+    pcs = np.unique(np.concatenate([ret_pc, stall_pc, wait_pc, flush_pc]))
+    executed, stalls, waits, flushes = (_per_pc(pcs, v) for v in (ret_pc, stall_pc, wait_pc, flush_pc))
+    order = np.lexsort((-executed, -(stalls + flushes)))[:top]
+    listing = {}
+    if rom:
+        from .decoder import decode_rom
+        listing = decode_rom(rom)
+    hotspots = [{"pc": int(pcs[i]), "asm": listing.get(int(pcs[i]), ""), "executed": int(executed[i]),
+                 "stall_cycles": int(stalls[i]), "waited_cycles": int(waits[i]), "flush_cycles": int(flushes[i])}
+                for i in order]
+
+    n_ret, n_stall, n_flush = int(retired.sum()), int(stall.sum()), int(flush.sum())
+    fwd = {}
+    for op in ("a", "b"):
+        counts = np.bincount(c[f"fwd.{op}_sel"], minlength=len(FWD_SRC))
+        fwd[op] = {src: int(counts[i]) for i, src in enumerate(FWD_SRC)}
+    return {
+        "records": n,
+        "cycles": int(cyc[-1] - cyc[0]) + 1 if n else 0,
+        "dense": bool(n < 2 or np.all(np.diff(cyc) == 1)),   # sampled traces count records, not cycles
+        "done": bool(n and c["coreDone"][-1]),
+        "retired": n_ret,
+        "cpi": n / n_ret if n_ret else None,
+        "ipc": n_ret / n if n else None,
+        "stall_cycles": n_stall,
+        "flush_cycles": n_flush,
+        "flushes": len(edge),
+        "other_cycles": n - n_ret - n_stall - n_flush,   # lost cycles not explained by stalls/flushes (fill, drain)
+        "forwarding": fwd,
+        "hotspots": hotspots,
+    }
+
+def format_report(r: Dict[str, Any]) -> List[str]:
+    """The report as text lines (CLI and the TUI `stats` command)."""
+    pct = lambda x: f"{100 * x / r['records']:5.1f}%" if r["records"] else "    -"
+    lines = [f"Cycles {r['cycles']}  records {r['records']}" + ("" if r["dense"] else "  (sampled trace: counts are per record)")
+             + ("  [core done]" if r["done"] else ""),
+             f"Retired {r['retired']}  CPI " + (f"{r['cpi']:.3f}  IPC {r['ipc']:.3f}" if r["cpi"] else "-"),
+             f"Stall cycles {r['stall_cycles']:>8} {pct(r['stall_cycles'])}",
+             f"Flush cycles {r['flush_cycles']:>8} {pct(r['flush_cycles'])}  ({r['flushes']} redirects)",
+             f"Other        {r['other_cycles']:>8} {pct(r['other_cycles'])}"]
+    for op, counts in r["forwarding"].items():
+        lines.append(f"Forward {op.upper()}    " + "  ".join(f"{src} {v}" for src, v in counts.items()))
+    if r["hotspots"]:
+        lines.append(f"{'PC':>10} {'exec':>8} {'stall':>7} {'waited':>7} {'flush':>7}  instruction")
+        for h in r["hotspots"]:
+            lines.append(f"{h['pc']:#010x} {h['executed']:>8} {h['stall_cycles']:>7} {h['waited_cycles']:>7} "
+                         f"{h['flush_cycles']:>7}  {h['asm']}")
+    return lines
+
+def load_columns(path: str):
+    """(columns, rom) of a .rvt trace, a JSONL recording or a VCD."""
+    from .trace import MAGIC, TraceReader, read_jsonl
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        t = TraceReader(path)
+        return trace_columns(t), t.rom
+    if path.endswith(".vcd") or head.startswith(b"$"):
+        return vcd_columns(path), None
+    buf, rom = ColumnBuffer(), None
+    for s in read_jsonl(path):
+        if s.get("rom"): rom = s["rom"]
+        buf.add(s)
+    return buf.columns(), rom
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="CPI, stalls, flushes, forwarding and per-PC hotspots of a run")
+    ap.add_argument("path", help=".rvt trace, JSONL recording or VCD")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--all", action="store_true", help="keep going past coreDone")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args(argv)
+    cols, rom = load_columns(args.path)
+    r = analyze(cols, rom, args.top, stop_at_done=not args.all)
+    if args.json: json.dump(r, sys.stdout, indent=1); print()
+    else: print("\n".join(format_report(r)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import operator
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+# Breakpoint kinds understood by LivePipelineTest (`bp add`, `until`) and by the Python-side
+# simulators that speak the same protocol. Each kind reads one snapshot field.
+FIELDS = {
+    "if_pc": ("pc", "if"), "id_pc": ("pc", "id"), "ex_pc": ("pc", "ex"),
+    "mem_pc": ("pc", "mem"), "wb_pc": ("pc", "wb"),
+    "wb_rd": ("wb", "rd"), "wb_we": ("wb", "we"), "mem_addr": ("mem", "addr"),
+    "cycle": ("cycle",),
+}
+# mem_wr / mem_rd: the MEM stage does a store / load (SW and LW are encoded as 0) at the address
+ACCESS = {"mem_wr": ("wr_op", 0), "mem_rd": ("rd_op", 0)}
+REG_KIND = re.compile(r"x([0-9]|[12][0-9]|3[01])$")
+
+OPS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, ">": operator.gt,
+       "<=": operator.le, ">=": operator.ge}
+
+def valid_kind(kind: str) -> bool:
+    return kind in FIELDS or kind in ACCESS or bool(REG_KIND.match(kind))
+
+def parse_value(text: str) -> int:
+    t = text.strip().lower()
+    return int(t, 16) if t.startswith("0x") else int(t)
+
+def _field(snap, path):
+    cur = snap
+    for p in path:
+        if not isinstance(cur, dict): return None
+        cur = cur.get(p)
+    return cur
+
+@dataclass
+class Breakpoint:
+    """`kind op value`, firing from the `count`-th hit on (hits are counted by the simulator)."""
+    kind: str
+    value: int
+    op: str = "=="
+    count: int = 1
+    id: int = 0
+    hits: int = 0
+
+    def args(self) -> str:
+        """Argument string of `bp add`; negative values go as their 32-bit pattern (the simulator's
+        parser takes unsigned hex only, and the signals it compares are unsigned)."""
+        value = self.value & 0xFFFFFFFF if self.value < 0 else self.value
+        return f"{self.kind} {self.op} {value:#x} {self.count}"
+
+    def condition(self, snap: Dict[str, Any]) -> bool:
+        """Whether the condition holds in this snapshot (hit counting is up to the caller)."""
+        if self.kind in ACCESS:
+            op_field, active = ACCESS[self.kind]
+            if _field(snap, ("mem", op_field)) != active: return False
+            cur = _field(snap, ("mem", "addr"))
+        elif self.kind in FIELDS:
+            cur = _field(snap, FIELDS[self.kind])
+        else:
+            cur = _field(snap, ("regs", self.kind))
+        return cur is not None and OPS[self.op](int(cur), self.value)
+
+    def __str__(self):
+        more = f" (from hit {self.count})" if self.count > 1 else ""
+        return f"#{self.id} {self.kind} {self.op} {self.value:#x}{more}  hits={self.hits}"
+
+def parse_bp(text: str) -> Breakpoint:
+    """Parse `[kind] [op] value [count]`, e.g. `0x40`, `x5 > 10`, `mem_wr 0x100 3` (kind defaults to if_pc)."""
+    parts = text.split()
+    if not parts: raise ValueError("empty breakpoint")
+    kind = "if_pc"
+    if parts[0][0].isalpha():
+        kind = parts.pop(0).lower()
+    if not valid_kind(kind): raise ValueError(f"unknown breakpoint kind {kind!r}")
+    op = parts.pop(0) if parts and parts[0] in OPS else "=="
+    if not parts: raise ValueError("breakpoint needs a value")
+    value = parse_value(parts.pop(0))
+    count = int(parts.pop(0)) if parts else 1
+    if parts or count < 1: raise ValueError(f"bad breakpoint {text!r}")
+    return Breakpoint(kind, value, op, count)
+
+class BreakpointSet:
+    """Numbered breakpoints with hit counts, as kept by the simulator side of `bp`/`until bp`."""
+
+    def __init__(self):
+        self.bps: Dict[int, Breakpoint] = {}
+        self.next_id = 1
+
+    def add(self, bp: Breakpoint) -> Breakpoint:
+        bp.id, bp.hits = self.next_id, 0
+        self.bps[bp.id] = bp
+        self.next_id += 1
+        return bp
+
+    def remove(self, bp_id: int) -> bool:
+        return self.bps.pop(bp_id, None) is not None
+
+    def clear(self):
+        self.bps.clear()
+
+    def check(self, snap: Dict[str, Any]) -> int:
+        """Count hits in this cycle; the id of the first breakpoint that fires, else 0."""
+        fired = 0
+        for bp in self.bps.values():
+            if bp.condition(snap):
+                bp.hits += 1
+                if not fired and bp.hits >= bp.count: fired = bp.id
+        return fired
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        return [asdict(bp) for bp in self.bps.values()]
+
+    def command(self, parts: List[str]) -> Dict[str, Any]:
+        """Handle the arguments of a `bp` command; returns the JSON ack LivePipelineTest would send."""
+        try:
+            sub = parts[0] if parts else "list"
+            bp_id = 0
+            if sub == "add": bp_id = self.add(parse_bp(" ".join(parts[1:]))).id
+            elif sub == "del":
+                bp_id = int(parts[1])
+                if not self.remove(bp_id): raise ValueError(f"no breakpoint #{bp_id}")
+            elif sub == "clear": self.clear()
+            elif sub != "list": raise ValueError(f"unknown bp command {sub!r}")
+            return {"ack": "bp", "ok": True, "id": bp_id, "bps": self.as_list()}
+        except (ValueError, IndexError) as e:
+            return {"ack": "bp", "ok": False, "error": str(e), "bps": self.as_list()}
+
+def from_ack(ack: Optional[Dict[str, Any]]) -> List[Breakpoint]:
+    """Breakpoints listed in a `bp` ack."""
+    return [Breakpoint(**d) for d in (ack or {}).get("bps", [])]
+
+def is_ack(line: Dict[str, Any]) -> bool:
+    """Acks answer `bp` and `proto` commands; they are not snapshots and never go into a history."""
+    return "ack" in line
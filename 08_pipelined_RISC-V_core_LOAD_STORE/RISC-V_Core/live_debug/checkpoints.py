@@ -0,0 +1,106 @@
+"""Checkpoints: cycles the frontends no longer hold, rebuilt by replaying the simulator.
+
+The core is deterministic for a given ROM, so a cycle is described by its number: `reset` then
+`run N` lands on the same state again. The frontends log the cycle and a hash of the state of
+every snapshot they see (16 bytes a cycle, kept across resets). A cycle evicted from the history,
+or seen before a `reset`, is rebuilt on demand: reset (only if the simulator is already past it),
+`run` to the window and `batch` through it, collecting full snapshots only there. Every rebuilt
+cycle is checked against its hash, which also catches state a reset does not clear (data memory).
+
+The simulator is then off the live head; the frontend moves it back (see plan) before the next
+command that advances it.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .protocol import stream_batches
+from .trace import record_tuple
+
+WINDOW = 64                  # cycles rebuilt per request
+MOVING = ("step", "run", "batch", "until", "go")   # commands that advance the simulator from where it is
+
+def state_hash(s: Dict[str, Any]) -> int:
+    """Hash of everything a snapshot records but the `until` result (it depends on the command, not the state)."""
+    return hash(record_tuple(s)[:-3])
+
+class Checkpoints:
+    """(cycle, state hash) of every cycle seen, sorted by cycle, across resets."""
+
+    def __init__(self):
+        self.cycles, self.hashes = array("Q"), array("q")
+        self.diverged = []           # cycles seen again with a different state
+
+    def __len__(self): return len(self.cycles)
+
+    def add(self, s: Dict[str, Any]) -> Optional[bool]:
+        """Log a snapshot: None if its cycle is new, else whether it matches the logged state."""
+        c, h = int(s.get("cycle", 0)), state_hash(s)
+        if not self.cycles or c > self.cycles[-1]:
+            self.cycles.append(c)
+            self.hashes.append(h)
+            return None
+        i = bisect_left(self.cycles, c)
+        if self.cycles[i] != c:      # a cycle a sparse run skipped over before the reset
+            self.cycles.insert(i, c)
+            self.hashes.insert(i, h)
+            return None
+        if self.hashes[i] != h: self.diverged.append(c)
+        return self.hashes[i] == h
+
+    def verify(self, s: Dict[str, Any]) -> bool:
+        """Does a rebuilt snapshot match its checkpoint?"""
+        i = self.position(s.get("cycle", -1))
+        return i is not None and self.hashes[i] == state_hash(s)
+
+    def position(self, cycle: int) -> Optional[int]:
+        i = bisect_left(self.cycles, cycle)
+        return i if i < len(self.cycles) and self.cycles[i] == cycle else None
+
+    def before(self, cycle: int) -> int:
+        """How many logged cycles are older than `cycle`."""
+        return bisect_left(self.cycles, cycle)
+
+    def window(self, p: int, direction: int = 0, size: int = WINDOW) -> List[int]:
+        """Logged cycles around position p: ending there when going back, starting there going forward."""
+        lo = p - size + 1 if direction < 0 else p if direction > 0 else p - size // 2
+        lo = max(0, min(lo, len(self.cycles) - size))
+        return self.cycles[lo:lo + size].tolist()
+
+    def clear(self):
+        self.__init__()
+
+def plan(cycles: List[int], at: Optional[int]) -> List[Tuple[str, int]]:
+    """Commands that bring the simulator from cycle `at` (None: unknown) through the sorted `cycles`,
+    replying with at least a snapshot of each: reset, then `run` over the gaps and `batch` along runs."""
+    steps, cur, fresh = [], at, False
+    if cur is None or cycles[0] < cur: steps, cur, fresh = [("reset", 0)], 0, True
+    i = 0
+    while i < len(cycles):
+        j = i
+        while j + 1 < len(cycles) and cycles[j + 1] == cycles[j] + 1: j += 1
+        if cycles[i] > cur or not fresh: steps.append(("run", cycles[i] - cur))    # `run 0` re-sends this cycle
+        if j > i: steps.append(("batch", j - i))
+        cur, fresh, i = cycles[j], False, j + 1
+    return steps
+
+def replay(steps: List[Tuple[str, int]], send: Callable[[str], None], recv: Callable[[], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run a plan over a blocking connection and return every snapshot that came back."""
+    out = []
+    for op, n in steps:
+        if op == "batch": out += stream_batches(send, recv, n)
+        else:
+            send("reset" if op == "reset" else f"run {n}")
+            out.append(recv())
+    return out
+
+def rebuild(checkpoints: Checkpoints, cycles: List[int], snaps: List[Dict[str, Any]]) -> Dict[int, Tuple[Dict[str, Any], bool]]:
+    """The wanted cycles out of replayed snapshots, each with whether it matches its checkpoint."""
+    want = set(cycles)
+    return {s["cycle"]: (s, checkpoints.verify(s)) for s in snaps if s.get("cycle") in want}
+
+def summary(rebuilt: Dict[int, Tuple[Dict[str, Any], bool]]) -> str:
+    bad = sorted(c for c, (_, ok) in rebuilt.items() if not ok)
+    lo, hi = min(rebuilt), max(rebuilt)
+    if not bad: return f"Rebuilt cycles {lo}..{hi} ({len(rebuilt)} verified against the checkpoints)"
+    return (f"❌ Rebuilt cycles {lo}..{hi}: {len(bad)} differ from the recorded run, first at cycle {bad[0]} "
+            "(state a reset does not clear?)")
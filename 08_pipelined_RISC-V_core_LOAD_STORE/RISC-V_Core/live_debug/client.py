@@ -5,41 +5,76 @@ import sys
 import tty
 import termios
 import os
-from dataclasses import dataclass
+import select
+import struct
 from typing import Optional, Dict, Any, List
-from .ui import show_snapshot, Colors
+from .ui import render_snapshot, FrameRenderer, Colors
+from .protocol import stream_batches
+from .history import SnapshotHistory
+from .decoder import decode_rom
+from .metrics import metrics
+from .breakpoints import parse_bp, from_ack, is_ack
+from .events import GO_MAX, HEARTBEAT
+from .shadow_mem import PAGE_WORDS, ShadowMemory
+from .iss import Cosim
+from .history_index import HistoryIndex, parse_query
+from .analytics import ColumnBuffer, analyze, format_report
+from .wire import Decoder, is_proto_ack, read_frame
+from . import checkpoints
 
-@dataclass
-class Breakpoint:
-    kind: str
-    value: int
+# Escape sequences of the navigation keys; anything else is passed through one character at a time
+KEYS = {
+    b'\x1b[A': 'UP', b'\x1b[B': 'DOWN', b'\x1b[C': 'RIGHT', b'\x1b[D': 'LEFT',
+    b'\x1b[5~': 'PGUP', b'\x1b[6~': 'PGDN', b'\x1b[H': 'HOME', b'\x1b[1~': 'HOME', b'\x1bOH': 'HOME',
+}
+MOVES = {'RIGHT': 1, 'LEFT': -1, 'UP': 10, 'DOWN': -10, 'PGUP': 100, 'PGDN': -100}
+FRAME_INTERVAL = 1 / 30   # redraw cap while keys repeat; repeats in between are coalesced
+
+def parse_keys(buf: bytes) -> List[str]:
+    keys, i = [], 0
+    while i < len(buf):
+        for seq, name in KEYS.items():
+            if buf.startswith(seq, i):
+                keys.append(name)
+                i += len(seq)
+                break
+        else:
+            keys.append('ESC' if buf[i] == 0x1b else chr(buf[i]))
+            i += 1
+    return keys
 
 class LiveClient:
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, max_history_mb: Optional[int] = 256, proto: str = "binary"):
         self.host, self.port = host, port
         self.sock, self.f = None, None
-        self.history, self.view_idx = [], -1
-        self.record_file = None
-        self.bp = None
+        self.proto = proto           # asked for after the first snapshot; "json" keeps the line protocol
+        self.wire = None             # wire.Decoder once the simulator acked `proto binary`
+        max_bytes = max_history_mb * 2**20 if max_history_mb else None
+        self.history, self.view_idx = SnapshotHistory(max_bytes=max_bytes), -1
+        self.recorder = None         # binary trace writer, or JSONL for *.jsonl paths
+        self.record_path, self.record_segment = None, 0
+        self.rom = []
+        self.breakpoints = []        # as last listed by the simulator
+        self.events = []             # subscribed events, likewise
+        self.index = HistoryIndex()
+        self.columns = ColumnBuffer()  # for `stats`
+        self.memory = ShadowMemory()   # for `mem`
+        self.cosim = None              # iss.Cosim while `cosim on`
+        self.checkpoints = checkpoints.Checkpoints()   # survive `reset`: the past can be rebuilt
+        self.rebuilt = {}              # cycle -> (snapshot, matches its checkpoint) of the last rebuilt window
+        self.view_cycle = None         # viewing a rebuilt cycle instead of history[view_idx]
+        self.displaced = None          # the simulator's cycle while it is off the live head after a rebuild
+        self.last_search = None
+        self.message = ""
+        self.rom_listing = {}
+        self.pool = None             # SimulatorPool behind `load <program>`
+        self.launch = "auto"         # how that pool starts simulators (--launch)
+        self.sim = None              # the pool simulator we are connected to
 
-    def get_key(self):
-        fd = sys.stdin.fileno()
-        old = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
-            if ch == '\x1b':
-                seq = sys.stdin.read(2)
-                if seq == '[A': return 'UP'
-                if seq == '[B': return 'DOWN'
-                if seq == '[C': return 'RIGHT'
-                if seq == '[D': return 'LEFT'
-                if seq == '[5': sys.stdin.read(1); return 'PGUP'
-                if seq == '[6': sys.stdin.read(1); return 'PGDN'
-                return 'ESC'
-            return ch
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old)
+    def read_keys(self, fd, timeout=None) -> List[str]:
+        """Keys waiting on stdin (blocks up to `timeout`, forever if None); [] if none arrived."""
+        if not select.select([fd], [], [], timeout)[0]: return []
+        return parse_keys(os.read(fd, 1024))
 
     def connect(self):
         print("\033[H\033[J")
@@ -51,65 +86,328 @@ class LiveClient:
                 break
             except: time.sleep(0.5)
         self.sock = s
-        self.f = s.makefile("r", encoding="utf-8")
+        self.f = s.makefile("rb")
+        self.wire = None
+
+    def hello(self):
+        """Read the initial snapshot, then switch to the binary mode if asked to and the simulator knows it.
+        A simulator without `proto` just sends the same snapshot again, and we stay on JSON lines."""
+        s = self.recv_snapshot()
+        if self.proto == "binary":
+            self.send("proto binary")
+            ack = self.recv_message()
+            if is_proto_ack(ack): self.wire = Decoder(ack.get("rom") or self.rom)
+        return s
 
     def close(self):
         try:
-            if self.record_file: self.record_file.close()
+            if self.recorder: self.recorder.close()
             if self.f: self.f.close()
             if self.sock: self.sock.close()
         except: pass
 
-    def send(self, msg): self.sock.sendall((msg.strip()+"\n").encode())
+    def send(self, msg):
+        if self.displaced is not None and msg.split()[0] in checkpoints.MOVING: self.restore()
+        self.sock.sendall((msg.strip()+"\n").encode())
+
+    def _send(self, msg): self.sock.sendall((msg.strip()+"\n").encode())
+
+    def read_raw(self):
+        """Next message as it came: a (kind, payload) frame in binary mode, else a JSON line."""
+        with metrics.timer("chisel"):
+            raw = read_frame(self.f) if self.wire else self.f.readline()
+        if not raw: raise EOFError
+        return raw
+
+    def parse(self, raw) -> Dict[str, Any]:
+        with metrics.timer("parse"):
+            return self.wire.decode(*raw) if self.wire else json.loads(raw)
+
+    def recv_message(self) -> Dict[str, Any]:
+        return self.parse(self.read_raw())
+
+    def store(self, s: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep a snapshot: history, index, stats columns, recording; the view follows the live head."""
+        if s.get("rom"): self.rom, self.rom_listing = s["rom"], decode_rom(s["rom"])
+        self.history.append(s)
+        if self.checkpoints.add(s) is False: self.message = f"❌ Cycle {s.get('cycle')} differs from the earlier run"
+        self.index.add(len(self.history)-1, s)
+        self.index.evict(self.history.start)
+        self.columns.add(s)
+        self.memory.add(s)
+        self.columns.evict(self.history.start)
+        if self.cosim and self.cosim.active and self.cosim.add(s): self.message = self.cosim.status()
+        self.view_idx, self.view_cycle = len(self.history)-1, None
+        if self.recorder: self.recorder.append(s)
+        return s
 
     def recv_snapshot(self):
         while True:
-            line = self.f.readline()
-            if not line: raise EOFError
+            raw = self.read_raw()
             try:
-                s = json.loads(line)
-                self.history.append(s)
-                self.view_idx = len(self.history)-1
-                if self.record_file: self.record_file.write(json.dumps(s)+"\n")
-                return s
-            except: continue
+                s = self.parse(raw)
+            except (json.JSONDecodeError, struct.error, ValueError): continue   # not a snapshot line: skip it
+            return self.store(s)
+
+    def load_program(self, program: str):
+        """Switch to a simulator elaborated for `program`, warm from the pool when one is ready."""
+        from .launcher import SimulatorPool
+        if self.pool is None: self.pool = SimulatorPool(0, host=self.host, mode=self.launch)
+        t0 = time.perf_counter()
+        sim = self.pool.claim(program)
+        self.close()
+        if self.sim: self.pool.release(self.sim)
+        self.sim, self.port, self.recorder = sim, sim.port, None
+        self.connect()
+        self.history.clear()
+        self.index.clear()
+        self.columns.clear()
+        self.memory.clear()
+        self.checkpoints.clear()
+        self.rebuilt, self.view_cycle, self.displaced = {}, None, None
+        checking, self.cosim = self.cosim is not None, None
+        self.hello()
+        if checking: self.cosim_on()
+        self.message = f"Loaded {program} in {time.perf_counter() - t0:.1f}s"
+
+    def record(self, path: Optional[str], segment: int = 0):
+        """Record to `path` (None: stop); segment n > 0 goes to its own file, see trace.segment_path."""
+        from .trace import open_recording, segment_path   # NumPy is only needed for recording
+        if self.recorder: self.recorder.close()
+        self.recorder, self.record_path, self.record_segment = None, path, segment
+        if path: self.recorder = open_recording(segment_path(path, segment), self.rom)
+
+    def reset(self):
+        """Reset the core and start a new history; the checkpoints stay, so the old run can be rebuilt."""
+        self._send("reset")
+        if self.recorder:            # cycles restart at 0: a new segment keeps every recording sorted
+            self.record(self.record_path, self.record_segment + 1)
+        self.displaced, self.view_cycle = None, None
+        self.history.clear()
+        self.index.clear()
+        self.columns.clear()
+        self.memory.clear()
+        return self.recv_snapshot()
+
+    def bp_command(self, args: str):
+        """Send `bp <args>`; the simulator answers with an ack (not a snapshot) listing all breakpoints."""
+        self.send(f"bp {args}")
+        ack = self.recv_message()
+        self.breakpoints = from_ack(ack)
+        return ack
+
+    def continue_to_bp(self, max_cycles=100000):
+        """Run inside the simulator until a breakpoint fires: one round-trip however far it is."""
+        self.view_idx = len(self.history) - 1
+        with metrics.timer("step"):
+            self.send(f"until bp {max_cycles}")
+            s = self.recv_snapshot()
+        until = s.get("until", {})
+        metrics.add_cycles(until.get("steps", 0))
+        if until.get("hit"): self.message = f"Breakpoint #{until.get('bp')} hit after {until.get('steps')} cycles"
+        else: self.message = f"No breakpoint hit in {until.get('steps')} cycles"
+        return until
+
+    def subscribe(self, events: str = "list"):
+        """`sub <events>`: the cycles `go` reports (see live_debug.events)."""
+        self.send(f"sub {events}")
+        ack = self.recv_message()
+        self.events = ack.get("events", [])
+        return ack
+
+    def go(self, max_cycles=GO_MAX, heartbeat=HEARTBEAT):
+        """Run freely inside the simulator; only cycles with a subscribed event, heartbeats and the
+        last cycle come back (and go into the history), then the `go` ack."""
+        self.view_idx = len(self.history) - 1
+        kept = 0
+        with metrics.timer("step"):
+            self.send(f"go {max_cycles} {heartbeat}")
+            while not is_ack(msg := self.recv_message()):
+                self.store(msg)
+                kept += 1
+        metrics.add_cycles(msg.get("steps", 0))
+        self.message = (f"{msg.get('events')} events in {msg.get('steps')} cycles ({kept} snapshots kept)"
+                        + (", core finished" if msg.get("done") else ""))
+        return msg
+
+    def seek(self, key, forward=True) -> bool:
+        """Jump to the nearest recorded cycle matching a history-index key."""
+        self.last_search = key
+        i = self.index.next(key, self.view_idx) if forward else self.index.prev(key, self.view_idx)
+        if i is None:
+            self.message = f"No {'later' if forward else 'earlier'} match for {' '.join(map(str, key))}"
+            return False
+        self.view_idx, self.view_cycle = i, None
+        self.message = f"Match {self.history[i].get('cycle')} ({self.index.count(key)} in history)"
+        return True
+
+    def mem_lines(self, args: List[str]) -> List[str]:
+        """`mem [addr] [words]` at the viewed cycle; `*` marks words stored in that very cycle."""
+        cycle = self.history[self.view_idx].get("cycle") if self.history else None
+        m = self.memory
+        head = f"Data memory at cycle {cycle}: {m.stores} stores"
+        if m.missed: head += f" ({m.missed} cycles skipped by sparse runs: stores there are missing)"
+        if not args:
+            pages = m.touched(cycle)
+            return [head] + [l for base in pages for l in m.format(base, cycle, known_only=True)] + ([] if pages else ["  no stores yet"])
+        return [head] + m.format(int(args[0], 0), cycle, int(args[1]) if len(args) > 1 else PAGE_WORDS)
+
+    def cosim_on(self) -> str:
+        """Check the history against the ISS from its first cycle, then every snapshot as it arrives."""
+        self.cosim = Cosim(self.rom)
+        for i in range(self.history.start, len(self.history)):
+            if self.cosim.add(self.history[i]): break
+        return self.cosim.status()
+
+    def show_breakpoints(self):
+        if not self.breakpoints: print("No breakpoints")
+        for bp in self.breakpoints: print(f"  {bp}")
+
+    def rebuild(self, cycles):
+        """Replay the simulator through `cycles` (logged ones), verifying each against its checkpoint."""
+        at = self.displaced if self.displaced is not None else self.history[-1].get("cycle")
+        with metrics.timer("step"):
+            snaps = checkpoints.replay(checkpoints.plan(cycles, at), self._send, self.recv_message)
+        self.displaced = snaps[-1].get("cycle")
+        self.rebuilt = checkpoints.rebuild(self.checkpoints, cycles, snaps)
+        self.message = checkpoints.summary(self.rebuilt)
+
+    def restore(self):
+        """Bring the simulator back to the live head after a rebuild (and check it got there)."""
+        head, at = self.history[-1], self.displaced
+        self.displaced = None
+        s = checkpoints.replay(checkpoints.plan([head.get("cycle")], at), self._send, self.recv_message)[-1]
+        if checkpoints.state_hash(s) != checkpoints.state_hash(head):
+            self.message = f"❌ Replaying to cycle {head.get('cycle')} did not reproduce the live head"
+
+    def show_cycle(self, p, direction=0):
+        """View the p-th logged cycle, rebuilding a window around it unless it is already rebuilt."""
+        c = self.checkpoints.cycles[p]
+        if c not in self.rebuilt: self.rebuild(self.checkpoints.window(p, direction))
+        self.view_cycle = c
+
+    def oldest_kept(self) -> int:
+        """Checkpoint position of the oldest cycle still in the history (earlier ones are rebuilt)."""
+        return self.checkpoints.before(self.history[self.history.start].get("cycle"))
+
+    def goto(self, cycle: int):
+        """View any cycle seen so far: from the history if it is kept, else rebuilt from reset."""
+        lo, hi = self.history.start, len(self.history) - 1
+        if self.history and self.history[lo].get("cycle") <= cycle <= self.history[hi].get("cycle"):
+            while lo < hi:               # cycles ascend within a history: the last one at or before `cycle`
+                mid = (lo + hi + 1) // 2
+                if self.history[mid].get("cycle") <= cycle: lo = mid
+                else: hi = mid - 1
+            self.view_idx, self.view_cycle = lo, None
+            self.message = f"Cycle {self.history[lo].get('cycle')} (history)"
+            return
+        p = self.checkpoints.position(cycle)
+        if p is None:
+            self.message = f"Cycle {cycle} was never recorded"
+            return
+        self.show_cycle(p)
 
     def step_delta(self, n):
+        if self.view_cycle is not None:
+            # In the rebuilt past: walk the logged cycles until the history takes over again
+            p = max(0, min(self.checkpoints.position(self.view_cycle) + n, len(self.checkpoints) - 1))
+            c = self.checkpoints.cycles[p]
+            if self.history[self.history.start].get("cycle") <= c <= self.history[-1].get("cycle"): self.goto(c)
+            else: self.show_cycle(p, n)
+            return
         target = self.view_idx + n
+        if target < self.history.start and self.oldest_kept() > 0:
+            self.show_cycle(max(0, self.oldest_kept() - (self.history.start - target)), -1)
+            return
         live_head = len(self.history) - 1
         if target <= live_head:
-            self.view_idx = max(0, target)
+            self.view_idx = max(self.history.start, target)
             return
         needed = target - live_head
         self.view_idx = live_head
-        for _ in range(needed):
-            self.send("step")
-            self.recv_snapshot()
+        with metrics.timer("step"):
+            if needed == 1:
+                self.send("step")
+                self.recv_snapshot()
+                metrics.add_cycles(1)
+            else:
+                self.fast_forward(needed)
+
+    def fast_forward(self, n, every=1):
+        """Advance n cycles in pipelined batches, keeping every k-th snapshot."""
+        for _ in stream_batches(self.send, self.recv_snapshot, n, every): pass
+        metrics.add_cycles(n)
 
     def handle_command_input(self):
         print("\033[?25h")
         os.system("stty sane")
         try:
-            cmd = input(f"\n{Colors.BOLD}COMMAND > {Colors.RESET}").strip().lower()
+            raw = input(f"\n{Colors.BOLD}COMMAND > {Colors.RESET}").strip()
+            cmd = raw.lower()
             if cmd.startswith("record on "):
                 path = cmd.split(" ", 2)[2]
-                self.record_file = open(path, "w")
+                self.record(path)
                 print(f"Recording to {path}")
             elif cmd == "record off":
-                if self.record_file: self.record_file.close()
-                self.record_file = None
+                self.record(None)
                 print("Recording stopped")
             elif cmd in ["reset", "clear"]:
-                self.send("reset")
-                self.history.clear()
-                self.recv_snapshot()
-            elif cmd.startswith("bp "):
+                self.reset()
+            elif cmd.startswith("goto "):
+                self.goto(int(cmd.split()[1], 0))
+                print(self.message)
+            elif cmd.startswith("ff "):
+                parts = cmd.split()
+                n = int(parts[1])
+                every = int(parts[2]) if len(parts) > 2 else 1
+                t0 = time.perf_counter()
+                self.fast_forward(n, every)
+                dt = time.perf_counter() - t0
+                print(f"Advanced {n} cycles in {dt:.2f}s ({n/max(dt,1e-9):.0f} cycles/s)")
+            elif cmd == "bp" or cmd.startswith("bp "):
+                args = cmd[2:].strip()
+                if args in ("", "list"):
+                    self.bp_command("list")
+                elif args == "clear" or args.startswith("del "):
+                    ack = self.bp_command(args)
+                    if not ack.get("ok"): print(f"Error: {ack.get('error')}")
+                else:
+                    if args.startswith("add "): args = args[4:]
+                    ack = self.bp_command(f"add {parse_bp(args).args()}")
+                    if not ack.get("ok"): print(f"Error: {ack.get('error')}")
+                    else: print(f"BP #{ack['id']} set")
+                self.show_breakpoints()
+            elif cmd == "sub" or cmd.startswith("sub "):
+                ack = self.subscribe(cmd[3:].strip() or "list")
+                if not ack.get("ok"): print(f"Error: {ack.get('error')}")
+                print("Events: " + (" ".join(self.events) or "none (heartbeats only)"))
+            elif cmd == "go" or cmd.startswith("go "):
                 parts = cmd.split()
-                if len(parts) > 1:
-                    val = int(parts[-1], 16) if parts[-1].startswith("0x") else int(parts[-1])
-                    kind = parts[1] if len(parts) > 2 else "if_pc"
-                    self.bp = Breakpoint(kind, val)
-                    print(f"BP set: {kind}={val:#x}")
+                self.go(int(parts[1]) if len(parts) > 1 else GO_MAX, int(parts[2]) if len(parts) > 2 else HEARTBEAT)
+                print(self.message)
+            elif cmd.startswith("next ") or cmd.startswith("prev "):
+                self.seek(parse_query(cmd[5:]), cmd.startswith("next"))
+                print(self.message)
+            elif cmd in ("c", "continue") or cmd.startswith("continue "):
+                parts = cmd.split()
+                self.continue_to_bp(int(parts[1]) if len(parts) > 1 else 100000)
+                print(self.message)
+            elif cmd.startswith("load "):
+                self.load_program(raw.split(" ", 1)[1].strip())   # paths keep their case
+                print(self.message)
+            elif cmd == "stats" or cmd.startswith("stats "):
+                parts = cmd.split()
+                r = analyze(self.columns.columns(), self.rom, int(parts[1]) if len(parts) > 1 else 10)
+                print("\n".join(format_report(r)))
+                input("\nPress Enter to return...")
+            elif cmd == "mem" or cmd.startswith("mem "):
+                print("\n".join(self.mem_lines(cmd.split()[1:])))
+                input("\nPress Enter to return...")
+            elif cmd == "cosim" or cmd.startswith("cosim "):
+                arg = cmd[5:].strip()
+                if arg == "off": self.cosim = None
+                elif arg == "on" or self.cosim is None: self.cosim_on()
+                print(self.cosim.status() if self.cosim else "Co-simulation off")
             elif cmd in ["help", "h"]:
                 self.show_help()
             if cmd: time.sleep(0.8)
@@ -125,38 +423,88 @@ class LiveClient:
         print(" [:]          Enter Command Mode")
         print(" [q]          Quit")
         print("\nCommands (type ':' first):")
-        print("  bp <val>        Set Breakpoint (IF PC)")
-        print("  record on <f>   Start recording to file")
+        print("  bp [kind] [op] <val> [n]  Add breakpoint, firing from the n-th hit")
+        print("                  kinds: if_pc (default) id_pc ex_pc mem_pc wb_pc wb_rd wb_we")
+        print("                         mem_addr mem_wr mem_rd cycle x0..x31; ops: == != < > <= >=")
+        print("  bp / bp del <id> / bp clear   List / delete / clear breakpoints")
+        print("  c [max]         Continue until a breakpoint fires (also the 'c' key)")
+        print("  sub <events>    Events `go` reports: stall flush fwd write[=x1,x5] store[=lo-hi] done")
+        print("  go [max] [hb]   Run up to max cycles, keeping only event cycles and every hb-th")
+        print("  next|prev <q>   Jump to the next/previous recorded match ('n'/'p' repeat it)")
+        print("                  q: pc|if_pc..wb_pc <pc>, x<n> or wb_rd <n>, mem|mem_wr|mem_rd <addr>, stall, flush")
+        print("  stats [n]       CPI, stalls, flushes, forwarding and the n hottest PCs of the history")
+        print("  mem [addr] [n]  Data memory at the viewed cycle, rebuilt from the stores (no addr: touched pages)")
+        print("  ff <n> [k]      Fast-forward n cycles, keep every k-th")
+        print("  goto <cycle>    View any cycle seen so far; evicted or pre-reset ones are replayed and verified")
+        print("  cosim [on|off]  Check every write-back against the instruction-set simulator (first mismatch)")
+        print("  record on <f>   Start recording to file (binary trace; JSONL if <f> ends in .jsonl)")
+        print("                  after a reset it goes on in a new file: run.rvt, run.1.rvt, ...")
+        print("  load <hex>      Switch to another program (a warm simulator if --warm is set)")
         print("  reset / clear   Reset Processor & History")
         input("\nPress Enter to return...")
 
+    def frame(self) -> List[str]:
+        if self.view_cycle is not None:
+            s, ok = self.rebuilt[self.view_cycle]
+            lines = render_snapshot(s)
+            check = f"{Colors.GREEN}verified{Colors.RESET}" if ok else f"{Colors.RED}differs from the recorded run{Colors.RESET}"
+            lines += ["", f"{Colors.ORANGE} ♻️  REBUILT {Colors.RESET} | Cycle: {self.view_cycle} | {check} | [➡️ ] back to the history"]
+            lines.append(f"{Colors.BLUE}{self.message}{Colors.RESET}")
+            lines.append(f"{Colors.DIM}{metrics.status_line(('chisel', 'parse', 'step'))}{Colors.RESET}")
+            return lines
+        self.view_idx = max(self.history.start, min(self.view_idx, len(self.history)-1))
+        lines = render_snapshot(self.history[self.view_idx])
+        live = len(self.history)-1
+        lines.append("")
+        if self.view_idx == live: lines.append(f"{Colors.GREEN} 🟢 LIVE HEAD {Colors.RESET} | Cycle: {self.history[-1].get('cycle')}")
+        else:                     lines.append(f"{Colors.ORANGE} ⏪ HISTORY {Colors.RESET} | View: {self.view_idx}/{live}")
+        lines.append(f"{Colors.BLUE}{self.message}{Colors.RESET}")
+        lines.append(f"{Colors.DIM}{metrics.status_line(('chisel', 'parse', 'step'))}{Colors.RESET}")
+        lines.append(f"{Colors.DIM} [⬆️/⬇️  +/-10] [➡️ /⬅️  +/-1] [Enter=Live] [c=Continue] [:=Cmd] [h=Help] [q=Quit]{Colors.RESET}")
+        return lines
+
+    def handle_key(self, key) -> bool:
+        """Apply one non-movement key; False means quit."""
+        if key == 'q': return False
+        elif key in ('\r', '\n'): self.view_idx, self.view_cycle = len(self.history)-1, None
+        elif key in (':', ';', 'h', '?'):
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.term)
+            self.renderer.close()
+            self.handle_command_input()
+            tty.setcbreak(self.fd)
+            self.renderer.invalidate()
+        elif key == 'HOME': self.view_idx, self.view_cycle = self.history.start, None
+        elif key == 'c': self.continue_to_bp()
+        elif key in ('n', 'p') and self.last_search: self.seek(self.last_search, key == 'n')
+        return True
+
     def run(self):
         self.connect()
+        self.fd = sys.stdin.fileno()
+        self.term = termios.tcgetattr(self.fd)
+        self.renderer = FrameRenderer()
         try:
-            self.recv_snapshot()
-            while True:
-                print("\033[H", end="")
-                self.view_idx = max(0, min(self.view_idx, len(self.history)-1))
-                show_snapshot(self.history[self.view_idx])
-
-                live = len(self.history)-1
-                is_live = (self.view_idx == live)
-                print("\033[K")
-                if is_live: print(f"{Colors.GREEN} 🟢 LIVE HEAD {Colors.RESET} | Cycle: {self.history[-1].get('cycle')}\033[K")
-                else:       print(f"{Colors.ORANGE} ⏪ HISTORY {Colors.RESET} | View: {self.view_idx}/{live}\033[K")
-                print(f"{Colors.DIM} [⬆️/⬇️  +/-10] [➡️ /⬅️  +/-1] [Enter=Live] [:=Cmd] [h=Help] [q=Quit]{Colors.RESET}\033[K")
-
-                key = self.get_key()
-                if key=='q': break
-                elif key=='\r' or key=='\n': self.view_idx = live
-                elif key==':' or key == ';': self.handle_command_input()
-                elif key=='h' or key == '?': self.handle_command_input()
-                elif key=='RIGHT': self.step_delta(1)
-                elif key=='LEFT':  self.step_delta(-1)
-                elif key=='UP':    self.step_delta(10)
-                elif key=='DOWN':  self.step_delta(-10)
-                elif key=='PGUP':  self.step_delta(100)
-                elif key=='PGDN':  self.step_delta(-100)
-                elif key=='HOME': self.view_idx = 0
+            self.hello()
+            tty.setcbreak(self.fd)
+            running = True
+            while running:
+                self.renderer.draw(self.frame())
+                keys = self.read_keys(self.fd)
+                # Held keys: collect repeats until the next frame is due, then move once
+                while (left := self.renderer.last + FRAME_INTERVAL - time.perf_counter()) > 0:
+                    more = self.read_keys(self.fd, left)
+                    if not more: break
+                    keys += more
+                delta, self.message = 0, ""
+                for key in keys:
+                    if key in MOVES:
+                        delta += MOVES[key]
+                        continue
+                    if delta: self.step_delta(delta); delta = 0
+                    running = self.handle_key(key)
+                    if not running: break
+                if delta and running: self.step_delta(delta)
         finally:
-            self.close()
\ No newline at end of file
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.term)
+            self.renderer.close()
+            self.close()
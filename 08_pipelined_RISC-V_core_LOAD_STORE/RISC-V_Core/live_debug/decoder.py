@@ -1,51 +1,111 @@
 
+from typing import Dict, Iterable, Union
+
 REG = [f"x{i}" for i in range(32)]
 
+NOP = 0x00000013
+DECODE_CACHE_SIZE = 4096
+
+# --- Opcode / funct tables ---
+OPCODES = {
+    "LUI": 0x37, "AUIPC": 0x17, "JAL": 0x6F, "JALR": 0x67, "BRANCH": 0x63,
+    "LOAD": 0x03, "STORE": 0x23, "OP_IMM": 0x13, "OP": 0x33,
+}
+BRANCH = {0x0:"beq",0x1:"bne",0x4:"blt",0x5:"bge",0x6:"bltu",0x7:"bgeu"}
+LOAD   = {0x0:"lb",0x1:"lh",0x2:"lw",0x4:"lbu",0x5:"lhu"}
+STORE  = {0x0:"sb",0x1:"sh",0x2:"sw"}
+OP_IMM = {0x0:"addi",0x2:"slti",0x3:"sltiu",0x7:"andi",0x6:"ori",0x4:"xori"}
+SHIFT_IMM = {(0x00,0x1):"slli",(0x00,0x5):"srli",(0x20,0x5):"srai"}   # (funct7, funct3), shamt in rs2
+OP = {   # (funct7, funct3)
+    (0x00,0x0):"add",(0x00,0x1):"sll",(0x00,0x2):"slt",(0x00,0x3):"sltu",
+    (0x00,0x4):"xor",(0x00,0x5):"srl",(0x00,0x6):"or",(0x00,0x7):"and",
+    (0x20,0x0):"sub",(0x20,0x5):"sra",
+}
+
 def sign_extend(value: int, bits: int) -> int:
     sign = 1 << (bits - 1)
     return (value & (sign - 1)) - (value & sign)
 
+# --- Field extraction ---
+def fields(instr: int):
+    """(opcode, rd, funct3, rs1, rs2, funct7) of a 32-bit instruction word."""
+    return (instr & 0x7F, (instr >> 7) & 0x1F, (instr >> 12) & 0x7,
+            (instr >> 15) & 0x1F, (instr >> 20) & 0x1F, (instr >> 25) & 0x7F)
+
+def i_imm(instr): return sign_extend((instr >> 20) & 0xFFF, 12)
+def s_imm(instr): return sign_extend(((instr >> 7) & 0x1F) | (((instr >> 25) & 0x7F) << 5), 12)
+def b_imm(instr): return sign_extend((((instr >> 8) & 0xF) << 1) | (((instr >> 25) & 0x3F) << 5) | (((instr >> 7) & 0x1) << 11) | (((instr >> 31) & 0x1) << 12), 13)
+def u_imm(instr): return instr & 0xFFFFF000
+def j_imm(instr): return sign_extend((((instr >> 21) & 0x3FF) << 1) | (((instr >> 20) & 0x1) << 11) | (((instr >> 12) & 0xFF) << 12) | (((instr >> 31) & 0x1) << 20), 21)
+
+# --- Per-opcode formatters ---
+def _lui(i, rd, f3, rs1, rs2, f7):    return f"lui {REG[rd]}, {u_imm(i):#x}"
+def _auipc(i, rd, f3, rs1, rs2, f7):  return f"auipc {REG[rd]}, {u_imm(i):#x}"
+def _jal(i, rd, f3, rs1, rs2, f7):    return f"jal {REG[rd]}, {j_imm(i):+d}"
+def _jalr(i, rd, f3, rs1, rs2, f7):
+    return f"jalr {REG[rd]}, {i_imm(i):+d}({REG[rs1]})" if f3 == 0x0 else "unknown"
+def _branch(i, rd, f3, rs1, rs2, f7): return f"{BRANCH.get(f3,'b?')} {REG[rs1]}, {REG[rs2]}, {b_imm(i):+d}"
+def _load(i, rd, f3, rs1, rs2, f7):   return f"{LOAD.get(f3,'l?')} {REG[rd]}, {i_imm(i):+d}({REG[rs1]})"
+def _store(i, rd, f3, rs1, rs2, f7):  return f"{STORE.get(f3,'s?')} {REG[rs2]}, {s_imm(i):+d}({REG[rs1]})"
+def _op_imm(i, rd, f3, rs1, rs2, f7):
+    if f3 in (0x1, 0x5):
+        m = SHIFT_IMM.get((f7, f3))
+        return f"{m} {REG[rd]}, {REG[rs1]}, {rs2}" if m else "opimm?"
+    m = OP_IMM.get(f3)
+    return f"{m} {REG[rd]}, {REG[rs1]}, {i_imm(i)}" if m else "opimm?"
+def _op(i, rd, f3, rs1, rs2, f7):
+    if f7 not in (0x00, 0x20): return "unknown"
+    return f"{OP.get((f7, f3), 'op?')} {REG[rd]}, {REG[rs1]}, {REG[rs2]}"
+
+FORMATTERS = {
+    OPCODES["LUI"]: _lui, OPCODES["AUIPC"]: _auipc, OPCODES["JAL"]: _jal, OPCODES["JALR"]: _jalr,
+    OPCODES["BRANCH"]: _branch, OPCODES["LOAD"]: _load, OPCODES["STORE"]: _store,
+    OPCODES["OP_IMM"]: _op_imm, OPCODES["OP"]: _op,
+}
+
+def _decode(instr: int) -> str:
+    if instr == NOP: return "nop"
+    op, rd, f3, rs1, rs2, f7 = fields(instr)
+    fmt = FORMATTERS.get(op)
+    return fmt(instr, rd, f3, rs1, rs2, f7) if fmt else "unknown"
+
+# Bounded decode cache: the live tools see the same few hundred words over and over,
+# so dropping the whole table when it fills up is cheaper than tracking recency.
+_cache: Dict[int, str] = {}
+
 def decode_rv32i(instr: int) -> str:
-    instr &= 0xFFFFFFFF
-    opcode = instr & 0x7F
-    rd     = (instr >> 7) & 0x1F
-    funct3 = (instr >> 12) & 0x7
-    rs1    = (instr >> 15) & 0x1F
-    rs2    = (instr >> 20) & 0x1F
-    funct7 = (instr >> 25) & 0x7F
-
-    def i_imm(): return sign_extend((instr >> 20) & 0xFFF, 12)
-    def s_imm(): return sign_extend(((instr >> 7) & 0x1F) | (((instr >> 25) & 0x7F) << 5), 12)
-    def b_imm(): return sign_extend((((instr >> 8) & 0xF) << 1) | (((instr >> 25) & 0x3F) << 5) | (((instr >> 7) & 0x1) << 11) | (((instr >> 31) & 0x1) << 12), 13)
-    def u_imm(): return instr & 0xFFFFF000
-    def j_imm(): return sign_extend((((instr >> 21) & 0x3FF) << 1) | (((instr >> 20) & 0x1) << 11) | (((instr >> 12) & 0xFF) << 12) | (((instr >> 31) & 0x1) << 20), 21)
-
-    if instr == 0x00000013: return "nop"
-    if opcode == 0x37: return f"lui {REG[rd]}, {u_imm():#x}"
-    if opcode == 0x17: return f"auipc {REG[rd]}, {u_imm():#x}"
-    if opcode == 0x6F: return f"jal {REG[rd]}, {j_imm():+d}"
-    if opcode == 0x67 and funct3 == 0x0: return f"jalr {REG[rd]}, {i_imm():+d}({REG[rs1]})"
-    if opcode == 0x63:
-        m = {0x0:"beq",0x1:"bne",0x4:"blt",0x5:"bge",0x6:"bltu",0x7:"bgeu"}.get(funct3,"b?")
-        return f"{m} {REG[rs1]}, {REG[rs2]}, {b_imm():+d}"
-    if opcode == 0x03:
-        m = {0x0:"lb",0x1:"lh",0x2:"lw",0x4:"lbu",0x5:"lhu"}.get(funct3,"l?")
-        return f"{m} {REG[rd]}, {i_imm():+d}({REG[rs1]})"
-    if opcode == 0x23:
-        m = {0x0:"sb",0x1:"sh",0x2:"sw"}.get(funct3,"s?")
-        return f"{m} {REG[rs2]}, {s_imm():+d}({REG[rs1]})"
-    if opcode == 0x13:
-        imm = i_imm()
-        if funct3 == 0x0: return f"addi {REG[rd]}, {REG[rs1]}, {imm}"
-        if funct3 == 0x7: return f"andi {REG[rd]}, {REG[rs1]}, {imm}"
-        if funct3 == 0x6: return f"ori {REG[rd]}, {REG[rs1]}, {imm}"
-        if funct3 == 0x4: return f"xori {REG[rd]}, {REG[rs1]}, {imm}"
-        return "opimm?"
-    if opcode == 0x33:
-        if funct7 == 0x00:
-            m = {0x0:"add",0x1:"sll",0x2:"slt",0x3:"sltu",0x4:"xor",0x5:"srl",0x6:"or",0x7:"and"}.get(funct3,"op?")
-            return f"{m} {REG[rd]}, {REG[rs1]}, {REG[rs2]}"
-        if funct7 == 0x20:
-            m = {0x0:"sub",0x5:"sra"}.get(funct3,"op?")
-            return f"{m} {REG[rd]}, {REG[rs1]}, {REG[rs2]}"
-    return "unknown"
\ No newline at end of file
+    asm = _cache.get(instr)
+    if asm is None:
+        asm = _decode(instr & 0xFFFFFFFF)
+        if len(_cache) >= DECODE_CACHE_SIZE: _cache.clear()
+        _cache[instr] = asm
+    return asm
+
+def clear_cache():
+    _cache.clear()
+
+# --- Bulk APIs ---
+def parse_word(w: Union[int, str]) -> int:
+    """ROM entries arrive as "0x..." strings in the cycle-0 snapshot."""
+    return int(w, 16) if isinstance(w, str) else int(w)
+
+def decode_rom(rom: Iterable[Union[int, str]], base: int = 0) -> Dict[int, str]:
+    """Pre-decode a whole ROM into a PC-indexed listing (and warm the decode cache)."""
+    return {base + 4 * i: decode_rv32i(parse_word(w)) for i, w in enumerate(rom)}
+
+def decode_fields(words):
+    """Vectorized field extraction for a NumPy array of instruction words."""
+    import numpy as np
+    w = np.asarray(words, dtype=np.uint32)
+    return {
+        "opcode": w & 0x7F, "rd": (w >> 7) & 0x1F, "funct3": (w >> 12) & 0x7,
+        "rs1": (w >> 15) & 0x1F, "rs2": (w >> 20) & 0x1F, "funct7": (w >> 25) & 0x7F,
+    }
+
+def decode_array(words):
+    """Decode a NumPy array of instruction words; each distinct word is decoded once."""
+    import numpy as np
+    w = np.asarray(words, dtype=np.uint32)
+    uniq, inv = np.unique(w, return_inverse=True)
+    asm = np.array([decode_rv32i(int(u)) for u in uniq], dtype=object)
+    return asm[inv].reshape(w.shape)
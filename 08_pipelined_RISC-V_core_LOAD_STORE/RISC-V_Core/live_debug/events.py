@@ -0,0 +1,92 @@
+"""Event subscriptions: `sub` picks the cycles a `go` run reports, so long runs cost per event.
+
+    sub stall flush write=x1,x10 store=0x100-0x1ff   subscribe (replaces the previous set)
+    sub | sub list | sub clear
+    go <max> [heartbeat]
+
+Events (each reads the snapshot of one cycle):
+    stall           IF/ID held by a load-use hazard
+    flush           IF/ID flushed by a taken branch or jump
+    fwd             EX takes an operand forwarded from MEM or WB
+    write[=x1,x5]   a register write-back (x0 never counts), to any or to the listed registers
+    store[=lo-hi]   a store in MEM, at any address or in [lo, hi]
+    done            coreDone
+
+`go` runs up to max cycles, stopping early when the core finishes. It streams the snapshot of every
+cycle with a subscribed event, one every `heartbeat` cycles (0: none) and the one of the last cycle,
+then sends an ack instead of the usual loop-head snapshot:
+    {"ack": "go", "ok": true, "steps": n, "events": k, "done": 0|1}
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from .breakpoints import REG_KIND, parse_value
+
+NAMES = ("stall", "flush", "fwd", "write", "store", "done")
+GO_MAX = 100000
+HEARTBEAT = 10000
+
+def _get(s, group, key):
+    g = s.get(group)
+    return int(g.get(key, 0) or 0) if isinstance(g, dict) else 0
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    regs: Tuple[int, ...] = ()                  # write: only these registers (empty: any)
+    span: Optional[Tuple[int, int]] = None      # store: only addresses in [lo, hi]
+
+    def __str__(self):
+        if self.regs: return f"{self.name}=" + ",".join(f"x{r}" for r in self.regs)
+        if self.span: return f"{self.name}={self.span[0]:#x}-{self.span[1]:#x}"
+        return self.name
+
+    def match(self, s: Dict[str, Any]) -> bool:
+        if self.name == "stall": return bool(_get(s, "hazard", "if_stall") or _get(s, "hazard", "id_stall"))
+        if self.name == "flush": return bool(_get(s, "hazard", "flush"))
+        if self.name == "fwd": return bool(_get(s, "fwd", "a_sel") or _get(s, "fwd", "b_sel"))
+        if self.name == "write":
+            rd = _get(s, "wb", "rd")
+            return bool(_get(s, "wb", "we")) and rd != 0 and (not self.regs or rd in self.regs)
+        if self.name == "store":
+            # SW is encoded as 0 in memWrOpT, like the mem_wr breakpoint
+            if "wr_op" not in s.get("mem", {}) or _get(s, "mem", "wr_op") != 0: return False
+            return self.span is None or self.span[0] <= _get(s, "mem", "addr") <= self.span[1]
+        return bool(s.get("coreDone"))
+
+def parse_event(text: str) -> Event:
+    """`stall`, `write=x1,x5`, `store=0x100-0x1ff`, `store=0x80` (one address)..."""
+    name, _, arg = text.strip().lower().partition("=")
+    if name not in NAMES: raise ValueError(f"unknown event {name!r} (one of {', '.join(NAMES)})")
+    if not arg: return Event(name)
+    if name == "write":
+        regs = arg.split(",")
+        if not all(REG_KIND.match(r) for r in regs): raise ValueError(f"bad register list {arg!r}")
+        return Event(name, regs=tuple(sorted({int(r[1:]) for r in regs})))
+    if name == "store":
+        lo, _, hi = arg.partition("-")
+        span = (parse_value(lo), parse_value(hi or lo))
+        if span[0] > span[1]: raise ValueError(f"empty address range {arg!r}")
+        return Event(name, span=span)
+    raise ValueError(f"event {name!r} takes no argument")
+
+class Subscription:
+    """The subscribed events, as kept by the simulator side of `sub` / `go`."""
+
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def names(self) -> List[str]:
+        return [str(ev) for ev in self.events]
+
+    def matches(self, s: Dict[str, Any]) -> List[str]:
+        """Names of the subscribed events that happen in this snapshot."""
+        return [str(ev) for ev in self.events if ev.match(s)]
+
+    def command(self, parts: List[str]) -> Dict[str, Any]:
+        """Handle the arguments of a `sub` command; returns the JSON ack LivePipelineTest would send."""
+        try:
+            if parts == ["clear"]: self.events = []
+            elif parts and parts != ["list"]: self.events = list(dict.fromkeys(parse_event(p) for p in parts))
+            return {"ack": "sub", "ok": True, "events": self.names()}
+        except ValueError as e:
+            return {"ack": "sub", "ok": False, "error": str(e), "events": self.names()}
@@ -0,0 +1,111 @@
+
+import sys
+from collections import deque
+from typing import Dict, Any, Optional
+
+_MISSING = object()
+
+class SnapshotHistory:
+    """Append-only snapshot history with a full keyframe every N entries and flat deltas in between.
+
+    Indices are absolute: once the memory ceiling evicts the oldest keyframe groups,
+    `start` moves forward and earlier indices raise IndexError.
+    """
+
+    def __init__(self, keyframe_every: int = 64, max_bytes: Optional[int] = None):
+        self.keyframe_every = max(1, keyframe_every)
+        self.max_bytes = max_bytes
+        self.start = 0
+        self.nbytes = 0
+        self._paths, self._path_idx = [], {}
+        self._groups = deque()       # [keyframe dict, delta tuple, ...] per keyframe interval
+        self._group_bytes = deque()
+        self._len = 0
+        self._last_flat = None
+        self._cache = (None, None)   # (index, flat) of the last rebuilt entry
+
+    # --- flattening -------------------------------------------------------
+    def _flatten(self, d, prefix, out):
+        for k, v in d.items():
+            path = prefix + (k,)
+            if isinstance(v, dict):
+                self._flatten(v, path, out)
+                continue
+            idx = self._path_idx.get(path)
+            if idx is None:
+                idx = self._path_idx[path] = len(self._paths)
+                self._paths.append(path)
+            out[idx] = tuple(v) if isinstance(v, list) else v
+        return out
+
+    def _unflatten(self, flat):
+        root = {}
+        for idx, v in flat.items():
+            path = self._paths[idx]
+            cur = root
+            for p in path[:-1]:
+                cur = cur.setdefault(p, {})
+            cur[path[-1]] = list(v) if isinstance(v, tuple) else v
+        return root
+
+    # --- list-like API ----------------------------------------------------
+    def __len__(self): return self._len
+
+    def __bool__(self): return self._len > 0
+
+    def append(self, snap: Dict[str, Any]):
+        flat = self._flatten(snap, (), {})
+        prev = self._last_flat
+        if self._len % self.keyframe_every == 0 or prev is None:
+            entry = flat
+            self._groups.append([entry])
+            self._group_bytes.append(0)
+        else:
+            delta = []
+            for idx, v in flat.items():
+                if prev.get(idx, _MISSING) != v: delta += (idx, v)
+            for idx in prev.keys() - flat.keys(): delta += (idx, _MISSING)
+            entry = tuple(delta)
+            self._groups[-1].append(entry)
+        size = sys.getsizeof(entry) + 28 * len(entry)
+        self._group_bytes[-1] += size
+        self.nbytes += size
+        self._last_flat = flat
+        self._len += 1
+        self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None: return
+        while self.nbytes > self.max_bytes and len(self._groups) > 1:
+            self._groups.popleft()
+            self.nbytes -= self._group_bytes.popleft()
+            self.start += self.keyframe_every
+        if self._cache[0] is not None and self._cache[0] < self.start: self._cache = (None, None)
+
+    def _flat_at(self, i):
+        g, off = divmod(i, self.keyframe_every)
+        group = self._groups[g - self.start // self.keyframe_every]
+        ci, cflat = self._cache
+        if ci is not None and ci // self.keyframe_every == g and ci <= i:
+            flat, first = dict(cflat), ci % self.keyframe_every + 1
+        else:
+            flat, first = dict(group[0]), 1
+        for delta in group[first:off + 1]:
+            for j in range(0, len(delta), 2):
+                if delta[j + 1] is _MISSING: flat.pop(delta[j], None)
+                else: flat[delta[j]] = delta[j + 1]
+        self._cache = (i, flat)
+        return flat
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0: i += self._len
+        if not self.start <= i < self._len:
+            raise IndexError(f"history index {i} outside [{self.start}, {self._len})")
+        return self._unflatten(self._flat_at(i))
+
+    def clear(self):
+        self.__init__(self.keyframe_every, self.max_bytes)
+
+    def bytes_per_entry(self) -> float:
+        kept = self._len - self.start
+        return self.nbytes / kept if kept else 0.0
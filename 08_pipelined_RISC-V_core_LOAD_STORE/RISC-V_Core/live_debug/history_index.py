@@ -0,0 +1,86 @@
+import bisect
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from .breakpoints import parse_value
+
+STAGES = ("if", "id", "ex", "mem", "wb")
+TRIM_EVERY = 1 << 16     # compact the lists once this many history entries have been evicted
+
+Key = Tuple[Any, ...]
+
+def _get(d, a, b, default=0):
+    sub = d.get(a)
+    return sub.get(b, default) if isinstance(sub, dict) else default
+
+def snapshot_keys(s: Dict[str, Any]) -> List[Key]:
+    """Index keys of one snapshot: stage PCs, register writes, memory accesses, stalls, flushes."""
+    keys = [("pc", st, int(_get(s, "pc", st))) for st in STAGES]
+    rd = int(_get(s, "wb", "rd"))
+    if _get(s, "wb", "we") and rd: keys.append(("wb_rd", rd))
+    addr = int(_get(s, "mem", "addr"))
+    if _get(s, "mem", "wr_op", 1) == 0: keys += [("mem", addr), ("mem_wr", addr)]   # SW == 0
+    elif _get(s, "mem", "rd_op", 1) == 0: keys += [("mem", addr), ("mem_rd", addr)] # LW == 0
+    if _get(s, "hazard", "if_stall") or _get(s, "hazard", "id_stall"): keys.append(("stall",))
+    if _get(s, "hazard", "flush"): keys.append(("flush",))
+    return keys
+
+def parse_query(text: str) -> Key:
+    """`if_pc 0x40`..`wb_pc 0x40`, `pc 0x40` (IF), `x5` / `wb_rd 5`, `mem|mem_wr|mem_rd 0x100`, `stall`, `flush`."""
+    parts = text.lower().split()
+    if not parts: raise ValueError("empty search")
+    kind, args = parts[0], parts[1:]
+    if kind in ("stall", "flush") and not args: return (kind,)
+    if kind.startswith("x") and kind[1:].isdigit() and not args and int(kind[1:]) < 32: return ("wb_rd", int(kind[1:]))
+    if len(args) != 1: raise ValueError(f"bad search {text!r}")
+    value = parse_value(args[0])
+    if kind == "pc": return ("pc", "if", value)
+    if kind.endswith("_pc") and kind[:-3] in STAGES: return ("pc", kind[:-3], value)
+    if kind == "wb_rd": return ("wb_rd", value)
+    if kind in ("mem", "mem_wr", "mem_rd"): return (kind, value)
+    raise ValueError(f"unknown search {kind!r}")
+
+class HistoryIndex:
+    """Sorted history-index lists per key, appended to as the history grows.
+
+    `next` / `prev` are a bisect into one list, so jumping to the nearest matching cycle
+    never walks the snapshots themselves.
+    """
+
+    def __init__(self):
+        self.lists: Dict[Key, List[int]] = defaultdict(list)
+        self.start = 0               # entries before this were evicted from the history
+        self._trimmed = 0
+
+    def add(self, i: int, snap: Dict[str, Any]):
+        for key in snapshot_keys(snap): self.lists[key].append(i)
+
+    def next(self, key: Key, i: int) -> Optional[int]:
+        """First indexed entry after i."""
+        lst = self.lists.get(key)
+        if not lst: return None
+        j = bisect.bisect_right(lst, max(i, self.start - 1))
+        return lst[j] if j < len(lst) else None
+
+    def prev(self, key: Key, i: int) -> Optional[int]:
+        """Last indexed entry before i that is still in the history."""
+        lst = self.lists.get(key)
+        if not lst: return None
+        j = bisect.bisect_left(lst, i) - 1
+        return lst[j] if j >= 0 and lst[j] >= self.start else None
+
+    def count(self, key: Key) -> int:
+        lst = self.lists.get(key, [])
+        return len(lst) - bisect.bisect_left(lst, self.start)
+
+    def evict(self, start: int):
+        """Follow the history's eviction; the lists are compacted now and then, not every time."""
+        self.start = start
+        if start - self._trimmed < TRIM_EVERY: return
+        for key in list(self.lists):
+            lst = self.lists[key]
+            del lst[:bisect.bisect_left(lst, start)]
+            if not lst: del self.lists[key]
+        self._trimmed = start
+
+    def clear(self):
+        self.__init__()
@@ -0,0 +1,479 @@
+"""Instruction-set simulator (ISS): RV32I in Python, a fast backend and a golden model for the RTL.
+
+Each instruction word is pre-decoded once (with the decoder's field and immediate helpers) into a
+closure that updates the registers / data memory and returns the next PC, so running is one call
+per instruction. It models the architecture the core is built against: IMem and DMem of 4096
+words each (byte addresses wrap), x0 hard-wired, and the SYSTEM opcode (0x73, `unimp`/`ecall`)
+ends the program like HazardDetection's coreDone. It follows the RV32I spec, not the core: where
+the two disagree, the co-simulation checker below says so.
+
+As a backend it speaks the LivePipelineTest protocol (like live_debug.replay), so live_debug.py
+and web_demo.py take `--iss <program>` instead of launching Chisel. Time is counted in retired
+instructions, and there is no pipeline to show: IF holds the next instruction, MEM and WB the one
+that just retired (its access and write-back), ID/EX are bubbles.
+
+    python -m live_debug.iss src/test/programs/BinaryFile --port 8888     # serve
+    python -m live_debug.iss --check run.rvt                              # co-simulate a recording
+
+The checker (Cosim) follows the RTL's write-backs (wb.we with wb.rd != 0) snapshot by snapshot and
+steps the ISS to its next register write for each; the first difference in PC, rd or data is reported.
+"""
+import argparse
+import multiprocessing
+import operator
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+from .breakpoints import Breakpoint, BreakpointSet, parse_value, valid_kind
+from .decoder import NOP, OPCODES, b_imm, decode_rv32i, fields, i_imm, j_imm, parse_word, s_imm, u_imm
+from .events import GO_MAX, HEARTBEAT, Subscription
+from .replay import _Handler
+from .wire import FIELDS as WIRE_FIELDS
+
+IMEM_WORDS = 4096
+DMEM_WORDS = 4096
+M = 0xFFFFFFFF
+S = 0x80000000
+SYSTEM = 0x73                    # unimp / ecall / ebreak: end of test, like the core's coreDone
+FENCE = 0x0F
+HALT = -1                        # next PC returned by SYSTEM
+LW_OP, IDLE_OP = 0, 1            # memRdOpT / memWrOpT encodings (LW / SW are 0)
+WRITES = {OPCODES[k] for k in ("LUI", "AUIPC", "JAL", "JALR", "LOAD", "OP_IMM", "OP")}
+
+def _signed(a): return (a ^ S) - S
+
+# ALU of OP / OP-IMM by (funct3, funct7 bit 5); shifts only look at the low 5 bits of b
+ALU = {
+    (0, 0): lambda a, b: (a + b) & M,                       (0, 1): lambda a, b: (a - b) & M,
+    (1, 0): lambda a, b: (a << (b & 31)) & M,
+    (2, 0): lambda a, b: int(_signed(a) < _signed(b)),      (3, 0): lambda a, b: int(a < b),
+    (4, 0): operator.xor,
+    (5, 0): lambda a, b: a >> (b & 31),                     (5, 1): lambda a, b: (_signed(a) >> (b & 31)) & M,
+    (6, 0): operator.or_,                                   (7, 0): operator.and_,
+}
+BRANCH = {0: operator.eq, 1: operator.ne, 4: lambda a, b: _signed(a) < _signed(b),
+          5: lambda a, b: _signed(a) >= _signed(b), 6: operator.lt, 7: operator.ge}
+
+def load_program(path: str) -> List[int]:
+    """Instruction words of a $readmemh-style hex file (one word per line, `//` comments)."""
+    with open(path) as f:
+        words = [l.split("//")[0].strip() for l in f]
+    return [int(w, 16) for w in words if w and not w.startswith("@")]
+
+@dataclass(frozen=True)
+class Retired:
+    """What one instruction did: its write-back (rd 0: none) and data memory access."""
+    pc: int
+    instr: int
+    rd: int = 0
+    wdata: int = 0
+    load: bool = False
+    store: bool = False
+    addr: int = 0
+    mdata: int = 0               # the loaded value, or the stored-to word after the store
+
+class Iss:
+    """Architectural state plus a table of pre-decoded instructions, compiled on first execution."""
+
+    def __init__(self, rom: List[Union[int, str]], imem_words: int = IMEM_WORDS, dmem_words: int = DMEM_WORDS):
+        words = [parse_word(w) for w in rom][:imem_words]
+        self.rom = [f"0x{w:08x}" for w in words]
+        self.imem = words + [0] * (imem_words - len(words))
+        self.regs = [0] * 32
+        self.mem = bytearray(4 * dmem_words)
+        self.words = memoryview(self.mem).cast("I")       # little-endian hosts, like the core's words
+        self.code = [self._miss(i) for i in range(imem_words)]
+        self.reset()
+
+    def reset(self):
+        self.regs[:] = [0] * 32
+        self.mem[:] = bytes(len(self.mem))
+        self.pc, self.retired, self.done = 0, 0, False
+        self.last: Optional[Retired] = None
+
+    def _miss(self, i):
+        def first():
+            f = self.code[i] = self._compile(4 * i, self.imem[i])
+            return f()
+        return first
+
+    def _compile(self, pc: int, w: int):
+        """A closure executing the word at `pc`: updates the state, returns the next PC."""
+        r, mem, words = self.regs, self.mem, self.words
+        bmask, wmask = len(mem) - 1, len(words) - 1
+        op, rd, f3, rs1, rs2, f7 = fields(w)
+        nxt = (pc + 4) & M
+
+        def skip(): return nxt
+        if op == SYSTEM:
+            return lambda: HALT
+        if op == OPCODES["JAL"]:
+            tgt = (pc + j_imm(w)) & M
+            def jal():
+                if rd: r[rd] = nxt
+                return tgt
+            return jal
+        if op == OPCODES["JALR"]:
+            imm = i_imm(w)
+            def jalr():
+                t = (r[rs1] + imm) & M & ~1
+                if rd: r[rd] = nxt
+                return t
+            return jalr
+        if op == OPCODES["BRANCH"]:
+            tgt, cond = (pc + b_imm(w)) & M, BRANCH.get(f3)
+            if cond is None: return skip
+            if f3 == 0: return lambda: tgt if r[rs1] == r[rs2] else nxt
+            if f3 == 1: return lambda: tgt if r[rs1] != r[rs2] else nxt
+            return lambda: tgt if cond(r[rs1], r[rs2]) else nxt
+        if op == OPCODES["STORE"]:
+            imm = s_imm(w)
+            if f3 == 2:
+                def sw(): words[((r[rs1] + imm) & bmask) >> 2] = r[rs2]; return nxt
+                return sw
+            if f3 == 0:
+                def sb(): mem[(r[rs1] + imm) & bmask] = r[rs2] & 0xFF; return nxt
+                return sb
+            if f3 == 1:
+                def sh():
+                    a, v = (r[rs1] + imm) & bmask, r[rs2]
+                    mem[a], mem[(a + 1) & bmask] = v & 0xFF, (v >> 8) & 0xFF
+                    return nxt
+                return sh
+            return skip
+        if not rd or op not in WRITES: return skip            # x0 and FENCE / unknown opcodes
+        if op == OPCODES["LUI"]:
+            v = u_imm(w)
+            def lui(): r[rd] = v; return nxt
+            return lui
+        if op == OPCODES["AUIPC"]:
+            v = (pc + u_imm(w)) & M
+            def auipc(): r[rd] = v; return nxt
+            return auipc
+        if op == OPCODES["LOAD"]:
+            imm = i_imm(w)
+            if f3 == 2:
+                def lw(): r[rd] = words[((r[rs1] + imm) & bmask) >> 2]; return nxt
+                return lw
+            if f3 in (0, 4):
+                def lb():
+                    v = mem[(r[rs1] + imm) & bmask]
+                    r[rd] = (v - (v & 0x80) * 2) & M if f3 == 0 else v
+                    return nxt
+                return lb
+            if f3 in (1, 5):
+                def lh():
+                    a = (r[rs1] + imm) & bmask
+                    v = mem[a] | mem[(a + 1) & bmask] << 8
+                    r[rd] = (v - (v & 0x8000) * 2) & M if f3 == 1 else v
+                    return nxt
+                return lh
+            return skip
+        if op == OPCODES["OP_IMM"]:
+            imm = i_imm(w)
+            if f3 == 0:
+                def addi(): r[rd] = (r[rs1] + imm) & M; return nxt
+                return addi
+            fn = ALU.get((f3, f7 >> 5 if f3 == 5 else 0))
+            if fn is None: return skip
+            b = imm & 31 if f3 in (1, 5) else imm & M
+            def op_imm(): r[rd] = fn(r[rs1], b); return nxt
+            return op_imm
+        fn = ALU.get((f3, f7 >> 5))                           # OP
+        if fn is None or f7 & 0x5F: return skip
+        if (f3, f7) == (0, 0):
+            def add(): r[rd] = (r[rs1] + r[rs2]) & M; return nxt
+            return add
+        def op_reg(): r[rd] = fn(r[rs1], r[rs2]); return nxt
+        return op_reg
+
+    def run(self, n: int, stops=None) -> int:
+        """Execute up to n instructions, stopping after one whose next PC is in `stops` or at the
+        end of the program; the number executed. This is the fast path: nothing is recorded."""
+        if self.done or n <= 0: return 0
+        code, mask, pc, i = self.code, len(self.code) - 1, self.pc, 0
+        if stops:
+            while i < n:
+                nxt = code[(pc >> 2) & mask]()
+                i += 1
+                if nxt == HALT: self.done = True; break
+                pc = nxt
+                if pc in stops: break
+        else:
+            while i < n:
+                nxt = code[(pc >> 2) & mask]()
+                i += 1
+                if nxt == HALT: self.done = True; break
+                pc = nxt
+        self.pc, self.retired, self.last = pc, self.retired + i, None
+        return i
+
+    def step(self) -> Optional[Retired]:
+        """Execute one instruction and describe it (None once the program has ended)."""
+        if self.done: return None
+        i = (self.pc >> 2) & (len(self.code) - 1)
+        w, r = self.imem[i], self.regs
+        op, rd, f3, rs1, rs2, _ = fields(w)
+        load, store = op == OPCODES["LOAD"], op == OPCODES["STORE"]
+        addr = (r[rs1] + (i_imm(w) if load else s_imm(w))) & M if load or store else 0
+        nxt = self.code[i]()
+        wrote = rd if rd and op in WRITES else 0
+        mdata = (r[rd] if wrote else 0) if load else self.words[(addr & (len(self.mem) - 1)) >> 2] if store else 0
+        self.last = Retired(self.pc, w, wrote, r[wrote] if wrote else 0, load, store, addr, mdata)
+        self.retired += 1
+        if nxt == HALT: self.done = True
+        else: self.pc = nxt
+        return self.last
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The state as a LivePipelineTest snapshot (see the module docstring for the stage mapping)."""
+        s: Dict[str, Any] = {}
+        for path in WIRE_FIELDS:
+            if len(path) == 1: s[path[0]] = 0
+            else: s.setdefault(path[0], {})[path[1]] = 0
+        last = self.last or Retired(0, NOP)
+        nxt_instr = self.imem[(self.pc >> 2) & (len(self.imem) - 1)]
+        s["cycle"], s["coreDone"] = self.retired, int(self.done)
+        s["rom"] = self.rom if self.retired == 0 else []
+        s["regs"] = {f"x{i}": v for i, v in enumerate(self.regs)}
+        s["gpRegVal"] = self.regs[3]
+        for st in ("id", "ex"): s["instr"][st] = NOP
+        s["pc"].update({"if": self.pc, "mem": last.pc, "wb": last.pc})
+        s["instr"].update({"if": nxt_instr, "mem": last.instr, "wb": last.instr})
+        check = last.mdata if last.load else last.wdata
+        s["mem"].update({"addr": last.addr if last.load or last.store else 0, "rd": last.rd, "we": int(bool(last.rd)),
+                         "rd_op": LW_OP if last.load else IDLE_OP, "wr_op": LW_OP if last.store else IDLE_OP,
+                         "wdata": last.mdata if last.store else 0, "rdata": last.mdata if last.load else 0,
+                         "mem_to_reg": int(last.load)})
+        s["wb"].update({"rd": last.rd, "we": int(bool(last.rd)), "wdata": last.wdata, "check_res": check})
+        s["result"] = check
+        s["hazard"]["pc_write"] = 1
+        return s
+
+# --- protocol backend -------------------------------------------------------------------------
+def _pc_stops(bps: BreakpointSet):
+    """The PCs to stop at when every breakpoint is `if_pc == value` (the fast path), else None."""
+    vals = [bp.value for bp in bps.bps.values() if bp.kind == "if_pc" and bp.op == "=="]
+    return set(vals) if vals and len(vals) == len(bps.bps) else None
+
+class IssSession:
+    """Protocol state of one connection, like replay.ReplaySession: its own ISS, breakpoints, events."""
+
+    def __init__(self, rom):
+        self.iss = Iss(rom)
+        self.rom = self.iss.rom
+        self.bps = BreakpointSet()
+        self.subs = Subscription()
+        self.until = {"hit": 0, "steps": 0, "bp": 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        s = self.iss.snapshot()
+        s["until"] = self.until
+        return s
+
+    def advance(self, n: int):
+        if n == 1: self.iss.step()
+        elif n > 0:
+            self.iss.run(n - 1)
+            self.iss.step()              # keep the last one's write-back / access for the snapshot
+
+    def run_until(self, bps: BreakpointSet, max_cycles: int):
+        start, stops, fired = self.iss.retired, _pc_stops(bps), 0
+        left = lambda: max_cycles - (self.iss.retired - start)
+        while not fired and left() > 0 and not self.iss.done:
+            if stops:
+                self.iss.run(left(), stops)
+                if self.iss.pc not in stops: break
+            else:
+                self.iss.step()
+            fired = bps.check(self.iss.snapshot())
+        self.until = {"hit": int(bool(fired)), "steps": self.iss.retired - start, "bp": fired}
+
+    def go(self, max_cycles: int, heartbeat: int, write) -> Dict[str, Any]:
+        """Like LivePipelineTest's `go`: events, heartbeats and the last instruction, stopping at the end."""
+        iss, start, events, was_done = self.iss, self.iss.retired, 0, self.iss.done
+        others = [ev for ev in self.subs.events if ev.name != "done"]
+        while iss.retired - start < max_cycles and not iss.done:
+            i = iss.retired - start
+            if others:
+                iss.step()
+                s = iss.snapshot()
+                hit = any(ev.match(s) for ev in others)
+            else:                        # nothing to look at per instruction: run to the next heartbeat
+                to_beat = heartbeat - i % heartbeat if heartbeat > 0 else max_cycles
+                self.advance(min(to_beat, max_cycles - i))
+                hit = False
+            i = iss.retired - start
+            events += hit
+            beat = heartbeat > 0 and i % heartbeat == 0
+            if (hit or beat) and i < max_cycles and not iss.done: write(self.snapshot())
+        if iss.done and not was_done and len(others) < len(self.subs.events): events += 1
+        write(self.snapshot())
+        return {"ack": "go", "ok": True, "steps": iss.retired - start, "events": events, "done": int(iss.done)}
+
+    def handle(self, parts, write):
+        """Apply one command, as ReplaySession.handle does; returns the ack to send, else None."""
+        cmd = parts[0]
+        if cmd not in ("bp", "sub"): self.until = {"hit": 0, "steps": 0, "bp": 0}
+        if cmd == "step": self.advance(1)
+        elif cmd == "run": self.advance(int(parts[1]) if len(parts) > 1 else 1)
+        elif cmd == "batch":
+            n = int(parts[1]) if len(parts) > 1 else 1
+            every = max(1, int(parts[2])) if len(parts) > 2 else 1
+            for _ in range(every, n, every):
+                self.advance(every)
+                write(self.snapshot())
+            self.advance(n - (n - 1) // every * every if n > 0 else 0)
+        elif cmd == "reset": self.iss.reset()
+        elif cmd == "until" and len(parts) >= 2 and parts[1] == "bp":
+            self.run_until(self.bps, int(parts[2]) if len(parts) > 2 else 10000)
+        elif cmd == "until" and len(parts) >= 3:
+            one = BreakpointSet()
+            if valid_kind(parts[1]): one.add(Breakpoint(parts[1], parse_value(parts[2])))
+            self.run_until(one, int(parts[3]) if len(parts) > 3 else 10000)
+            self.until["bp"] = 0
+        elif cmd == "bp": return self.bps.command(parts[1:])
+        elif cmd == "sub": return self.subs.command(parts[1:])
+        elif cmd == "go":
+            return self.go(int(parts[1]) if len(parts) > 1 else GO_MAX,
+                           int(parts[2]) if len(parts) > 2 else HEARTBEAT, write)
+        elif cmd == "proto":
+            if parts[1:] in (["binary"], ["json"]):
+                return {"ack": "proto", "ok": True, "mode": parts[1], "rom": self.rom}
+            return {"ack": "proto", "ok": False, "error": "usage: proto binary|json"}
+        return None
+
+class IssServer(socketserver.ThreadingTCPServer):
+    """One IssSession per connection (the replay server's handler), so every client starts from reset."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, program: str, host="localhost", port=8888):
+        self.rom = load_program(program)
+        super().__init__((host, port), _Handler)
+
+    def session(self):
+        return IssSession(self.rom)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+def serve_in_background(program: str, host="localhost", port=8888):
+    """Start an ISS server in a child process (live_debug.py and web_demo.py --iss)."""
+    server = IssServer(program, host, port)
+    print(f"⚡ ISS running {program} ({len(server.rom)} words) on {host}:{server.server_address[1]}")
+    proc = multiprocessing.get_context("fork").Process(target=server.serve_forever, daemon=True)
+    proc.start()
+    server.socket.close()
+    return proc
+
+# --- co-simulation checker --------------------------------------------------------------------
+@dataclass(frozen=True)
+class Mismatch:
+    cycle: int
+    pc: int
+    field: str
+    expected: int
+    got: int
+    instr: int = 0
+
+    def __str__(self):
+        return (f"cycle {self.cycle}: {self.field} of `{decode_rv32i(self.instr)}` at {self.pc:#x} "
+                f"is {self.got:#x}, ISS says {self.expected:#x}")
+
+class Cosim:
+    """Streaming checker: RTL snapshots in, the first write-back that differs from the ISS out.
+
+    Needs every cycle from reset (a skipped cycle may hide a write-back); after a gap it stops
+    checking and says so in `gap`. A snapshot at or before the last one restarts the ISS on cycle 0.
+    """
+
+    def __init__(self, rom, max_gap_steps: int = 10000):
+        self.iss = Iss(rom)
+        self.max_gap_steps = max_gap_steps   # ISS instructions without a register write, at most
+        self.last_cycle: Optional[int] = None
+        self.checked = 0
+        self.mismatch: Optional[Mismatch] = None
+        self.gap: Optional[int] = None       # first cycle missing from the stream
+
+    def restart(self):
+        self.iss.reset()
+        self.last_cycle, self.checked, self.mismatch, self.gap = None, 0, None, None
+
+    @property
+    def active(self) -> bool:
+        return self.mismatch is None and self.gap is None
+
+    def add(self, s: Dict[str, Any]) -> Optional[Mismatch]:
+        """Check one snapshot; the mismatch if this is where the RTL first went wrong."""
+        cycle = int(s.get("cycle", 0))
+        if self.last_cycle is not None and cycle <= self.last_cycle: self.restart()
+        if self.last_cycle is None and cycle != 0: self.gap = 0
+        elif self.last_cycle is not None and cycle != self.last_cycle + 1 and self.gap is None: self.gap = self.last_cycle + 1
+        self.last_cycle = cycle
+        wb, pc = s.get("wb") or {}, (s.get("pc") or {}).get("wb", 0)
+        if not self.active or not wb.get("we") or not wb.get("rd"): return None
+        exp = None
+        for _ in range(self.max_gap_steps):
+            exp = self.iss.step()
+            if exp is None or exp.rd: break
+        instr = (s.get("instr") or {}).get("wb", 0)
+        if exp is None or not exp.rd:
+            self.mismatch = Mismatch(cycle, pc, "write-back (ISS has none left)", 0, wb.get("wdata", 0), instr)
+        else:
+            for name, e, g in (("pc", exp.pc, pc), ("rd", exp.rd, wb.get("rd")), ("wdata", exp.wdata, wb.get("wdata", 0))):
+                if e != g:
+                    self.mismatch = Mismatch(cycle, exp.pc, name, e, int(g or 0), exp.instr)
+                    break
+        self.checked += self.mismatch is None
+        return self.mismatch
+
+    def status(self) -> str:
+        if self.mismatch: return f"❌ cosim: {self.mismatch}"
+        if self.gap is not None: return f"⏸️ cosim stopped at cycle {self.gap}: cycles missing ({self.checked} write-backs matched)"
+        return f"✅ cosim: {self.checked} write-backs match"
+
+def check_trace(path: str, rom=None) -> Cosim:
+    """Co-simulate a recorded trace (only its write-back cycles are decoded into snapshots)."""
+    import numpy as np
+    from .replay import open_trace
+    t = open_trace(path)
+    c = Cosim(rom if rom is not None else t.rom)
+    rec = t.records
+    cyc = rec["cycle"].astype(np.int64)
+    gaps = np.flatnonzero(np.diff(cyc) != 1)
+    end = int(gaps[0]) + 1 if len(gaps) else len(rec)
+    writes = np.flatnonzero((rec["wb.we"][:end] != 0) & (rec["wb.rd"][:end] != 0))
+    if len(cyc) and cyc[0] != 0: c.gap = 0
+    for i in writes.tolist():
+        c.last_cycle = int(cyc[i]) - 1           # dense up to `end`: only the write-backs matter
+        if c.add(t[i]): break
+    if c.active and end < len(rec): c.gap = int(cyc[end - 1]) + 1
+    return c
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="RV32I instruction-set simulator: protocol backend and co-simulation checker")
+    ap.add_argument("program", nargs="?", help="hex program (with --check: default the trace's ROM)")
+    ap.add_argument("--host", default="localhost")
+    ap.add_argument("--port", default=8888, type=int)
+    ap.add_argument("--check", metavar="TRACE", help="co-simulate a recorded RTL trace (.rvt or .jsonl) and exit")
+    args = ap.parse_args(argv)
+    if args.check:
+        t0 = time.perf_counter()
+        c = check_trace(args.check, load_program(args.program) if args.program else None)
+        print(f"{c.status()}  ({time.perf_counter() - t0:.2f}s)")
+        return 1 if c.mismatch else 0
+    if not args.program: ap.error("a program is needed to serve")
+    server = IssServer(args.program, args.host, args.port)
+    print(f"⚡ ISS running {args.program} ({len(server.rom)} words) on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
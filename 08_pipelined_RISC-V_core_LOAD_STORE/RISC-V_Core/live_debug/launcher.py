@@ -1,40 +1,182 @@
 # -*- coding: utf-8 -*-
 import subprocess
 import os
+import re
 import signal
 import atexit
 import socket
+import threading
 import time
+from typing import List, Optional
 
 SERVER_PROCESS = None
 
+SUITE = "PipelinedRV32I_Tester.LivePipelineTest"
+READY_MARKER = "Waiting for Python on port"      # printed by LivePipelineTest right before accept()
+DEFAULT_PORT = 8888                              # LivePipelineTest's port without LIVE_PORT
+CLASSPATH_CACHE = os.path.join("target", "live-classpath.txt")
+READY_TIMEOUT = 300
+
 def cleanup():
     """Restores terminal and kills server."""
     global SERVER_PROCESS
     print("\033[?25h") # Show Cursor
     os.system("stty sane")
     if SERVER_PROCESS:
+        SERVER_PROCESS.stop()
+        SERVER_PROCESS = None
+
+def port_open(host, port) -> bool:
+    # LivePipelineTest goes back to accept() when a client leaves, so a probe does not use it up
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        return s.connect_ex((host, port)) == 0
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+# --- exported classpath: start the simulator with plain `java`, no sbt ----------------------
+def _sources_mtime() -> float:
+    latest = os.path.getmtime("build.sbt")
+    for root, _, files in os.walk("src"):
+        for f in files:
+            if f.endswith(".scala"): latest = max(latest, os.path.getmtime(os.path.join(root, f)))
+    return latest
+
+def classpath(refresh=False) -> Optional[str]:
+    """Test classpath exported by sbt once, cached until a .scala file or build.sbt changes.
+    None if sbt cannot produce it (the launcher then falls back to `sbt testOnly`)."""
+    if not refresh and os.path.exists(CLASSPATH_CACHE) and os.path.getmtime(CLASSPATH_CACHE) > _sources_mtime():
+        with open(CLASSPATH_CACHE) as f: return f.read().strip()
+    print("📦 Compiling and exporting the test classpath (once per source change)...")
+    try:
+        out = subprocess.run(["sbt", "-batch", "-no-colors", "Test/compile", "export Test/fullClasspath"],
+                             capture_output=True, text=True, timeout=READY_TIMEOUT).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    # `export` prints the classpath as one bare line of jars and class directories
+    cp = next((l.strip() for l in reversed(out.splitlines()) if ".jar" in l and not l.startswith("[")), None)
+    if cp:
+        os.makedirs(os.path.dirname(CLASSPATH_CACHE), exist_ok=True)
+        with open(CLASSPATH_CACHE, "w") as f: f.write(cp)
+    return cp
+
+def simulator_command(mode="auto") -> List[str]:
+    """`java` on the exported classpath (a few seconds: JVM + elaboration), `sbt --client` against
+    a long-lived sbt server, or the original cold `sbt testOnly`. With `client` the test runs in the
+    sbt server's JVM, so it sees the server's LIVE_PORT / LIVE_PROGRAM, not ours: Simulator only
+    allows it for the default port and program."""
+    if mode in ("auto", "java"):
+        cp = classpath()
+        if cp: return ["java", "-cp", cp, "org.scalatest.tools.Runner", "-oW", "-s", SUITE]
+    if mode == "client": return ["sbt", "--client", f"testOnly {SUITE}"]
+    return ["sbt", f"testOnly {SUITE}"]
+
+class Simulator:
+    """One LivePipelineTest process: its port, program and log, and how long it took to be ready."""
+
+    def __init__(self, port: int, program: Optional[str] = None, mode="auto", log_path=None, command=None):
+        if mode == "client" and command is None and (port != DEFAULT_PORT or program):
+            raise ValueError("--launch client runs the test in the sbt server's JVM, which only serves the "
+                             f"default program on port {DEFAULT_PORT}; use --launch java for other ports or programs")
+        self.port, self.program = port, program
+        self.log_path = log_path or ("chisel_server.log" if port == DEFAULT_PORT else f"chisel_server_{port}.log")
+        env = dict(os.environ, LIVE_PORT=str(port))
+        if program: env["LIVE_PROGRAM"] = program
+        self.started = time.perf_counter()
+        self.ready_s = None
+        self.log = open(self.log_path, "w")
+        self.proc = subprocess.Popen(command or simulator_command(mode), stdout=self.log, stderr=subprocess.STDOUT,
+                                     env=env, preexec_fn=os.setsid)
+
+    def poll_ready(self, host="localhost") -> bool:
+        """Ready once the log shows the accept() marker for our port or the port answers; raises if the process died."""
+        if self.ready_s is not None: return True
+        if self.proc.poll() is not None:
+            raise RuntimeError(f"simulator on port {self.port} exited ({self.proc.returncode}):\n{self.log_tail()}")
+        with open(self.log_path, errors="replace") as f:
+            ready = re.search(rf"{READY_MARKER} {self.port}\b", f.read()) is not None
+        if ready or port_open(host, self.port):
+            self.ready_s = time.perf_counter() - self.started
+            return True
+        return False
+
+    def wait_ready(self, host="localhost", timeout=READY_TIMEOUT, interval=0.1):
+        deadline = time.monotonic() + timeout
+        while not self.poll_ready(host):
+            if time.monotonic() > deadline:
+                self.stop()
+                raise TimeoutError(f"simulator on port {self.port} not ready after {timeout}s:\n{self.log_tail()}")
+            time.sleep(interval)
+        return self
+
+    def log_tail(self, n=20) -> str:
+        with open(self.log_path, errors="replace") as f:
+            return "".join(f.readlines()[-n:])
+
+    def stop(self):
         try:
-            os.killpg(os.getpgid(SERVER_PROCESS.pid), signal.SIGTERM)
+            os.killpg(os.getpgid(self.proc.pid), signal.SIGTERM)
         except Exception: pass
-        SERVER_PROCESS = None
+        self.log.close()
 
-def ensure_server_running(host, port):
+def ensure_server_running(host, port, program=None, mode="auto"):
     global SERVER_PROCESS
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        if s.connect_ex((host, port)) == 0: return
+    if port_open(host, port): return
 
     print(f"🚀 Launching Chisel Simulation on port {port}...")
-    print("   (This takes 10-20 seconds to compile...)")
-    log_file = open("chisel_server.log", "w")
-    cmd = ["sbt", "testOnly PipelinedRV32I_Tester.LivePipelineTest"]
-
-    SERVER_PROCESS = subprocess.Popen(
-        cmd,
-        stdout=log_file,
-        stderr=subprocess.STDOUT,
-        preexec_fn=os.setsid
-    )
+    SERVER_PROCESS = Simulator(port, program, mode)
     atexit.register(cleanup)
-    print("⏳ Waiting 15 seconds for warm up...")
-    time.sleep(15)
\ No newline at end of file
+    print("⏳ Waiting for the simulator to come up...")
+    SERVER_PROCESS.wait_ready(host)
+    print(f"✅ Simulator ready in {SERVER_PROCESS.ready_s:.1f}s")
+
+class SimulatorPool:
+    """Warm simulators, elaborated and waiting in accept(), handed out by `claim`.
+
+    A claimed simulator is replaced in the background, so the next reload or reconnect
+    finds one ready instead of paying for a JVM start and elaboration.
+    """
+
+    def __init__(self, size=1, program=None, host="localhost", mode="auto", command=None):
+        if mode == "client" and command is None:
+            raise ValueError("--launch client cannot warm simulators: the sbt server runs one test, on its own "
+                             "port and program; use --launch java or auto")
+        self.size, self.program, self.host, self.mode, self.command = size, program, host, mode, command
+        self.warm: List[Simulator] = []
+        self.claimed: List[Simulator] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+        for _ in range(size): self._spawn(program)
+
+    def _spawn(self, program):
+        sim = Simulator(free_port(), program, self.mode, command=self.command)
+        with self._lock:
+            if self._closed: sim.stop()          # a refill that finished after close()
+            else: self.warm.append(sim)
+        return sim
+
+    def claim(self, program=None, timeout=READY_TIMEOUT) -> Simulator:
+        """A ready simulator for `program` (the pool's default if None); started now if none is warm."""
+        program = program or self.program
+        with self._lock:
+            sim = next((s for s in self.warm if s.program == program), None)
+            if sim: self.warm.remove(sim)
+        if sim is None: sim = Simulator(free_port(), program, self.mode, command=self.command)
+        else: threading.Thread(target=self._spawn, args=(self.program,), daemon=True).start()   # refill
+        sim.wait_ready(self.host, timeout)
+        with self._lock: self.claimed.append(sim)
+        return sim
+
+    def release(self, sim: Simulator):
+        with self._lock:
+            if sim in self.claimed: self.claimed.remove(sim)
+        sim.stop()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            sims, self.warm, self.claimed = self.warm + self.claimed, [], []
+        for s in sims: s.stop()
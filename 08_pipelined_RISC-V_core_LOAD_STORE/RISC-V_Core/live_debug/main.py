@@ -1,16 +1,42 @@
 
 import argparse
-from .launcher import ensure_server_running
+from .launcher import ensure_server_running, SimulatorPool
 from .client import LiveClient
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--host", default="localhost")
     ap.add_argument("--port", default=8888, type=int)
+    ap.add_argument("--max-history-mb", default=256, type=int, help="history memory ceiling (0 = unbounded)")
+    ap.add_argument("--replay", default=None, help="serve a recorded trace (.rvt or .jsonl) instead of launching Chisel")
+    ap.add_argument("--iss", default=None, metavar="PROGRAM", help="run a hex program on the instruction-set simulator instead of Chisel")
+    ap.add_argument("--program", default=None, help="ROM hex file (default: src/test/programs/BinaryFile)")
+    ap.add_argument("--warm", default=0, type=int, help="keep N warm simulators for `load <program>` and restarts")
+    ap.add_argument("--launch", default="auto", choices=["auto", "java", "client", "sbt"],
+                    help="java on the exported classpath, sbt --client, or plain sbt testOnly")
+    ap.add_argument("--proto", default="binary", choices=["binary", "json"],
+                    help="wire format after the first snapshot (binary falls back to json on older simulators)")
     args = ap.parse_args()
 
-    ensure_server_running(args.host, args.port)
-    LiveClient(args.host, args.port).run()
+    pool = None
+    if args.replay:
+        from .replay import serve_in_background
+        serve_in_background(args.replay, args.host, args.port)
+    elif args.iss:
+        from .iss import serve_in_background
+        serve_in_background(args.iss, args.host, args.port)
+    else:
+        try:
+            if args.warm:
+                pool = SimulatorPool(args.warm, args.program, args.host, args.launch)
+                args.port = pool.claim().port
+            else:
+                ensure_server_running(args.host, args.port, args.program, args.launch)
+        except ValueError as e:
+            ap.error(str(e))
+    client = LiveClient(args.host, args.port, args.max_history_mb, args.proto)
+    client.pool, client.launch = pool, args.launch
+    client.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import bisect
+import time
+from collections import deque
+from typing import Dict
+
+# Latency buckets in seconds: powers of two from 1 us to ~33 s
+BUCKETS = tuple(2.0 ** k * 1e-6 for k in range(26))
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative on export, like Prometheus)."""
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count, self.sum, self.max = 0, 0.0, 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max: self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 if empty)."""
+        if not self.count: return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank: return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+class _Timer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist): self.hist = hist
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+
+class Metrics:
+    """Per-stage latency histograms, counters and a sliding-window cycles/sec meter.
+
+    Stages used by the tools: chisel (waiting for the simulator), parse (json.loads),
+    enrich (process_snapshot), emit (socket.io), command (whole web command), step (whole TUI step).
+    """
+
+    def __init__(self, rate_window: float = 5.0):
+        self.hist: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.rate_window = rate_window
+        self._cycles = deque()       # (time, cycles) inside the rate window
+        self._cycles_in_window = 0
+        self.started = time.time()
+
+    def histogram(self, name) -> Histogram:
+        h = self.hist.get(name)
+        if h is None: h = self.hist[name] = Histogram()
+        return h
+
+    def timer(self, name):
+        """`with metrics.timer("parse"): ...` records the block's wall time."""
+        return _Timer(self.histogram(name))
+
+    def observe(self, name, seconds):
+        self.histogram(name).observe(seconds)
+
+    def inc(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_cycles(self, n):
+        """Count simulated cycles for the cycles/sec meter."""
+        if n <= 0: return
+        self.inc("cycles", n)
+        now = time.perf_counter()
+        self._cycles.append((now, n))
+        self._cycles_in_window += n
+        self._expire(now)
+
+    def _expire(self, now):
+        while self._cycles and now - self._cycles[0][0] > self.rate_window:
+            self._cycles_in_window -= self._cycles.popleft()[1]
+
+    def cycles_per_sec(self) -> float:
+        now = time.perf_counter()
+        self._expire(now)
+        if not self._cycles: return 0.0
+        span = max(now - self._cycles[0][0], 1e-3)
+        return self._cycles_in_window / span
+
+    def reset(self):
+        self.hist.clear()
+        self.counters.clear()
+        self._cycles.clear()
+        self._cycles_in_window = 0
+
+    # --- export -------------------------------------------------------------
+    def as_dict(self):
+        return {
+            "uptime_s": time.time() - self.started,
+            "cycles_per_sec": self.cycles_per_sec(),
+            "counters": dict(self.counters),
+            "latency": {
+                name: {"count": h.count, "mean_ms": h.mean * 1e3, "p50_ms": h.quantile(0.5) * 1e3,
+                       "p99_ms": h.quantile(0.99) * 1e3, "max_ms": h.max * 1e3}
+                for name, h in self.hist.items()
+            },
+        }
+
+    def prometheus(self, prefix="chisel") -> str:
+        """Prometheus text exposition format."""
+        out = [f"# TYPE {prefix}_stage_seconds histogram"]
+        for name, h in self.hist.items():
+            cum = 0
+            for le, c in zip(BUCKETS, h.counts):
+                cum += c
+                out.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{le:g}"}} {cum}')
+            out.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            out.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {h.sum:.9f}')
+            out.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {h.count}')
+        for name, v in self.counters.items():
+            out.append(f"# TYPE {prefix}_{name}_total counter")
+            out.append(f"{prefix}_{name}_total {v}")
+        out.append(f"# TYPE {prefix}_cycles_per_second gauge")
+        out.append(f"{prefix}_cycles_per_second {self.cycles_per_sec():.3f}")
+        return "\n".join(out) + "\n"
+
+    def status_line(self, stages=("chisel", "parse", "enrich", "emit")) -> str:
+        """One-line summary for the TUI: p50/p99 per stage and the cycle rate."""
+        parts = [f"{s} {_ms(self.hist[s].quantile(0.5))}/{_ms(self.hist[s].quantile(0.99))}"
+                 for s in stages if s in self.hist and self.hist[s].count]
+        parts.append(f"{self.cycles_per_sec():.0f} cyc/s")
+        return "⏱  " + " | ".join(parts)
+
+def _ms(seconds):
+    return f"{seconds * 1e3:.2f}ms" if seconds < 1 else f"{seconds:.1f}s"
+
+# Process-wide registry shared by the bridges, the web server and the TUI
+metrics = Metrics()
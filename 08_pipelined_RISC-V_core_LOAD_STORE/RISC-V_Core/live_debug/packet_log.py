@@ -0,0 +1,69 @@
+import atexit
+import os
+import queue
+import threading
+
+# Raw packet log, written off the hot path: callers only enqueue the line, a writer thread
+# appends through a large buffer and rotates the file (chisel_debug.log -> .1 -> .2 ...).
+LOG_PATH = os.environ.get("CHISEL_PACKET_LOG", "chisel_debug.log")
+MAX_BYTES = 32 * 2**20
+BACKUPS = 3
+
+class PacketLog:
+    """Buffered background writer with size-based rotation."""
+
+    def __init__(self, path=LOG_PATH, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="packet-log", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        self._q.put(line)
+
+    def _rotate(self, f):
+        f.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"): os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups: os.replace(self.path, f"{self.path}.1")
+        else: os.remove(self.path)
+        return open(self.path, "a", buffering=2**20)
+
+    def _run(self):
+        f = open(self.path, "a", buffering=2**20)
+        size = f.tell()
+        while True:
+            line = self._q.get()
+            while line is not None:
+                rec = f"RAW: {line.rstrip()}\n"
+                f.write(rec)
+                size += len(rec)
+                if size > self.max_bytes:
+                    f = self._rotate(f)
+                    size = 0
+                try: line = self._q.get_nowait()
+                except queue.Empty: break
+            f.flush()                 # queue drained: make what we have visible
+            if line is None: break
+        f.close()
+
+    def close(self):
+        """Flush everything queued so far and stop the writer."""
+        self._q.put(None)
+        self._thread.join()
+
+_log = None
+
+def log_packet(line: str):
+    """Queue one raw simulator line (an empty CHISEL_PACKET_LOG disables the log)."""
+    global _log
+    if not LOG_PATH: return
+    if _log is None:
+        _log = PacketLog()
+        atexit.register(close)
+    _log.write(line)
+
+def close():
+    global _log
+    if _log is not None: _log.close()
+    _log = None
@@ -0,0 +1,37 @@
+
+from typing import Callable, Dict, Any, Iterator
+
+# Cycles per `batch` command and how many commands may be in flight at once.
+# A few chunks in flight keep the simulator busy while Python parses the last burst.
+BATCH_CHUNK = 512
+BATCH_WINDOW = 4
+
+def batch_reply_count(n: int, every: int = 1) -> int:
+    """Number of snapshots LivePipelineTest sends back for `batch n every`."""
+    if n <= 0: return 1
+    every = max(1, every)
+    return n // every + (1 if n % every else 0)
+
+def batch_plan(n: int, every: int = 1, chunk: int = BATCH_CHUNK):
+    """Split n cycles into `batch` commands that keep the every-k-th spacing across chunks."""
+    every = max(1, every)
+    chunk = max(every, (chunk // every) * every)
+    plan = []
+    while n > 0:
+        c = min(chunk, n)
+        plan.append((c, every))
+        n -= c
+    return plan
+
+def stream_batches(send: Callable[[str], None], recv: Callable[[], Dict[str, Any]],
+                   n: int, every: int = 1, chunk: int = BATCH_CHUNK,
+                   window: int = BATCH_WINDOW) -> Iterator[Dict[str, Any]]:
+    """Advance n cycles with pipelined `batch` commands, yielding every k-th snapshot (and the last)."""
+    plan = batch_plan(n, every, chunk)
+    sent = 0
+    for done in range(len(plan)):
+        while sent < len(plan) and sent - done < window:
+            send(f"batch {plan[sent][0]} {plan[sent][1]}")
+            sent += 1
+        for _ in range(batch_reply_count(*plan[done])):
+            yield recv()
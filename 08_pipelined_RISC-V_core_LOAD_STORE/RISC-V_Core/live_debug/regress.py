@@ -0,0 +1,217 @@
+"""Regression runner: a batch of programs over parallel headless simulators, with a result cache.
+
+Each program gets its own LivePipelineTest (own port, LIVE_PROGRAM), spread over `-j` worker
+processes. A worker subscribes to `done` and runs `go <max> 1`, so every cycle streams back (binary
+mode) until coreDone rises; the cycles feed analytics.analyze for the retired count and CPI.
+
+Verdict, following the riscv-tests convention of riscv-tests_modified_files (TESTNUM is gp = x3):
+    pass      coreDone rose with gp == 1 (RVTEST_PASS)
+    fail      coreDone rose with any other gp; the failing test number is gp >> 1 (RVTEST_FAIL)
+    timeout   no coreDone within --max-cycles
+    error     the simulator did not come up or went away
+`result` is wb.check_res (io.result) in the cycle coreDone rose.
+
+Results are cached in target/regress-cache.json by the SHA-256 of the program, of the core sources
+(src/main, LivePipelineTest, build.sbt) and of --max-cycles: unchanged programs are not run again.
+
+    python -m live_debug.regress isa/rv32ui-p-*.hex -j 8
+    python -m live_debug.regress progs/*.hex --no-cache --json > results.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from . import launcher
+from .analytics import ColumnBuffer, analyze
+from .wire import Decoder, is_proto_ack, read_frame
+
+CACHE_PATH = os.path.join("target", "regress-cache.json")
+LOG_DIR = os.path.join("target", "regress")
+MAX_CYCLES = 100000
+PASS_GP = 1
+CORE_SOURCES = ("src/main", "src/test/scala/LivePipelineTest.scala", "build.sbt")
+
+def _sha(h, path):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""): h.update(block)
+
+def core_hash(root: str = ".") -> str:
+    """SHA-256 over the core sources (names and contents), in a fixed order."""
+    h = hashlib.sha256()
+    for src in CORE_SOURCES:
+        path = os.path.join(root, src)
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(d, f) for d, _, fs in os.walk(path) for f in fs if f.endswith(".scala"))
+        for p in files:
+            h.update(os.path.relpath(p, root).encode())
+            _sha(h, p)
+    return h.hexdigest()
+
+def cache_key(program: str, core: str, max_cycles: int) -> str:
+    h = hashlib.sha256(f"{core}:{max_cycles}:".encode())
+    _sha(h, program)
+    return h.hexdigest()
+
+def verdict(done: bool, gp: int) -> str:
+    if not done: return "timeout"
+    return "pass" if gp == PASS_GP else "fail"
+
+class _Conn:
+    """Just enough of the LiveClient protocol for a batch run: hello, proto binary, acks, snapshots."""
+
+    def __init__(self, port: int, host="localhost", timeout=60.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.f = self.sock.makefile("rb")
+        self.wire = None
+
+    def send(self, msg): self.sock.sendall((msg + "\n").encode())
+
+    def recv(self) -> Dict[str, Any]:
+        if self.wire: return self.wire.decode(*read_frame(self.f))
+        line = self.f.readline()
+        if not line: raise EOFError
+        return json.loads(line)
+
+    def hello(self) -> Dict[str, Any]:
+        s = self.recv()
+        self.send("proto binary")
+        ack = self.recv()
+        if is_proto_ack(ack): self.wire = Decoder(ack.get("rom") or s.get("rom"))
+        return s
+
+    def close(self):
+        try:
+            self.send("quit")
+            self.sock.close()
+        except OSError: pass
+
+def run_program(program: str, max_cycles: int = MAX_CYCLES, mode: str = "java", command=None,
+                log_dir: str = LOG_DIR, timeout: float = launcher.READY_TIMEOUT) -> Dict[str, Any]:
+    """Run one program on a fresh simulator (in a worker process); the result row."""
+    t0 = time.perf_counter()
+    row = {"program": program, "verdict": "error", "cycles": 0, "retired": 0, "cpi": None,
+           "gp": None, "result": None, "test": None, "error": None}
+    os.makedirs(log_dir, exist_ok=True)
+    port = launcher.free_port()
+    sim = launcher.Simulator(port, os.path.abspath(program), mode, command=command,
+                             log_path=os.path.join(log_dir, f"{os.path.basename(program)}.{port}.log"))
+    conn = None
+    try:
+        sim.wait_ready(timeout=timeout)
+        conn = _Conn(port, timeout=timeout)
+        cols = ColumnBuffer()
+        cols.add(conn.hello())
+        conn.send("sub done")
+        conn.recv()
+        # 1. heartbeat 1: every cycle comes back, and `go` stops by itself when coreDone rises
+        conn.send(f"go {max_cycles} 1")
+        last = None
+        while "ack" not in (msg := conn.recv()):
+            cols.add(msg)
+            last = msg
+        # 2. the verdict from the cycle coreDone rose (or the last one run)
+        done = bool(msg.get("done"))
+        gp = int(last.get("gpRegVal", 0)) if last else 0
+        stats = analyze(cols.columns())
+        row.update(verdict=verdict(done, gp), cycles=int(msg.get("steps", 0)), retired=stats["retired"],
+                   cpi=stats["cpi"], gp=gp, result=int(last.get("result", 0)) if last else None,
+                   test=gp >> 1 if done and gp != PASS_GP else None)
+    except (OSError, EOFError, RuntimeError, TimeoutError, ValueError) as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if conn: conn.close()
+        sim.stop()
+    row["seconds"] = round(time.perf_counter() - t0, 3)
+    return row
+
+class ResultCache:
+    """Result rows by cache key, as one JSON file."""
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        try:
+            with open(path) as f: self.rows = json.load(f)
+        except (OSError, ValueError):
+            self.rows = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.rows.get(key)
+        return dict(row, cached=True) if row else None
+
+    def put(self, key: str, row: Dict[str, Any]):
+        if row["verdict"] != "error": self.rows[key] = row       # errors are the environment's, run again
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f: json.dump(self.rows, f, indent=1)
+        os.replace(tmp, self.path)
+
+def run_all(programs: List[str], jobs: Optional[int] = None, max_cycles: int = MAX_CYCLES, mode: str = "java",
+            command=None, cache: Optional[ResultCache] = None, log_dir: str = LOG_DIR,
+            on_result=None) -> List[Dict[str, Any]]:
+    """Results in the order of `programs`; cached ones are not run. on_result(row) as each one finishes."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    keys = {}
+    if cache is not None:
+        core = core_hash()
+        for p in programs:
+            keys[p] = cache_key(p, core, max_cycles)
+            hit = cache.get(keys[p])
+            if hit:
+                rows[p] = dict(hit, program=p)
+                if on_result: on_result(rows[p])
+    todo = [p for p in dict.fromkeys(programs) if p not in rows]
+    if todo:
+        if command is None and mode in ("auto", "java"): launcher.classpath()     # export once, not per worker
+        with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+            futures = {pool.submit(run_program, p, max_cycles, mode, command, log_dir): p for p in todo}
+            for fut in as_completed(futures):
+                row = fut.result()
+                rows[futures[fut]] = row
+                if cache is not None:
+                    cache.put(keys[row["program"]], row)
+                    cache.save()                         # keep what finished if the batch is interrupted
+                if on_result: on_result(row)
+    return [rows[p] for p in programs]
+
+def format_row(r: Dict[str, Any]) -> str:
+    icon = {"pass": "✅", "fail": "❌", "timeout": "⏱️", "error": "💥"}[r["verdict"]]
+    cpi = f"{r['cpi']:.3f}" if r.get("cpi") else "-"
+    extra = f"  test {r['test']}" if r.get("test") else ""
+    if r.get("error"): extra = "  " + r["error"].splitlines()[0]
+    return (f"{icon} {r['verdict']:<7} {os.path.basename(r['program']):<28} {r['cycles']:>8} cycles  "
+            f"CPI {cpi:>6}{'  (cached)' if r.get('cached') else ''}{extra}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run programs on parallel headless simulators and collect pass/fail, cycles and CPI")
+    ap.add_argument("programs", nargs="+", help=".hex program images (as LIVE_PROGRAM)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="simulators at once (default: one per core)")
+    ap.add_argument("--max-cycles", type=int, default=MAX_CYCLES)
+    ap.add_argument("--mode", default="java", choices=["auto", "java", "sbt"], help="how workers start the simulator")
+    ap.add_argument("--no-cache", action="store_true", help="run everything, and do not update the cache")
+    ap.add_argument("--cache", default=CACHE_PATH)
+    ap.add_argument("--json", action="store_true", help="print the result rows as JSON")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    cache = None if args.no_cache else ResultCache(args.cache)
+    rows = run_all(args.programs, args.jobs, args.max_cycles, args.mode, cache=cache,
+                   on_result=None if args.json else lambda r: print(format_row(r), flush=True))
+    if args.json:
+        print(json.dumps(rows, indent=1))
+    else:
+        n = {v: sum(r["verdict"] == v for r in rows) for v in ("pass", "fail", "timeout", "error")}
+        cached = sum(bool(r.get("cached")) for r in rows)
+        print(f"\n{n['pass']}/{len(rows)} passed, {n['fail']} failed, {n['timeout']} timed out, {n['error']} errors"
+              f" ({cached} cached) in {time.perf_counter() - t0:.1f}s")
+    return 0 if all(r["verdict"] == "pass" for r in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
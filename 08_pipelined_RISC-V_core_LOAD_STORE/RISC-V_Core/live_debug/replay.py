@@ -0,0 +1,226 @@
+"""Serve a recorded trace over the LivePipelineTest line protocol (no sbt, no JVM).
+
+    python -m live_debug.replay run.rvt --port 8888
+    python live_debug.py --replay run.rvt
+    python web_demo.py --replay run.rvt
+
+Commands: step, run N, batch N [k], reset, until <kind> <value> [max], until bp [max],
+bp add|del|clear|list, sub <events>, go N [heartbeat], proto binary|json, quit. Time is the recorded cycle count: moving to cycle c shows the
+last record at or before c, and the trace's last record is where time stops.
+"""
+import argparse
+import atexit
+import json
+import multiprocessing
+import os
+import socketserver
+import tempfile
+import threading
+from typing import Any, Dict
+import numpy as np
+from .breakpoints import ACCESS, FIELDS, OPS, Breakpoint, BreakpointSet, parse_value, valid_kind
+from .events import GO_MAX, HEARTBEAT, Event, Subscription
+from .trace import MAGIC, TraceReader, convert_jsonl
+from .wire import Encoder, is_proto_ack
+
+def open_trace(path: str) -> TraceReader:
+    """A TraceReader for a binary trace, or for a JSONL recording converted to a temporary one."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC: return TraceReader(path)
+    fd, tmp = tempfile.mkstemp(suffix=".rvt")
+    os.close(fd)
+    atexit.register(lambda: os.path.exists(tmp) and os.remove(tmp))
+    convert_jsonl(path, tmp)
+    return TraceReader(tmp)
+
+def condition_mask(trace: TraceReader, bp: Breakpoint, lo: int, hi: int) -> np.ndarray:
+    """Breakpoint condition over records [lo, hi), evaluated on the columns."""
+    rec = trace.records[lo:hi]
+    if bp.kind in ACCESS:
+        op_field, active = ACCESS[bp.kind]
+        return (rec[f"mem.{op_field}"] == active) & OPS[bp.op](rec["mem.addr"].astype(np.int64), bp.value)
+    name = ".".join(FIELDS[bp.kind]) if bp.kind in FIELDS else f"regs.{bp.kind}"
+    return OPS[bp.op](rec[name].astype(np.int64), bp.value)
+
+def event_mask(trace: TraceReader, ev: Event, lo: int, hi: int) -> np.ndarray:
+    """Cycles of records [lo, hi) where the event happens (Event.match on the columns)."""
+    rec = trace.records[lo:hi]
+    if ev.name == "stall": return (rec["hazard.if_stall"] != 0) | (rec["hazard.id_stall"] != 0)
+    if ev.name == "flush": return rec["hazard.flush"] != 0
+    if ev.name == "fwd": return (rec["fwd.a_sel"] != 0) | (rec["fwd.b_sel"] != 0)
+    if ev.name == "write":
+        m = (rec["wb.we"] != 0) & (rec["wb.rd"] != 0)
+        return m & np.isin(rec["wb.rd"], ev.regs) if ev.regs else m
+    if ev.name == "store":
+        m = rec["mem.wr_op"] == 0
+        return m & (rec["mem.addr"] >= ev.span[0]) & (rec["mem.addr"] <= ev.span[1]) if ev.span else m
+    return rec["coreDone"] != 0
+
+class ReplaySession:
+    """Protocol state of one connection: a position in the trace, breakpoints, the until result."""
+
+    def __init__(self, trace: TraceReader):
+        self.trace = trace
+        self.cycles = trace.cycles
+        self.cycle = int(self.cycles[0]) if len(trace) else 0
+        self.bps = BreakpointSet()
+        self.subs = Subscription()
+        self.until = {"hit": 0, "steps": 0, "bp": 0}
+
+    @property
+    def last_cycle(self):
+        return int(self.cycles[-1]) if len(self.trace) else 0
+
+    def index(self) -> int:
+        return max(0, int(np.searchsorted(self.cycles, np.uint64(self.cycle), side="right")) - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        s = self.trace[self.index()] if len(self.trace) else {}
+        s["cycle"] = self.cycle
+        s["until"] = self.until
+        return s
+
+    def advance(self, n: int):
+        self.cycle = min(self.cycle + max(0, n), max(self.last_cycle, self.cycle))
+
+    def run_until(self, bps, max_cycles: int):
+        """Move to the first record (within max_cycles) where one of `bps` fires; hit counts included."""
+        lo = self.index() + 1
+        hi = int(np.searchsorted(self.cycles, np.uint64(self.cycle + max_cycles), side="right"))
+        best, fired, masks = hi, 0, {}
+        for bp in bps.bps.values():
+            m = masks[bp.id] = np.flatnonzero(condition_mask(self.trace, bp, lo, hi))
+            need = max(1, bp.count - bp.hits)
+            if len(m) >= need and lo + m[need - 1] < best: best, fired = lo + int(m[need - 1]), bp.id
+        for bp in bps.bps.values():
+            m = masks[bp.id]
+            upto = best - lo + (1 if fired else 0)
+            bp.hits += int(np.searchsorted(m, upto))
+        start = self.cycle
+        self.cycle = int(self.cycles[best]) if fired else min(start + max_cycles, max(self.last_cycle, start))
+        self.until = {"hit": int(bool(fired)), "steps": self.cycle - start, "bp": fired}
+
+    def go(self, max_cycles: int, heartbeat: int, write) -> Dict[str, Any]:
+        """Stream the records of subscribed events and heartbeats over the next max_cycles, then the last one."""
+        start = self.cycle
+        lo = self.index() + 1
+        hi = int(np.searchsorted(self.cycles, np.uint64(start + max(0, max_cycles)), side="right"))
+        end = min(start + max(0, max_cycles), max(self.last_cycle, start))
+        hit = np.zeros(hi - lo, dtype=bool)
+        for ev in self.subs.events: hit |= event_mask(self.trace, ev, lo, hi)
+        done = self.trace.records["coreDone"]
+        finish = np.flatnonzero(done[lo:hi] != 0) if len(self.trace) and not done[self.index()] else []
+        if len(finish):                      # stop where the core finishes
+            hi = lo + int(finish[0]) + 1
+            hit, end = hit[:hi - lo], int(self.cycles[hi - 1])
+        events = int(hit.sum())
+        if heartbeat > 0: hit |= np.diff((self.cycles[lo:hi].astype(np.int64) - start) // heartbeat, prepend=0) > 0
+        if hi > lo and int(self.cycles[hi - 1]) == end: hit[-1] = False    # the last cycle goes out below
+        for i in np.flatnonzero(hit):
+            self.cycle = int(self.cycles[lo + i])
+            write(self.snapshot())
+        self.cycle = end
+        write(self.snapshot())
+        return {"ack": "go", "ok": True, "steps": end - start, "events": events, "done": int(len(finish) > 0)}
+
+    def handle(self, parts, write):
+        """Apply one command; `write` sends the intermediate snapshots of a batch.
+        Returns the message to send instead of the next snapshot (acks), else None."""
+        cmd = parts[0]
+        if cmd not in ("bp", "sub"): self.until = {"hit": 0, "steps": 0, "bp": 0}
+        if cmd == "step": self.advance(1)
+        elif cmd == "run": self.advance(int(parts[1]) if len(parts) > 1 else 1)
+        elif cmd == "batch":
+            n = int(parts[1]) if len(parts) > 1 else 1
+            every = max(1, int(parts[2])) if len(parts) > 2 else 1
+            for i in range(every, n, every):
+                self.advance(every)
+                write(self.snapshot())
+            self.advance(n - (n - 1) // every * every if n > 0 else 0)
+        elif cmd == "reset":
+            self.cycle = int(self.cycles[0]) if len(self.trace) else 0
+        elif cmd == "until" and len(parts) >= 2 and parts[1] == "bp":
+            self.run_until(self.bps, int(parts[2]) if len(parts) > 2 else 10000)
+        elif cmd == "until" and len(parts) >= 3:
+            # until <kind> <value> [max]: equality on one field, like LivePipelineTest's breakpointHit
+            one = BreakpointSet()
+            if valid_kind(parts[1]): one.add(Breakpoint(parts[1], parse_value(parts[2])))
+            self.run_until(one, int(parts[3]) if len(parts) > 3 else 10000)
+            self.until["bp"] = 0
+        elif cmd == "bp":
+            return self.bps.command(parts[1:])
+        elif cmd == "sub":
+            return self.subs.command(parts[1:])
+        elif cmd == "go":
+            return self.go(int(parts[1]) if len(parts) > 1 else GO_MAX,
+                           int(parts[2]) if len(parts) > 2 else HEARTBEAT, write)
+        elif cmd == "proto":
+            if parts[1:] in (["binary"], ["json"]):
+                return {"ack": "proto", "ok": True, "mode": parts[1], "rom": self.trace.rom}
+            return {"ack": "proto", "ok": False, "error": "usage: proto binary|json"}
+        return None
+
+class _Handler(socketserver.StreamRequestHandler):
+    wbufsize = 1 << 16               # a batch goes out in a few large writes, flushed per reply
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        session = self.server.session()
+        enc = None                   # wire.Encoder after `proto binary`
+        def write(msg, ack=False):
+            if enc is None: self.wfile.write((json.dumps(msg) + "\n").encode())
+            else: self.wfile.write(enc.json(msg) if ack else enc.snapshot(msg))
+        reply = None
+        while True:
+            if reply: write(reply, ack=True)
+            else: write(session.snapshot())
+            self.wfile.flush()
+            if reply and is_proto_ack(reply): enc = Encoder() if reply["mode"] == "binary" else None
+            line = self.rfile.readline()
+            if not line: break
+            parts = line.decode().split()
+            if not parts: reply = None; continue
+            if parts[0] == "quit": break
+            reply = session.handle(parts, write)
+
+class ReplayServer(socketserver.ThreadingTCPServer):
+    """One ReplaySession per connection, so every client starts at the first recorded cycle."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, path: str, host="localhost", port=8888):
+        self.trace = open_trace(path)
+        super().__init__((host, port), _Handler)
+
+    def session(self):
+        return ReplaySession(self.trace)
+
+    def start(self):
+        """Serve from a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+def serve_in_background(path: str, host="localhost", port=8888):
+    """Start a replay server in a child process (used by live_debug.py and web_demo.py --replay)."""
+    server = ReplayServer(path, host, port)        # bind here so a busy port fails loudly
+    print(f"📼 Replaying {path} ({len(server.trace)} records) on {host}:{server.server_address[1]}")
+    proc = multiprocessing.get_context("fork").Process(target=server.serve_forever, daemon=True)
+    proc.start()
+    server.socket.close()
+    return proc
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay a recorded trace over the LivePipelineTest protocol")
+    ap.add_argument("trace")
+    ap.add_argument("--host", default="localhost")
+    ap.add_argument("--port", default=8888, type=int)
+    args = ap.parse_args(argv)
+    server = ReplayServer(args.trace, args.host, args.port)
+    print(f"📼 Replaying {args.trace} ({len(server.trace)} records) on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Shadow data memory: the data-memory image at any recorded cycle, rebuilt from the stores.
+
+The data memory itself is not in the snapshots, but every store is: while MEM does an SW
+(mem.wr_op == 0, like the mem_wr breakpoint) mem.wdata goes to mem.addr. Each word keeps the
+(cycle, value) list of its stores, grouped in pages of PAGE_WORDS words, so reading a word or a page
+at any past cycle is a bisect per word, O(log n), with no replay from cycle 0 and one entry per store.
+
+"At cycle c" means once the stores of cycles up to and including c have landed. Words never
+stored to are unknown (None): their initial contents come from the program image, not from the
+snapshots. Stores in cycles the history skipped (sparse `ff n k` runs) are missed; `missed` counts them.
+
+    python -m live_debug.shadow_mem run.rvt                      # touched pages at the last cycle
+    python -m live_debug.shadow_mem run.rvt --cycle 500 --addr 0x100
+"""
+import argparse
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+PAGE_WORDS = 64                  # 256-byte pages
+PAGE_BYTES = PAGE_WORDS * 4
+STORE_OP = 0                     # SW in memWrOpT
+
+Word = Tuple[List[int], List[int]]      # cycles of the stores to a word, and the values stored
+
+def page_of(addr: int) -> int:
+    return addr - addr % PAGE_BYTES
+
+class ShadowMemory:
+    """Sparse pages of per-word store histories, fed snapshot by snapshot in cycle order."""
+
+    def __init__(self):
+        self.pages: Dict[int, Dict[int, Word]] = {}     # page base -> word address -> its stores
+        self.stores = 0
+        self.last_cycle: Optional[int] = None
+        self.missed = 0              # cycles between fed snapshots, whose stores were not seen
+
+    def clear(self):
+        self.__init__()
+
+    def store(self, cycle: int, addr: int, value: int):
+        addr &= 0xFFFFFFFC
+        cycles, values = self.pages.setdefault(page_of(addr), {}).setdefault(addr, ([], []))
+        if cycles and cycles[-1] == cycle: values[-1] = value
+        else:
+            cycles.append(cycle)
+            values.append(value)
+        self.stores += 1
+
+    def add(self, s: Dict[str, Any]) -> bool:
+        """Feed the next snapshot; True if it stored. Cycles at or before the last one fed are skipped."""
+        cycle = int(s.get("cycle", 0))
+        if self.last_cycle is not None:
+            if cycle <= self.last_cycle: return False
+            self.missed += cycle - self.last_cycle - 1
+        self.last_cycle = cycle
+        mem = s.get("mem")
+        if not isinstance(mem, dict) or mem.get("wr_op", STORE_OP + 1) != STORE_OP: return False
+        self.store(cycle, int(mem.get("addr", 0)), int(mem.get("wdata", 0)))
+        return True
+
+    def add_records(self, rec):
+        """Feed trace records (a NumPy slice of trace.DTYPE rows, in cycle order) in one pass."""
+        if not len(rec): return
+        cyc = rec["cycle"].astype("int64")
+        first = int(np.searchsorted(cyc, self.last_cycle, side="right")) if self.last_cycle is not None else 0
+        cyc = cyc[first:]
+        if not len(cyc): return
+        prev = self.last_cycle if self.last_cycle is not None else int(cyc[0]) - 1
+        self.missed += int(cyc[-1]) - prev - len(cyc)
+        self.last_cycle = int(cyc[-1])
+        m = np.flatnonzero(rec["mem.wr_op"][first:] == STORE_OP)       # columns only: rows are wide
+        for c, a, v in zip(cyc[m].tolist(), rec["mem.addr"][first:][m].tolist(), rec["mem.wdata"][first:][m].tolist()):
+            self.store(c, a, v)
+
+    def _at(self, word: Optional[Word], cycle: Optional[int]) -> Optional[Tuple[int, int]]:
+        if not word: return None
+        i = len(word[0]) if cycle is None else bisect_right(word[0], cycle)
+        return (word[1][i - 1], word[0][i - 1]) if i else None
+
+    def read(self, addr: int, cycle: Optional[int] = None) -> Optional[int]:
+        """The word at `addr` at `cycle` (the latest if None); None if nothing was stored there yet."""
+        addr &= 0xFFFFFFFC
+        hit = self._at(self.pages.get(page_of(addr), {}).get(addr), cycle)
+        return hit[0] if hit else None
+
+    def page(self, base: int, cycle: Optional[int] = None) -> List[Optional[Tuple[int, int]]]:
+        """(value, cycle of the store) of each word of the page holding `base`, None where unknown."""
+        base = page_of(base)
+        words = self.pages.get(base, {})
+        return [self._at(words.get(base + 4 * i), cycle) for i in range(PAGE_WORDS)]
+
+    def touched(self, cycle: Optional[int] = None) -> List[int]:
+        """Bases of the pages with a store at or before `cycle`."""
+        return sorted(b for b, words in self.pages.items()
+                      if any(cycle is None or w[0][0] <= cycle for w in words.values()))
+
+    def view(self, base: int, cycle: Optional[int] = None) -> Dict[str, Any]:
+        """A page as sent to the web UI: words (null if unknown), the cycle each was stored, the touched pages."""
+        words = self.page(base, cycle)
+        return {"base": page_of(base), "cycle": cycle, "words": [w and w[0] for w in words],
+                "stored_at": [w and w[1] for w in words], "pages": self.touched(cycle),
+                "stores": self.stores, "missed": self.missed}
+
+    def format(self, base: int, cycle: Optional[int] = None, words: int = PAGE_WORDS, known_only=False) -> List[str]:
+        """Text dump of `words` words from `base`, four per line; `*` marks words stored in this cycle.
+        known_only leaves out the lines where nothing is known."""
+        base &= 0xFFFFFFFC
+        lines = []
+        for row in range(base, base + 4 * words, 16):
+            cells = []
+            for addr in range(row, min(row + 16, base + 4 * words), 4):
+                hit = self._at(self.pages.get(page_of(addr), {}).get(addr), cycle)
+                cells.append("   --    " if hit is None else f"{hit[0]:08x}{'*' if hit[1] == cycle else ' '}")
+            if not known_only or any(c != "   --    " for c in cells): lines.append(f"0x{row:08x}: " + " ".join(cells))
+        return lines
+
+def from_trace(path: str) -> ShadowMemory:
+    from .replay import open_trace
+    t = open_trace(path)
+    m = ShadowMemory()
+    m.add_records(t.records)
+    return m
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Data memory at a cycle of a recorded trace, rebuilt from its stores")
+    ap.add_argument("trace", help=".rvt or .jsonl recording")
+    ap.add_argument("--cycle", type=int, default=None, help="default: the last recorded cycle")
+    ap.add_argument("--addr", type=lambda x: int(x, 0), default=None, help="page to dump (default: every touched page)")
+    args = ap.parse_args(argv)
+    m = from_trace(args.trace)
+    print(f"{m.stores} stores, {len(m.pages)} pages touched" + (f", {m.missed} cycles not recorded" if m.missed else ""))
+    for base in [page_of(args.addr)] if args.addr is not None else m.touched(args.cycle):
+        print("\n".join(m.format(base, args.cycle, known_only=args.addr is None)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Binary pipeline traces: a JSON header followed by fixed-width per-cycle records.
+
+Layout of a .rvt file:
+    b"RVTRACE1" | u32 header length | JSON header (fields, ROM, ...) | zero padding to 64 bytes
+    records: one NumPy structured record per snapshot, `record_size` bytes each
+
+The record count follows from the file size, so a writer can just append, and a reader can
+np.memmap the records and jump to any cycle (the `cycle` column is sorted: bisect it).
+
+    python -m live_debug.trace convert run.jsonl run.rvt
+    python -m live_debug.trace info run.rvt
+    python -m live_debug.trace show run.rvt 900000
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+
+MAGIC = b"RVTRACE1"
+ALIGN = 64
+FLUSH_EVERY = 4096
+STAGES = ["if", "id", "ex", "mem", "wb"]
+
+# (snapshot path, dtype) of every column; anything not listed here is not recorded
+FIELDS = (
+    [(("cycle",), "<u8"), (("coreDone",), "u1"), (("gpRegVal",), "<u4"), (("result",), "<u4")]
+    + [(("pc", s), "<u4") for s in STAGES]
+    + [(("instr", s), "<u4") for s in STAGES]
+    + [(("regs", f"x{i}"), "<u4") for i in range(32)]
+    + [(("id", k), "u1") for k in ("rs1", "rs2", "rd", "we")]
+    + [(("hazard", k), "u1") for k in ("pc_write", "if_stall", "id_stall", "flush")]
+    + [(("fwd", k), "u1") for k in ("a_sel", "b_sel")]
+    + [(("ex", k), "<u4") for k in ("alu_result", "alu_op_a", "alu_op_b", "pc_jb")]
+    + [(("ex", k), "u1") for k in ("pc_src", "rd", "we", "mem_rd_op", "mem_wr_op", "mem_to_reg")]
+    + [(("mem", k), "<u4") for k in ("addr", "wdata", "rdata")]
+    + [(("mem", k), "u1") for k in ("rd_op", "wr_op", "rd", "we", "mem_to_reg")]
+    + [(("wb", k), "<u4") for k in ("wdata", "check_res")] + [(("wb", k), "u1") for k in ("rd", "we")]
+    + [(("until", k), "<u4") for k in ("hit", "steps", "bp")]
+)
+DTYPE = np.dtype([(".".join(path), dt) for path, dt in FIELDS])
+_MASKS = [(1 << (8 * np.dtype(dt).itemsize)) - 1 for _, dt in FIELDS]
+
+def _to_int(v):
+    if isinstance(v, str): return int(v, 16) if v.lower().startswith("0x") else int(v)
+    return int(v or 0)
+
+def _getters():
+    """itemgetters over runs of FIELDS that share a parent dict, in DTYPE order."""
+    from operator import itemgetter
+    runs = []
+    for path, _ in FIELDS:
+        parent = path[0] if len(path) == 2 else None
+        if runs and runs[-1][0] == parent: runs[-1][1].append(path[-1])
+        else: runs.append((parent, [path[-1]]))
+    return [(parent, itemgetter(*keys), tuple(keys)) for parent, keys in runs]
+
+_GETTERS = _getters()
+
+def record_tuple(s: Dict[str, Any]) -> tuple:
+    """One snapshot as a tuple in DTYPE order (missing fields are 0)."""
+    out = ()
+    for parent, get, keys in _GETTERS:
+        d = s if parent is None else s.get(parent)
+        try:
+            v = get(d)
+        except (KeyError, TypeError):
+            v = tuple(d.get(k, 0) for k in keys) if isinstance(d, dict) else (0,) * len(keys)
+            if len(keys) == 1: v = v[0]
+        out += v if len(keys) > 1 else (v,)
+    return out
+
+class TraceWriter:
+    """Append snapshots to a .rvt file; records are buffered and written in blocks."""
+
+    def __init__(self, path: str, rom: Optional[List[Any]] = None, meta: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.f = open(path, "wb")
+        header = json.dumps({"version": 1, "fields": [[n, DTYPE.fields[n][0].str] for n in DTYPE.names],
+                             "record_size": DTYPE.itemsize, "rom": list(rom or []), "meta": meta or {}}).encode()
+        head = MAGIC + struct.pack("<I", len(header)) + header
+        self.f.write(head + b"\0" * (-len(head) % ALIGN))
+        self._rows = []
+        self.count = 0
+
+    def append(self, s: Dict[str, Any]):
+        self._rows.append(record_tuple(s))
+        self.count += 1
+        if len(self._rows) == FLUSH_EVERY: self.flush()
+
+    def flush(self):
+        if self._rows:
+            try:
+                block = np.array(self._rows, dtype=DTYPE)
+            except (ValueError, TypeError, OverflowError):
+                # hex strings or out-of-range values: normalise field by field
+                block = np.array([tuple(_to_int(v) & m for v, m in zip(r, _MASKS)) for r in self._rows], dtype=DTYPE)
+            self.f.write(block.tobytes())
+            self._rows = []
+        self.f.flush()
+
+    def close(self):
+        if self.f.closed: return
+        self.flush()
+        self.f.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+class TraceReader:
+    """Random access to a .rvt file through np.memmap; nothing is parsed up front."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path} is not a pipeline trace")
+            (n,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(n))
+        self.dtype = np.dtype([tuple(x) for x in self.header["fields"]])
+        self.offset = len(MAGIC) + 4 + n
+        self.offset += -self.offset % ALIGN
+        count = max(0, os.path.getsize(path) - self.offset) // self.dtype.itemsize
+        self.records = np.memmap(path, dtype=self.dtype, mode="r", offset=self.offset, shape=(count,)) \
+            if count else np.zeros(0, dtype=self.dtype)
+        self.rom = self.header.get("rom", [])
+        # runs of columns sharing a parent dict: (parent or None, keys, first column, end column)
+        self._groups = []
+        for j, name in enumerate(self.dtype.names):
+            parent, _, key = name.rpartition(".")
+            parent = parent or None
+            if self._groups and self._groups[-1][0] == parent:
+                g = self._groups[-1]
+                self._groups[-1] = (parent, g[1] + (key,), g[2], j + 1)
+            else:
+                self._groups.append((parent, (key,), j, j + 1))
+        self._cycles = None
+
+    def __len__(self): return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """A whole column (e.g. "pc.ex", "regs.x5"), as a view into the file."""
+        return self.records[name]
+
+    @property
+    def cycles(self) -> np.ndarray:
+        """The cycle column as one contiguous array (searchsorted would copy the strided view per call)."""
+        if self._cycles is None: self._cycles = np.ascontiguousarray(self.records["cycle"])
+        return self._cycles
+
+    def index_of_cycle(self, cycle: int) -> int:
+        """Index of the last record at or before `cycle` (records may skip cycles)."""
+        i = int(np.searchsorted(self.cycles, np.uint64(max(0, cycle)), side="right")) - 1
+        if i < 0: raise IndexError(f"cycle {cycle} is before the start of the trace")
+        return i
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        """Record i rebuilt as a LivePipelineTest snapshot."""
+        vals = self.records[i].tolist()
+        s: Dict[str, Any] = {}
+        for parent, keys, lo, hi in self._groups:
+            if parent is None: s.update(zip(keys, vals[lo:hi]))
+            else: s[parent] = dict(zip(keys, vals[lo:hi]))
+        s["rom"] = self.rom if s["cycle"] == 0 else []
+        return s
+
+    def at_cycle(self, cycle: int) -> Dict[str, Any]:
+        return self[self.index_of_cycle(cycle)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)): yield self[i]
+
+class JsonlRecorder:
+    """The original text recording: one json.dumps per snapshot."""
+
+    def __init__(self, path: str):
+        self.f = open(path, "w")
+
+    def append(self, s: Dict[str, Any]):
+        self.f.write(json.dumps(s) + "\n")
+
+    def close(self):
+        self.f.close()
+
+def open_recording(path: str, rom: Optional[List[Any]] = None):
+    """Recorder for `record on <path>`: JSONL if the name ends in .jsonl, binary trace otherwise."""
+    return JsonlRecorder(path) if path.endswith(".jsonl") else TraceWriter(path, rom)
+
+def segment_path(path: str, n: int) -> str:
+    """Where segment n of a recording goes (run.rvt, run.1.rvt, ...): a reset starts a new one,
+    so that the cycles of every file ascend."""
+    if n == 0: return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{n}{ext}"
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path) as f:
+        for line in f:
+            if line.strip(): yield json.loads(line)
+
+def convert_jsonl(src: str, dst: str) -> int:
+    """Convert a JSONL recording to a binary trace; returns the number of snapshots."""
+    it = read_jsonl(src)
+    first = next(it, None)
+    with TraceWriter(dst, (first or {}).get("rom")) as w:
+        if first is not None: w.append(first)
+        for s in it: w.append(s)
+        return w.count
+
+def load(path: str):
+    """Snapshots of either kind of recording: a TraceReader, or a list for JSONL."""
+    with open(path, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    return TraceReader(path) if binary else list(read_jsonl(path))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Binary pipeline traces")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("convert", help="JSONL recording -> .rvt")
+    c.add_argument("src"); c.add_argument("dst")
+    i = sub.add_parser("info")
+    i.add_argument("path")
+    s = sub.add_parser("show", help="print the snapshot at a cycle as JSON")
+    s.add_argument("path"); s.add_argument("cycle", type=int)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "convert":
+        n = convert_jsonl(args.src, args.dst)
+        a, b = os.path.getsize(args.src), os.path.getsize(args.dst)
+        print(f"Wrote {n} snapshots to {args.dst}: {b/2**20:.1f} MiB ({a/max(b,1):.1f}x smaller than the JSONL)")
+    elif args.cmd == "info":
+        t = TraceReader(args.path)
+        cyc = t.column("cycle")
+        span = f"cycles {cyc[0]}..{cyc[-1]}" if len(t) else "empty"
+        print(f"{args.path}: {len(t)} records of {t.dtype.itemsize} B, {span}, ROM {len(t.rom)} words")
+    elif args.cmd == "show":
+        json.dump(TraceReader(args.path).at_cycle(args.cycle), sys.stdout)
+        print()
+
+if __name__ == "__main__":
+    main()
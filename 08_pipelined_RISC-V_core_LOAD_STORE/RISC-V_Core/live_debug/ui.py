@@ -1,6 +1,8 @@
-
+import os
 import re
-from typing import Dict, Any
+import sys
+import time
+from typing import Dict, Any, List, Optional
 from .decoder import decode_rv32i
 
 class Layout:
@@ -15,12 +17,14 @@ class Colors:
     WB="\033[48;5;159m\033[38;5;0m"
     GREEN="\033[92m"; RED="\033[91m"; ORANGE="\033[38;5;208m"; BLUE="\033[94m"
 
+_ANSI = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
 def strip_ansi(text):
-    return re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', str(text))
+    return _ANSI.sub('', str(text))
 
 def pad(text, width):
     s = str(text)
-    vis = len(strip_ansi(s))
+    vis = len(strip_ansi(s)) if "\x1b" in s else len(s)
     if vis >= width: return s[:width]
     return s + " " * (width - vis)
 
@@ -33,36 +37,41 @@ def get(d, path, default=0):
         cur = cur[p]
     return cur
 
-def show_snapshot(s: Dict[str, Any]):
+# Static parts of the box, built once
+W_TOT = Layout.W_STAGE + Layout.W_STATUS + Layout.W_PC + Layout.W_INSTR + Layout.W_DETAILS + 13
+TOP = Colors.BOLD + Layout.TL + Layout.HL*(W_TOT-2) + Layout.TR + Colors.RESET
+SEP = (Layout.T_LEFT + Layout.HL*(Layout.W_STAGE+2) + Layout.CROSS +
+       Layout.HL*(Layout.W_STATUS+2) + Layout.CROSS + Layout.HL*(Layout.W_PC+2) + Layout.CROSS +
+       Layout.HL*(Layout.W_INSTR+2) + Layout.CROSS + Layout.HL*(Layout.W_DETAILS+2) + Layout.T_RIGHT)
+BOTTOM = Layout.BL + Layout.HL*(W_TOT-2) + Layout.BR
+ST_OK = pad(f"{Colors.GREEN}OK{Colors.RESET}", Layout.W_STATUS)
+ST_STALL = pad(f"{Colors.RED}STALL{Colors.RESET}", Layout.W_STATUS)
+ST_FLUSH = pad(f"{Colors.ORANGE}FLUSH{Colors.RESET}", Layout.W_STATUS)
+
+def render_snapshot(s: Dict[str, Any]) -> List[str]:
+    """The pipeline box for one snapshot as a list of terminal rows (no trailing newlines)."""
     cycle = int(s.get("cycle", 0))
     haz = get(s,"hazard",{}); fwd = get(s,"fwd",{})
+    lines = ["", TOP]
 
     # Header
-    w_tot = Layout.W_STAGE + Layout.W_STATUS + Layout.W_PC + Layout.W_INSTR + Layout.W_DETAILS + 13
-    print("\n" + Colors.BOLD + Layout.TL + Layout.HL*(w_tot-2) + Layout.TR + Colors.RESET + "\033[K")
-
     stat = f"{Colors.GREEN}● RUNNING{Colors.RESET}" if haz.get("pc_write",1) else f"{Colors.RED}● STALLED{Colors.RESET}"
     head = f" ⏱️  CYCLE: {pad(str(cycle), 10)} | {stat}"
-    print(f"{Layout.VL} {pad(head, w_tot-4)} {Layout.VL}\033[K")
-
-    sep = (Layout.T_LEFT + Layout.HL*(Layout.W_STAGE+2) + Layout.CROSS +
-           Layout.HL*(Layout.W_STATUS+2) + Layout.CROSS + Layout.HL*(Layout.W_PC+2) + Layout.CROSS +
-           Layout.HL*(Layout.W_INSTR+2) + Layout.CROSS + Layout.HL*(Layout.W_DETAILS+2) + Layout.T_RIGHT)
-    print(sep + "\033[K")
+    lines.append(f"{Layout.VL} {pad(head, W_TOT-4)} {Layout.VL}")
+    lines.append(SEP)
 
     # Rows
     def p_row(nm, col, pc, ins, det):
         pc_v = int(get(s, pc)); ins_v = int(get(s, ins))
         asm = decode_rv32i(ins_v)
-        st = f"{Colors.GREEN}OK{Colors.RESET}"
-        if nm=="IF" and haz.get("if_stall"): st=f"{Colors.RED}STALL{Colors.RESET}"
-        if nm=="ID" and haz.get("id_stall"): st=f"{Colors.RED}STALL{Colors.RESET}"
-        if haz.get("flush") and nm in ["ID","EX"]: st=f"{Colors.ORANGE}FLUSH{Colors.RESET}"
+        st = ST_OK
+        if nm=="IF" and haz.get("if_stall"): st=ST_STALL
+        if nm=="ID" and haz.get("id_stall"): st=ST_STALL
+        if haz.get("flush") and nm in ["ID","EX"]: st=ST_FLUSH
 
-        row = (f"{Layout.VL} {col} {pad(nm, Layout.W_STAGE-1)}{Colors.RESET} {Layout.VL} "
-               f"{pad(st, Layout.W_STATUS)} {Layout.VL} {pad(fmt_hex(pc_v), Layout.W_PC)} {Layout.VL} "
-               f"{pad(asm, Layout.W_INSTR)} {Layout.VL} {pad(det, Layout.W_DETAILS)} {Layout.VL}")
-        print(row + "\033[K")
+        lines.append(f"{Layout.VL} {col} {pad(nm, Layout.W_STAGE-1)}{Colors.RESET} {Layout.VL} "
+                     f"{st} {Layout.VL} {pad(fmt_hex(pc_v), Layout.W_PC)} {Layout.VL} "
+                     f"{pad(asm, Layout.W_INSTR)} {Layout.VL} {pad(det, Layout.W_DETAILS)} {Layout.VL}")
 
     # Data Construction
     id_d = f"rs1:x{get(s,'id.rs1')} rs2:x{get(s,'id.rs2')} -> rd:x{get(s,'id.rd')}"
@@ -84,7 +93,7 @@ def show_snapshot(s: Dict[str, Any]):
     p_row("MEM", Colors.MEM, "pc.mem", "instr.mem", mem_d)
     p_row("WB", Colors.WB, "pc.wb", "instr.wb", wb_d)
 
-    print(Layout.BL + Layout.HL*(w_tot-2) + Layout.BR + "\033[K")
+    lines.append(BOTTOM)
 
     # Footer
     h_list = []
@@ -94,4 +103,48 @@ def show_snapshot(s: Dict[str, Any]):
     if fwd.get("a_sel") or fwd.get("b_sel"): h_list.append(f"{Colors.BLUE}[DATA_FWD]{Colors.RESET}")
 
     h_str = " ".join(h_list) if h_list else f"{Colors.DIM}None{Colors.RESET}"
-    print(f" {Colors.BOLD}⚡ HAZARDS / EVENTS:{Colors.RESET} {h_str}\033[K")
\ No newline at end of file
+    lines.append(f" {Colors.BOLD}⚡ HAZARDS / EVENTS:{Colors.RESET} {h_str}")
+    return lines
+
+def show_snapshot(s: Dict[str, Any]):
+    sys.stdout.write("\033[K\n".join(render_snapshot(s)) + "\033[K\n")
+
+class FrameRenderer:
+    """Terminal frame buffer: each frame is composed in memory, diffed against the previous one
+    row by row, and only the changed rows are written, in a single write call."""
+
+    def __init__(self, fd: Optional[int] = None):
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        self.prev: Optional[List[str]] = None
+        self.last = 0.0              # perf_counter() of the last frame
+        self.frames = 0
+        self.bytes_written = 0
+
+    def invalidate(self):
+        """Forget the screen contents (after something else printed); the next frame is full."""
+        self.prev = None
+
+    def compose(self, lines: List[str]) -> str:
+        if self.prev is None:
+            parts, prev = ["\033[?25l\033[H\033[2J"], []
+        else:
+            parts, prev = [], self.prev
+        for i, line in enumerate(lines):
+            if i >= len(prev) or prev[i] != line:
+                parts.append(f"\033[{i+1};1H{line}\033[K")
+        if len(lines) < len(prev): parts.append(f"\033[{len(lines)+1};1H\033[J")
+        return "".join(parts)
+
+    def draw(self, lines: List[str]):
+        data = self.compose(lines).encode()
+        self.prev = list(lines)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+        self.bytes_written += len(data)
+        self.frames += 1
+        self.last = time.perf_counter()
+
+    def close(self):
+        """Park the cursor below the frame and show it again."""
+        os.write(self.fd, f"\033[{len(self.prev or []) + 1};1H\033[?25h".encode())
@@ -0,0 +1,117 @@
+"""Compact binary mode of the LivePipelineTest protocol, negotiated with `proto binary`.
+
+The ack of `proto binary` is the last JSON line; it carries the ROM, which is not sent again.
+From then on every message is a frame (little-endian):
+
+    u32 length (kind + payload) | u8 kind | payload
+    kind 0, snapshot: the FIELDS below in order, then a u32 mask of the registers that changed
+                      since the previous snapshot and their values (u32, ascending register number)
+    kind 1, JSON:     acks and anything else that is not a snapshot
+
+The first snapshot after the switch or a reconnect carries all 32 registers. A simulator that
+does not know `proto` answers with a plain snapshot, and the client simply stays on JSON lines.
+"""
+import json
+import struct
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT, JSON = 0, 1
+STAGES = ("if", "id", "ex", "mem", "wb")
+
+# Field order of a snapshot frame; LivePipelineTest's u32Fields / u8Fields must list the same ones
+U32 = ([("gpRegVal",), ("result",)] + [("pc", s) for s in STAGES] + [("instr", s) for s in STAGES]
+       + [("ex", k) for k in ("alu_result", "alu_op_a", "alu_op_b", "pc_jb")]
+       + [("mem", k) for k in ("addr", "wdata", "rdata")] + [("wb", "wdata"), ("wb", "check_res")]
+       + [("until", "steps"), ("until", "bp")])
+U8 = ([("coreDone",), ("until", "hit")] + [("id", k) for k in ("rs1", "rs2", "rd", "we")]
+      + [("hazard", k) for k in ("pc_write", "if_stall", "id_stall", "flush")] + [("fwd", "a_sel"), ("fwd", "b_sel")]
+      + [("ex", k) for k in ("pc_src", "rd", "we", "mem_rd_op", "mem_wr_op", "mem_to_reg")]
+      + [("mem", k) for k in ("rd_op", "wr_op", "rd", "we", "mem_to_reg")]
+      + [("wb", k) for k in ("rd", "we")])
+FIELDS = [("cycle",)] + U32 + U8
+HEAD = struct.Struct(f"<Q{len(U32)}I{len(U8)}B")
+FRAME = struct.Struct("<IB")
+MASK = struct.Struct("<I")
+REG_NAMES = [f"x{i}" for i in range(32)]
+
+def _layout():
+    """(top-level keys, their getter, [(group, keys, getter)]) over the unpacked HEAD tuple."""
+    top, groups = [], {}
+    for i, path in enumerate(FIELDS):
+        if len(path) == 1: top.append((path[0], i))
+        else: groups.setdefault(path[0], []).append((path[1], i))
+    get = lambda idx: itemgetter(*idx) if len(idx) > 1 else (lambda v, i=idx[0]: (v[i],))
+    return (tuple(k for k, _ in top), get([i for _, i in top]),
+            [(g, tuple(k for k, _ in kv), get([i for _, i in kv])) for g, kv in groups.items()])
+
+_TOP_KEYS, _TOP_GET, _GROUPS = _layout()
+_REGS = {n: struct.Struct(f"<{n}I") for n in range(33)}
+
+def is_proto_ack(msg: Dict[str, Any]) -> bool:
+    return msg.get("ack") == "proto" and bool(msg.get("ok"))
+
+class Decoder:
+    """Frames -> snapshot dicts shaped like the JSON ones (registers are kept across deltas)."""
+
+    def __init__(self, rom: Optional[List[Any]] = None):
+        self.rom = list(rom or [])
+        self.regs = [0] * 32
+
+    def snapshot(self, payload: bytes) -> Dict[str, Any]:
+        vals = HEAD.unpack_from(payload)
+        (mask,) = MASK.unpack_from(payload, HEAD.size)
+        if mask:
+            new = _REGS[bin(mask).count("1")].unpack_from(payload, HEAD.size + MASK.size)
+            regs, j = self.regs, 0
+            while mask:
+                low = mask & -mask
+                regs[low.bit_length() - 1] = new[j]
+                mask ^= low
+                j += 1
+        s = dict(zip(_TOP_KEYS, _TOP_GET(vals)))
+        for g, keys, get in _GROUPS:
+            s[g] = dict(zip(keys, get(vals)))
+        s["regs"] = dict(zip(REG_NAMES, self.regs))
+        s["rom"] = self.rom if s["cycle"] == 0 else []     # like the JSON lines: again after each reset
+        return s
+
+    def decode(self, kind: int, payload: bytes) -> Dict[str, Any]:
+        return self.snapshot(payload) if kind == SNAPSHOT else json.loads(payload)
+
+class Encoder:
+    """The simulator side, for Python stand-ins (replay server, tests, benchmarks)."""
+
+    def __init__(self):
+        self.regs: Optional[List[int]] = None
+
+    def snapshot(self, s: Dict[str, Any]) -> bytes:
+        vals = []
+        for path in FIELDS:
+            v = s.get(path[0], 0)
+            if len(path) == 2: v = v.get(path[1], 0) if isinstance(v, dict) else 0
+            vals.append(int(v or 0))
+        regs_in = s.get("regs") or {}
+        regs = [int(regs_in.get(n, 0)) for n in REG_NAMES]
+        changed = [r for r in range(32) if self.regs is None or regs[r] != self.regs[r]]
+        self.regs = regs
+        mask = sum(1 << r for r in changed)
+        body = HEAD.pack(*vals) + MASK.pack(mask) + struct.pack(f"<{len(changed)}I", *(regs[r] for r in changed))
+        return FRAME.pack(len(body) + 1, SNAPSHOT) + body
+
+    def json(self, msg: Dict[str, Any]) -> bytes:
+        body = json.dumps(msg).encode()
+        return FRAME.pack(len(body) + 1, JSON) + body
+
+def read_frame(f) -> Tuple[int, bytes]:
+    """One frame from a binary file object; EOFError when the simulator goes away."""
+    head = f.read(FRAME.size)
+    if len(head) < FRAME.size: raise EOFError
+    length, kind = FRAME.unpack(head)
+    payload = f.read(length - 1)
+    if len(payload) < length - 1: raise EOFError
+    return kind, payload
+
+async def read_frame_async(reader) -> Tuple[int, bytes]:
+    length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return kind, await reader.readexactly(length - 1)
@@ -11,8 +11,14 @@ import java.nio.file.{Files, Paths}
 class LivePipelineTest extends AnyFlatSpec with ChiselScalatestTester {
   behavior of "PipelinedRV32I"
 
+  // LIVE_PORT / LIVE_PROGRAM let the Python launcher run several warm simulators side by side
+  val livePort = sys.env.get("LIVE_PORT").map(_.toInt).getOrElse(8888)
+  val programPath = sys.env.getOrElse("LIVE_PROGRAM", "src/test/programs/BinaryFile")
+  // LIVE_TRACE=1: print x1 and the ALU's operand A of every snapshot (slows batch/go down a lot)
+  val traceCycles = sys.env.get("LIVE_TRACE").exists(v => v.nonEmpty && v != "0")
+
   it should "run in live mode waiting for Python" in {
-    test(new PipelinedRV32I("src/test/programs/BinaryFile"))
+    test(new PipelinedRV32I(programPath))
       .withAnnotations(Seq(WriteVcdAnnotation)) { dut =>
 
         def parseBigInt(s: String): BigInt = {
@@ -27,36 +33,162 @@ class LivePipelineTest extends AnyFlatSpec with ChiselScalatestTester {
         }
         def b(x: => Data): BigInt = safePeek(x)
 
-        // TCP server
-        val server = new ServerSocket(8888)
-        println("\n🟦 [CHISEL] Waiting for Python on port 8888...")
-        val client = server.accept()
-        println("🟩 [CHISEL] Connected! Starting Loop...")
-
-        val in  = new BufferedReader(new InputStreamReader(client.getInputStream))
-        val out = new PrintWriter(client.getOutputStream, true)
+        // TCP server: one client at a time; when it leaves we accept the next one (state is kept),
+        // so readiness probes and reconnects do not need a new simulator. `quit` ends the test.
+        val server = new ServerSocket(livePort)
+        var serving = true
 
         var cycle = 0L
         var running = true
         var lastUntilHit = 0
         var lastUntilSteps = 0
+        val RegKind = "x([0-9]+)".r
+        var reply: String = null     // sent instead of a snapshot at the next loop head (bp acks)
+        var romPending = true
 
-        def breakpointHit(kind: String, value: BigInt): Boolean = {
+        // Current value of a breakpoint kind (mem_wr / mem_rd: the MEM address, only while storing / loading)
+        def bpField(kind: String): Option[BigInt] = {
           kind match {
-            case "if_pc"    => b(dut.io.dbg.if_pc) == value
-            case "id_pc"    => b(dut.io.dbg.id_pc) == value
-            case "ex_pc"    => b(dut.io.dbg.ex_pc) == value
-            case "mem_pc"   => b(dut.io.dbg.mem_pc) == value
-            case "wb_pc"    => b(dut.io.dbg.wb_pc) == value
-            case "wb_rd"    => b(dut.io.dbg.wb_rd) == value
-            case "wb_we"    => b(dut.io.dbg.wb_we) == value
-            case "mem_addr" => b(dut.io.dbg.mem_addr) == value
-            case _          => false
+            case "if_pc"    => Some(b(dut.io.dbg.if_pc))
+            case "id_pc"    => Some(b(dut.io.dbg.id_pc))
+            case "ex_pc"    => Some(b(dut.io.dbg.ex_pc))
+            case "mem_pc"   => Some(b(dut.io.dbg.mem_pc))
+            case "wb_pc"    => Some(b(dut.io.dbg.wb_pc))
+            case "wb_rd"    => Some(b(dut.io.dbg.wb_rd))
+            case "wb_we"    => Some(b(dut.io.dbg.wb_we))
+            case "mem_addr" => Some(b(dut.io.dbg.mem_addr))
+            case "cycle"    => Some(BigInt(cycle))
+            // SW / LW are encoded as 0 in memWrOpT / memRdOpT
+            case "mem_wr"   => if (b(dut.io.dbg.mem_wr_op) == 0) Some(b(dut.io.dbg.mem_addr)) else None
+            case "mem_rd"   => if (b(dut.io.dbg.mem_rd_op) == 0) Some(b(dut.io.dbg.mem_addr)) else None
+            case RegKind(n) if n.length <= 2 && n.toInt < 32 => Some(b(dut.io.dbg.regs(n.toInt)))
+            case _          => None
+          }
+        }
+
+        def compare(cur: BigInt, op: String, value: BigInt): Boolean = op match {
+          case "==" => cur == value
+          case "!=" => cur != value
+          case "<"  => cur < value
+          case ">"  => cur > value
+          case "<=" => cur <= value
+          case ">=" => cur >= value
+          case _    => false
+        }
+
+        def breakpointHit(kind: String, value: BigInt): Boolean =
+          bpField(kind).exists(_ == value)
+
+        // Server-side breakpoints: `bp add <kind> [op] <value> [count]`, `bp del <id>`, `bp clear`, `bp list`.
+        // A breakpoint fires from its count-th hit on; hits are counted while running `until bp`.
+        case class Bp(id: Int, kind: String, op: String, value: BigInt, count: Int, var hits: Int = 0)
+        val bps = scala.collection.mutable.LinkedHashMap[Int, Bp]()
+        var nextBpId = 1
+        var lastUntilBp = 0
+
+        def bpsJson(): String = bps.values.map(bp =>
+          s"""{"id": ${bp.id}, "kind": "${bp.kind}", "op": "${bp.op}", "value": ${bp.value}, "count": ${bp.count}, "hits": ${bp.hits}}"""
+        ).mkString("[", ", ", "]")
+
+        // Replies to `bp` commands are acks, not snapshots (the frontends keep them out of the history)
+        def bpCommand(args: List[String]): String = {
+          def ack(id: Int) = s"""{"ack": "bp", "ok": true, "id": $id, "bps": ${bpsJson()}}"""
+          def nack(msg: String) = s"""{"ack": "bp", "ok": false, "error": "$msg", "bps": ${bpsJson()}}"""
+          args match {
+            case "add" :: kind :: rest if bpField(kind).isDefined || Set("mem_wr", "mem_rd").contains(kind) =>
+              val (op, tail) = rest match {
+                case o :: t if Set("==", "!=", "<", ">", "<=", ">=").contains(o) => (o, t)
+                case t => ("==", t)
+              }
+              try {
+                val value = parseBigInt(tail.head)
+                val count = if (tail.length >= 2) math.max(1, tail(1).toInt) else 1
+                bps(nextBpId) = Bp(nextBpId, kind, op, value, count)
+                nextBpId += 1
+                ack(nextBpId - 1)
+              } catch { case _: Throwable => nack("bad breakpoint value") }
+            case "add" :: _ => nack("unknown breakpoint kind")
+            case "del" :: id :: Nil =>
+              val n = scala.util.Try(id.toInt).getOrElse(-1)
+              if (bps.remove(n).isDefined) ack(n) else nack("no such breakpoint")
+            case "clear" :: Nil => bps.clear(); ack(0)
+            case Nil | "list" :: Nil => ack(0)
+            case _ => nack("usage: bp add|del|clear|list")
+          }
+        }
+
+        // Count hits for this cycle; id of the first breakpoint that fires (0 if none)
+        def checkBps(): Int = {
+          var fired = 0
+          for (bp <- bps.values) {
+            if (bpField(bp.kind).exists(cur => compare(cur, bp.op, bp.value))) {
+              bp.hits += 1
+              if (fired == 0 && bp.hits >= bp.count) fired = bp.id
+            }
           }
+          fired
+        }
+
+        // Event subscription for `go` (same grammar as live_debug/events.py):
+        // `sub stall flush fwd write[=x1,x5] store[=lo-hi] done`, `sub clear`, `sub list`
+        case class Ev(name: String, regs: List[Int] = Nil, span: Option[(BigInt, BigInt)] = None) {
+          override def toString: String =
+            if (regs.nonEmpty) s"$name=" + regs.map("x" + _).mkString(",")
+            else span.map { case (lo, hi) => s"$name=0x${lo.toString(16)}-0x${hi.toString(16)}" }.getOrElse(name)
+        }
+        val EvNames = Set("stall", "flush", "fwd", "write", "store", "done")
+        var subs = List[Ev]()
+
+        def parseEv(text: String): Ev = text.toLowerCase.split("=", 2) match {
+          case Array(n) if EvNames.contains(n) => Ev(n)
+          case Array("write", a) =>
+            val rs = a.split(",").toList.map {
+              case RegKind(n) if n.length <= 2 && n.toInt < 32 => n.toInt
+              case _ => throw new IllegalArgumentException(s"bad register list $a")
+            }
+            Ev("write", regs = rs.distinct.sorted)
+          case Array("store", a) =>
+            val ends = a.split("-", 2).map(parseBigInt)
+            val span = (ends(0), ends.last)
+            if (span._1 > span._2) throw new IllegalArgumentException(s"empty address range $a")
+            Ev("store", span = Some(span))
+          case _ => throw new IllegalArgumentException(s"unknown event $text")
         }
+
+        def subCommand(args: List[String]): String = {
+          def names = subs.map(e => "\"" + e + "\"").mkString("[", ", ", "]")
+          try {
+            args match {
+              case "clear" :: Nil => subs = Nil
+              case Nil | "list" :: Nil =>
+              case evs => subs = evs.map(parseEv).distinct
+            }
+            s"""{"ack": "sub", "ok": true, "events": $names}"""
+          } catch {
+            case e: Throwable => s"""{"ack": "sub", "ok": false, "error": "${e.getMessage}", "events": $names}"""
+          }
+        }
+
+        // Does a subscribed event happen in this cycle? (peeks only what the subscription needs)
+        def eventHit(): Boolean = subs.exists(e => e.name match {
+          case "stall" => b(dut.io.dbg.if_stall) != 0 || b(dut.io.dbg.id_stall) != 0
+          case "flush" => b(dut.io.dbg.flush) != 0
+          case "fwd"   => b(dut.io.dbg.fwd_a_sel) != 0 || b(dut.io.dbg.fwd_b_sel) != 0
+          case "write" =>
+            val rd = b(dut.io.dbg.wb_rd).toInt
+            b(dut.io.dbg.wb_we) != 0 && rd != 0 && (e.regs.isEmpty || e.regs.contains(rd))
+          case "store" =>
+            // SW is encoded as 0 in memWrOpT
+            b(dut.io.dbg.mem_wr_op) == 0 && e.span.forall { case (lo, hi) =>
+              val a = b(dut.io.dbg.mem_addr)
+              lo <= a && a <= hi
+            }
+          case _ => b(dut.io.coreDone) != 0
+        })
+
         // 1. READ THE TEXT HEX FILE (ROM)
 
-        val romPath = "src/test/programs/BinaryFile"
+        val romPath = programPath
         val source = scala.io.Source.fromFile(romPath)
         val lines = try source.getLines().toList finally source.close()
 
@@ -76,157 +208,283 @@ class LivePipelineTest extends AnyFlatSpec with ChiselScalatestTester {
         romJson += "]"
 
 
-        try {
-          while (running) {
-
-            // 1. CAPTURE REGISTER FILE (The Hardware Truth)
-            // We peek into the internal memory of the Register File module
-            var regState = "{"
-            for (i <- 0 until 32) {
-              // Access internal signal: dut -> core -> RegFile_inst -> regfile
-              val rVal = b(dut.io.dbg.regs(i))
-              regState += s""""x$i": $rVal"""
-              if (i < 31) regState += ", "
-            }
-            regState += "}"
-
-            // 🔴 DEBUG TOOL: Print x1 directly to the terminal
-            val debug_x1 = b(dut.io.dbg.regs(1))
-            val debug_opA = b(dut.io.dbg.ex_alu_op_a)
-            println(s"Cycle: $cycle | x1: $debug_x1 | OpA: $debug_opA")
-            // -----------------------------------------------------
-
-            // 2. BUILD JSON
-            val jsonState =
-              s"""{
-              "cycle": $cycle,
-              "rom": ${if (cycle == 0) romJson else "[]"},
-              "coreDone": ${b(dut.io.coreDone)},
-              "gpRegVal": ${b(dut.io.gpRegVal)},
-              "result": ${b(dut.io.result)},
-              "regs": $regState,
-
-              "until": { "hit": $lastUntilHit, "steps": $lastUntilSteps },
-
-              "pc": {
-                "if": ${b(dut.io.dbg.if_pc)},
-                "id": ${b(dut.io.dbg.id_pc)},
-                "ex": ${b(dut.io.dbg.ex_pc)},
-                "mem": ${b(dut.io.dbg.mem_pc)},
-                "wb": ${b(dut.io.dbg.wb_pc)}
-              },
-
-              "instr": {
-                "if": ${b(dut.io.dbg.if_inst)},
-                "id": ${b(dut.io.dbg.id_inst)},
-                "ex": ${b(dut.io.dbg.ex_inst)},
-                "mem": ${b(dut.io.dbg.mem_inst)},
-                "wb": ${b(dut.io.dbg.wb_inst)}
-              },
-
-              "id": {
-                "rs1": ${b(dut.io.dbg.id_rs1)},
-                "rs2": ${b(dut.io.dbg.id_rs2)},
-                "rd": ${b(dut.io.dbg.id_rd)},
-                "we": ${b(dut.io.dbg.id_we)}
-              },
-
-              "hazard": {
-                "pc_write": ${b(dut.io.dbg.pc_write)},
-                "if_stall": ${b(dut.io.dbg.if_stall)},
-                "id_stall": ${b(dut.io.dbg.id_stall)},
-                "flush": ${b(dut.io.dbg.flush)}
-              },
-
-              "fwd": {
-                "a_sel": ${b(dut.io.dbg.fwd_a_sel)},
-                "b_sel": ${b(dut.io.dbg.fwd_b_sel)}
-              },
-
-              "ex": {
-                "alu_result": ${b(dut.io.dbg.ex_alu_result)},
-                "alu_op_a": ${b(dut.io.dbg.ex_alu_op_a)},
-                "alu_op_b": ${b(dut.io.dbg.ex_alu_op_b)},
-                "pc_src": ${b(dut.io.dbg.ex_pc_src)},
-                "pc_jb": ${b(dut.io.dbg.ex_pc_jb)},
-                "rd": ${b(dut.io.dbg.ex_rd)},
-                "we": ${b(dut.io.dbg.ex_we)},
-                "mem_rd_op": ${b(dut.io.dbg.ex_mem_rd_op)},
-                "mem_wr_op": ${b(dut.io.dbg.ex_mem_wr_op)},
-                "mem_to_reg": ${b(dut.io.dbg.ex_mem_to_reg)}
-              },
-
-              "mem": {
-                "addr": ${b(dut.io.dbg.mem_addr)},
-                "rd_op": ${b(dut.io.dbg.mem_rd_op)},
-                "wr_op": ${b(dut.io.dbg.mem_wr_op)},
-                "wdata": ${b(dut.io.dbg.mem_wdata)},
-                "rdata": ${b(dut.io.dbg.mem_rdata)},
-                "rd": ${b(dut.io.dbg.mem_rd)},
-                "we": ${b(dut.io.dbg.mem_we)},
-                "mem_to_reg": ${b(dut.io.dbg.mem_to_reg)}
-              },
-
-              "wb": {
-                "rd": ${b(dut.io.dbg.wb_rd)},
-                "we": ${b(dut.io.dbg.wb_we)},
-                "wdata": ${b(dut.io.dbg.wb_wdata)},
-                "check_res": ${b(dut.io.dbg.wb_check_res)}
+        // Snapshot fields, in the order of live_debug/wire.py (U32, then U8): the binary frame writes
+        // them in this order and the JSON line groups them by their first key ("" = top level)
+        case class F(group: String, key: String, sig: () => BigInt)
+        val u32Fields = Array(
+          F("", "gpRegVal", () => b(dut.io.gpRegVal)), F("", "result", () => b(dut.io.result)),
+          F("pc", "if", () => b(dut.io.dbg.if_pc)), F("pc", "id", () => b(dut.io.dbg.id_pc)),
+          F("pc", "ex", () => b(dut.io.dbg.ex_pc)), F("pc", "mem", () => b(dut.io.dbg.mem_pc)),
+          F("pc", "wb", () => b(dut.io.dbg.wb_pc)),
+          F("instr", "if", () => b(dut.io.dbg.if_inst)), F("instr", "id", () => b(dut.io.dbg.id_inst)),
+          F("instr", "ex", () => b(dut.io.dbg.ex_inst)), F("instr", "mem", () => b(dut.io.dbg.mem_inst)),
+          F("instr", "wb", () => b(dut.io.dbg.wb_inst)),
+          F("ex", "alu_result", () => b(dut.io.dbg.ex_alu_result)), F("ex", "alu_op_a", () => b(dut.io.dbg.ex_alu_op_a)),
+          F("ex", "alu_op_b", () => b(dut.io.dbg.ex_alu_op_b)), F("ex", "pc_jb", () => b(dut.io.dbg.ex_pc_jb)),
+          F("mem", "addr", () => b(dut.io.dbg.mem_addr)), F("mem", "wdata", () => b(dut.io.dbg.mem_wdata)),
+          F("mem", "rdata", () => b(dut.io.dbg.mem_rdata)), F("wb", "wdata", () => b(dut.io.dbg.wb_wdata)),
+          F("wb", "check_res", () => b(dut.io.dbg.wb_check_res)),
+          F("until", "steps", () => BigInt(lastUntilSteps)), F("until", "bp", () => BigInt(lastUntilBp)))
+        val u8Fields = Array(
+          F("", "coreDone", () => b(dut.io.coreDone)), F("until", "hit", () => BigInt(lastUntilHit)),
+          F("id", "rs1", () => b(dut.io.dbg.id_rs1)), F("id", "rs2", () => b(dut.io.dbg.id_rs2)),
+          F("id", "rd", () => b(dut.io.dbg.id_rd)), F("id", "we", () => b(dut.io.dbg.id_we)),
+          F("hazard", "pc_write", () => b(dut.io.dbg.pc_write)), F("hazard", "if_stall", () => b(dut.io.dbg.if_stall)),
+          F("hazard", "id_stall", () => b(dut.io.dbg.id_stall)), F("hazard", "flush", () => b(dut.io.dbg.flush)),
+          F("fwd", "a_sel", () => b(dut.io.dbg.fwd_a_sel)), F("fwd", "b_sel", () => b(dut.io.dbg.fwd_b_sel)),
+          F("ex", "pc_src", () => b(dut.io.dbg.ex_pc_src)), F("ex", "rd", () => b(dut.io.dbg.ex_rd)),
+          F("ex", "we", () => b(dut.io.dbg.ex_we)), F("ex", "mem_rd_op", () => b(dut.io.dbg.ex_mem_rd_op)),
+          F("ex", "mem_wr_op", () => b(dut.io.dbg.ex_mem_wr_op)), F("ex", "mem_to_reg", () => b(dut.io.dbg.ex_mem_to_reg)),
+          F("mem", "rd_op", () => b(dut.io.dbg.mem_rd_op)), F("mem", "wr_op", () => b(dut.io.dbg.mem_wr_op)),
+          F("mem", "rd", () => b(dut.io.dbg.mem_rd)), F("mem", "we", () => b(dut.io.dbg.mem_we)),
+          F("mem", "mem_to_reg", () => b(dut.io.dbg.mem_to_reg)),
+          F("wb", "rd", () => b(dut.io.dbg.wb_rd)), F("wb", "we", () => b(dut.io.dbg.wb_we)))
+        val fields = u32Fields ++ u8Fields
+        val layout = fields.indices.groupBy(i => fields(i).group).toSeq.sortBy(_._2.head)
+        val wbRdIdx = fields.indexWhere(f => f.group == "wb" && f.key == "rd")
+        val opAIdx  = fields.indexWhere(f => f.group == "ex" && f.key == "alu_op_a")
+
+        // Values of the current cycle, peeked once and shared by both modes
+        val cur = new Array[Long](fields.length)
+        val regCache = new Array[Long](32)
+        var regsValid = false
+        var lastSnapCycle = -1L
+        var lastWbRd = 0
+
+        def collect(): Unit = {
+          var i = 0
+          while (i < fields.length) { cur(i) = fields(i).sig().toLong; i += 1 }
+          // One cycle after the last snapshot only the register written back then (or now) can differ
+          if (regsValid && cycle == lastSnapCycle + 1) {
+            for (r <- Seq(lastWbRd, cur(wbRdIdx).toInt) if r > 0 && r < 32) regCache(r) = b(dut.io.dbg.regs(r)).toLong
+          } else {
+            for (r <- 0 until 32) regCache(r) = b(dut.io.dbg.regs(r)).toLong
+            regsValid = true
+          }
+          lastSnapCycle = cycle
+          lastWbRd = cur(wbRdIdx).toInt
+
+          // 🔴 DEBUG TOOL: Print x1 directly to the terminal (LIVE_TRACE=1)
+          if (traceCycles) println(s"Cycle: $cycle | x1: ${regCache(1)} | OpA: ${cur(opAIdx)}")
+        }
+
+        // Builds the JSON line for the current cycle (one reused builder, no regex clean-up)
+        val sb = new java.lang.StringBuilder(2048)
+        def snapshotJson(): String = {
+          collect()
+          sb.setLength(0)
+          sb.append("{\"cycle\": ").append(cycle)
+          sb.append(", \"rom\": ").append(if (cycle == 0 || romPending) romJson else "[]")
+          for ((group, idx) <- layout) {
+            if (group.isEmpty) idx.foreach(i => sb.append(", \"").append(fields(i).key).append("\": ").append(cur(i)))
+            else {
+              sb.append(", \"").append(group).append("\": {")
+              for ((i, k) <- idx.zipWithIndex) {
+                if (k > 0) sb.append(", ")
+                sb.append('"').append(fields(i).key).append("\": ").append(cur(i))
               }
-            }""".replaceAll("\n", " ").replaceAll("\\s+", " ").trim
-
-            out.println(jsonState)
-
-            val cmdLine = in.readLine()
-            if (cmdLine == null) {
-              running = false
-              println("🟧 [CHISEL] Python disconnected.")
-            } else {
-              val cmd = cmdLine.trim
-              if (cmd.nonEmpty) {
-                val parts = cmd.split("\\s+").toList
-                parts.head match {
-                  case "quit" => running = false
-                  case "step" =>
-                    lastUntilHit = 0
-                    lastUntilSteps = 0
-                    dut.clock.step(1)
-                    cycle += 1
-                  case "run" =>
-                    lastUntilHit = 0
-                    lastUntilSteps = 0
-                    val n = if (parts.length >= 2) parts(1).toInt else 1
-                    if (n > 0) { dut.clock.step(n); cycle += n }
-                  case "reset" =>
-                    lastUntilHit = 0
-                    lastUntilSteps = 0
-                    dut.reset.poke(true.B)
-                    dut.clock.step(1)
-                    dut.reset.poke(false.B)
-                    cycle = 0
-                  case "until" =>
-                    if (parts.length >= 3) {
-                      val kind  = parts(1)
-                      val value = parseBigInt(parts(2))
-                      val max   = if (parts.length >= 4) parts(3).toInt else 10000
-                      var i = 0
-                      var hit = false
-                      while (i < max && !hit) {
+              sb.append('}')
+            }
+          }
+          sb.append(", \"regs\": {")
+          for (r <- 0 until 32) {
+            if (r > 0) sb.append(", ")
+            sb.append("\"x").append(r).append("\": ").append(regCache(r))
+          }
+          sb.append("}}").toString
+        }
+
+        // Binary mode (`proto binary`, see live_debug/wire.py): u32 length | u8 kind | payload, little-endian.
+        // A snapshot frame carries only the registers that changed since the last frame sent.
+        val frame = java.nio.ByteBuffer.allocate(5 + 8 + 4 * u32Fields.length + u8Fields.length + 4 + 4 * 32)
+          .order(java.nio.ByteOrder.LITTLE_ENDIAN)
+        val sentRegs = new Array[Long](32)
+        var regsSynced = false      // false: the next frame sends all 32 registers
+        var binary = false
+        var switchTo: String = null // mode taking effect after the `proto` ack went out
+
+        def snapshotBinary(): Unit = {
+          collect()
+          frame.clear()
+          frame.putInt(0).put(0.toByte).putLong(cycle)
+          for (i <- u32Fields.indices) frame.putInt(cur(i).toInt)
+          for (i <- u8Fields.indices) frame.put(cur(u32Fields.length + i).toByte)
+          var mask = 0
+          for (r <- 0 until 32) if (!regsSynced || regCache(r) != sentRegs(r)) mask |= 1 << r
+          frame.putInt(mask)
+          for (r <- 0 until 32) if ((mask >>> r & 1) != 0) { frame.putInt(regCache(r).toInt); sentRegs(r) = regCache(r) }
+          regsSynced = true
+          frame.putInt(0, frame.position() - 4)
+        }
+
+        var rawOut: BufferedOutputStream = null
+        var out: PrintWriter = null
+
+        // Acks and other non-snapshot messages: a JSON line, or a kind-1 frame in binary mode
+        def emit(json: String): Unit = {
+          if (!binary) out.println(json)
+          else {
+            val bytes = json.getBytes("UTF-8")
+            val head = java.nio.ByteBuffer.allocate(5).order(java.nio.ByteOrder.LITTLE_ENDIAN)
+            head.putInt(bytes.length + 1).put(1.toByte)
+            rawOut.write(head.array); rawOut.write(bytes)
+          }
+        }
+
+        def emitSnapshot(): Unit =
+          if (binary) { snapshotBinary(); rawOut.write(frame.array, 0, frame.position()) }
+          else out.println(snapshotJson())
+
+        try {
+          while (serving) {
+            println(s"\n🟦 [CHISEL] Waiting for Python on port $livePort...")
+            val client = server.accept()
+            println("🟩 [CHISEL] Connected! Starting Loop...")
+            val in  = new BufferedReader(new InputStreamReader(client.getInputStream))
+            rawOut = new BufferedOutputStream(client.getOutputStream, 1 << 16)
+            out = new PrintWriter(new BufferedWriter(new OutputStreamWriter(rawOut, "UTF-8")), false)
+            running = true
+            reply = null
+            romPending = true   // a reconnecting client gets the ROM with its first snapshot
+            binary = false      // and starts in JSON mode until it asks for `proto binary`
+            regsSynced = false
+            try {
+              while (running) {
+
+                if (reply != null) emit(reply) else emitSnapshot()
+                out.flush()
+                reply = null
+                romPending = false
+                if (switchTo != null) { binary = switchTo == "binary"; regsSynced = false; switchTo = null }
+
+                val cmdLine = in.readLine()
+                if (cmdLine == null) {
+                  running = false
+                  println("🟧 [CHISEL] Python disconnected.")
+                } else {
+                  val cmd = cmdLine.trim
+                  if (cmd.nonEmpty) {
+                    val parts = cmd.split("\\s+").toList
+                    parts.head match {
+                      case "quit" => running = false; serving = false
+                      case "step" =>
+                        lastUntilHit = 0
+                        lastUntilSteps = 0
+                        lastUntilBp = 0
                         dut.clock.step(1)
                         cycle += 1
-                        hit = breakpointHit(kind, value)
-                        i += 1
-                      }
-                      lastUntilHit = if (hit) 1 else 0
-                      lastUntilSteps = i
+                      case "run" =>
+                        lastUntilHit = 0
+                        lastUntilSteps = 0
+                        lastUntilBp = 0
+                        val n = if (parts.length >= 2) parts(1).toInt else 1
+                        if (n > 0) { dut.clock.step(n); cycle += n }
+                      case "batch" =>
+                        // batch <n> [every]: advance n cycles, streaming every k-th snapshot.
+                        // The last one is sent by the loop head, so n/k (rounded up) lines come back in total.
+                        lastUntilHit = 0
+                        lastUntilSteps = 0
+                        lastUntilBp = 0
+                        val n     = if (parts.length >= 2) parts(1).toInt else 1
+                        val every = if (parts.length >= 3) math.max(1, parts(2).toInt) else 1
+                        var i = 1
+                        while (i <= n) {
+                          dut.clock.step(1)
+                          cycle += 1
+                          if (i < n && i % every == 0) emitSnapshot()
+                          i += 1
+                        }
+                      case "reset" =>
+                        lastUntilHit = 0
+                        lastUntilSteps = 0
+                        lastUntilBp = 0
+                        dut.reset.poke(true.B)
+                        dut.clock.step(1)
+                        dut.reset.poke(false.B)
+                        cycle = 0
+                        regsValid = false
+                      case "until" if parts.length >= 2 && parts(1) == "bp" =>
+                        // until bp [max]: run until any breakpoint fires
+                        val max = if (parts.length >= 3) parts(2).toInt else 10000
+                        var i = 0
+                        var fired = 0
+                        while (i < max && fired == 0) {
+                          dut.clock.step(1)
+                          cycle += 1
+                          fired = checkBps()
+                          i += 1
+                        }
+                        lastUntilHit = if (fired != 0) 1 else 0
+                        lastUntilSteps = i
+                        lastUntilBp = fired
+                      case "until" =>
+                        if (parts.length >= 3) {
+                          val kind  = parts(1)
+                          val value = parseBigInt(parts(2))
+                          val max   = if (parts.length >= 4) parts(3).toInt else 10000
+                          var i = 0
+                          var hit = false
+                          while (i < max && !hit) {
+                            dut.clock.step(1)
+                            cycle += 1
+                            hit = breakpointHit(kind, value)
+                            i += 1
+                          }
+                          lastUntilHit = if (hit) 1 else 0
+                          lastUntilSteps = i
+                          lastUntilBp = 0
+                        }
+                      case "bp" =>
+                        reply = bpCommand(parts.tail)
+                      case "sub" =>
+                        reply = subCommand(parts.tail)
+                      case "go" =>
+                        // go [max] [heartbeat]: run freely, streaming only the cycles with a subscribed event,
+                        // every heartbeat-th cycle and the last one; stops early when the core finishes.
+                        // The loop head then sends the ack instead of a snapshot.
+                        lastUntilHit = 0
+                        lastUntilSteps = 0
+                        lastUntilBp = 0
+                        val max = if (parts.length >= 2) parts(1).toInt else 100000
+                        val hb  = if (parts.length >= 3) parts(2).toInt else 10000
+                        val wasDone = b(dut.io.coreDone) != 0
+                        var i = 0
+                        var events = 0
+                        var done = false
+                        while (i < max && !done) {
+                          dut.clock.step(1)
+                          cycle += 1
+                          i += 1
+                          done = !wasDone && b(dut.io.coreDone) != 0
+                          val hit = eventHit()
+                          if (hit) events += 1
+                          val beat = hb > 0 && i % hb == 0
+                          if ((hit || beat) && i < max && !done) emitSnapshot()
+                          if (beat) out.flush()      // heartbeats reach the client while the run goes on
+                        }
+                        emitSnapshot()
+                        reply = s"""{"ack": "go", "ok": true, "steps": $i, "events": $events, "done": ${if (done) 1 else 0}}"""
+                      case "proto" =>
+                        // proto binary|json: acked in the current mode (with the ROM), then switched
+                        parts.tail match {
+                          case m :: Nil if m == "binary" || m == "json" =>
+                            reply = s"""{"ack": "proto", "ok": true, "mode": "$m", "rom": $romJson}"""
+                            switchTo = m
+                          case _ =>
+                            val mode = if (binary) "binary" else "json"
+                            reply = s"""{"ack": "proto", "ok": false, "error": "usage: proto binary|json", "mode": "$mode"}"""
+                        }
+                      case _ => // ignore
                     }
-                  case _ => // ignore
+                  }
                 }
               }
+            } finally {
+              out.close(); in.close(); client.close()
             }
           }
         } finally {
-          out.close(); in.close(); client.close(); server.close()
+          server.close()
         }
       }
   }
@@ -0,0 +1,4 @@
+import os
+
+# No raw packet log from the test simulators (packet_log reads this once, on import)
+os.environ["CHISEL_PACKET_LOG"] = ""
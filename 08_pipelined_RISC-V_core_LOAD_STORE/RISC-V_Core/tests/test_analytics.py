@@ -0,0 +1,85 @@
+import numpy as np
+from live_debug.analytics import COLUMNS, ColumnBuffer, analyze, vcd_columns
+
+ADD = 0x002081B3
+
+
+def run_columns():
+    """Ten cycles: a load-use stall at 3 (load at PC 0 in EX), a taken branch at PC 8 flushing 6-7, done at 8."""
+    rows = {
+        "pc.wb":           [0, 0, 0, 0, 0, 4, 0, 8, 12, 0],
+        "instr.wb":        [0x13, 0x13, 0x13, 0x13, ADD, ADD, 0x13, ADD, ADD, 0x13],
+        "pc.ex":           [0, 0, 0, 0, 4, 8, 8, 0, 0, 0],
+        "pc.id":           [0, 0, 0, 4, 4, 8, 0, 0, 0, 0],
+        "hazard.id_stall": [0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+        "hazard.flush":    [0, 0, 0, 0, 0, 0, 1, 1, 0, 0],
+        "fwd.a_sel":       [0, 1, 2, 0, 0, 1, 0, 0, 0, 0],
+        "coreDone":        [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
+    }
+    snaps = []
+    for c in range(10):
+        s = {"cycle": c, "pc": {}, "instr": {}, "hazard": {}, "fwd": {}}
+        for name, values in rows.items():
+            parent, _, key = name.rpartition(".")
+            if parent: s[parent][key] = values[c]
+            else: s[key] = values[c]
+        snaps.append(s)
+    return snaps
+
+
+def test_cpi_and_attribution():
+    r = analyze(ColumnBuffer().extend(run_columns()).columns(), rom=[0x13, ADD, 0x00208463])
+    assert (r["records"], r["retired"], r["done"]) == (9, 4, True)          # stops at coreDone
+    assert r["cpi"] == 9 / 4
+    assert (r["stall_cycles"], r["flush_cycles"], r["flushes"]) == (1, 2, 1)
+    assert r["forwarding"]["a"] == {"id": 6, "mem": 2, "wb": 1}
+    top = r["hotspots"][0]
+    assert (top["pc"], top["flush_cycles"], top["asm"].split()[0]) == (8, 2, "beq")
+    load = next(h for h in r["hotspots"] if h["pc"] == 0)
+    assert (load["stall_cycles"], load["executed"]) == (1, 1)
+    assert next(h for h in r["hotspots"] if h["pc"] == 4)["waited_cycles"] == 1
+
+
+def test_column_buffer_follows_eviction():
+    buf = ColumnBuffer(capacity=2).extend(run_columns())
+    buf.evict(4)
+    cols = buf.columns()
+    assert len(buf) == 6 and list(cols["cycle"]) == list(range(4, 10))
+    assert set(cols) == set(COLUMNS)
+
+
+def test_vcd_is_sampled_at_rising_edges(tmp_path):
+    vcd = tmp_path / "dut.vcd"
+    vcd.write_text("""$scope module PipelinedRV32I $end
+$var wire 1 ! clock $end
+$var wire 1 " io_dbg_flush $end
+$var wire 32 # io_dbg_ex_pc $end
+$scope module core $end
+$var wire 32 $ io_dbg_ex_pc $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+0"
+b0 #
+b1111 $
+#1
+1!
+#2
+0!
+1"
+b1000 #
+#3
+1!
+#4
+0!
+0"
+#5
+1!
+""")
+    cols = vcd_columns(str(vcd))
+    assert list(cols["cycle"]) == [0, 1, 2]
+    assert list(cols["hazard.flush"]) == [0, 1, 0]
+    assert list(cols["pc.ex"]) == [0, 8, 8]
+    assert cols["fwd.a_sel"].dtype == np.uint8
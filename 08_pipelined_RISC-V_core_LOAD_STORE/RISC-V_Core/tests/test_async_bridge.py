@@ -0,0 +1,192 @@
+import asyncio
+import json
+import pytest
+from web_visualizer.async_bridge import AsyncChiselBridge
+from live_debug.breakpoints import BreakpointSet
+
+
+class FakeChisel:
+    """Local asyncio TCP server speaking the LivePipelineTest line protocol."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.commands = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def state(self, cycle, until=None):
+        return {"cycle": cycle, "pc": {"if": 4 * cycle}, "regs": {"x1": cycle // 10}, "until": until or {}}
+
+    def snap(self, cycle, until=None):
+        return (json.dumps(self.state(cycle, until)) + "\n").encode()
+
+    async def handle(self, reader, writer):
+        cycle, reply, until = 0, None, None
+        bps = BreakpointSet()
+        while True:
+            writer.write(reply or self.snap(cycle, until))
+            reply, until = None, None
+            await writer.drain()
+            line = await reader.readline()
+            if not line: break
+            parts = line.decode().split()
+            self.commands.append(parts[0])
+            if parts[0] == "quit": break
+            if parts[0] == "hang":
+                await asyncio.sleep(3600)
+            if parts[0] == "step": cycle += 1
+            elif parts[0] == "reset": cycle = 0
+            elif parts[0] == "bp": reply = (json.dumps(bps.command(parts[1:])) + "\n").encode()
+            elif parts[0] == "until" and parts[1] == "bp":
+                fired, steps = 0, 0
+                while not fired and steps < int(parts[2]):
+                    cycle += 1
+                    steps += 1
+                    fired = bps.check(self.state(cycle))
+                until = {"hit": int(bool(fired)), "steps": steps, "bp": fired}
+            elif parts[0] == "batch":
+                n, every = int(parts[1]), int(parts[2])
+                for i in range(1, n + 1):
+                    cycle += 1
+                    if i < n and i % every == 0: writer.write(self.snap(cycle))
+                await asyncio.sleep(self.delay)
+        writer.close()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 20))
+
+
+def test_connect_step_and_reset():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port)
+        assert (await bridge.connect())["cycle"] == 0
+        assert [s["cycle"] for s in await bridge.step(1)] == [1]
+        assert [s["cycle"] for s in await bridge.step(3)] == [2, 3, 4]
+        assert (await bridge.reset())["cycle"] == 0
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_long_run_is_batched_and_ordered():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port, max_in_flight=2)
+        await bridge.connect()
+        snaps = await bridge.step(2000)
+        assert [s["cycle"] for s in snaps] == list(range(1, 2001))
+        sparse = await bridge.step(1000, every=100)
+        assert [s["cycle"] for s in sparse] == list(range(2100, 3001, 100))
+        assert "step" not in fake.commands
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_event_loop_keeps_running_during_a_run():
+    async def main():
+        fake = await FakeChisel(delay=0.05).start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port)
+        await bridge.connect()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        t = asyncio.create_task(ticker())
+        await bridge.step(5000)
+        t.cancel()
+        assert ticks >= 10
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_concurrent_commands_are_queued_in_order():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port, max_in_flight=1)
+        await bridge.connect()
+        results = await asyncio.gather(*(bridge.step(1) for _ in range(20)))
+        assert [r[0]["cycle"] for r in results] == list(range(1, 21))
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_timeout_fails_the_command_and_reconnects():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port, timeout=0.2)
+        await bridge.connect()
+        with pytest.raises(asyncio.TimeoutError):
+            await bridge.request("hang")
+        assert not bridge.connected
+        assert [s["cycle"] for s in await bridge.step(1)] == [1]
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_connect_gives_up_after_connect_timeout():
+    async def main():
+        fake = await FakeChisel().start()
+        port = fake.port
+        await fake.stop()
+        bridge = AsyncChiselBridge("127.0.0.1", port, connect_timeout=0.5)
+        with pytest.raises(TimeoutError):
+            await bridge.connect()
+    run(main())
+
+
+def test_breakpoints_run_in_the_simulator():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port)
+        await bridge.connect()
+        ack = await bridge.bp("add if_pc == 0x40 1")
+        assert ack["ok"] and ack["id"] == 1
+        assert (await bridge.bp("add x1 >= 3 2"))["id"] == 2
+        assert bridge.get_latest()["cycle"] == 0          # acks are not snapshots
+        snap = await bridge.until_bp(1000)
+        assert (snap["cycle"], snap["until"]["bp"]) == (16, 1)
+        snap = await bridge.until_bp(1000)                # x1 >= 3 from cycle 30, fires on its 2nd hit
+        assert (snap["cycle"], snap["until"]["bp"], snap["until"]["steps"]) == (31, 2, 15)
+        assert not (await bridge.bp("del 7"))["ok"]
+        assert (await bridge.bp("clear"))["bps"] == []
+        snap = await bridge.until_bp(50)
+        assert snap["until"] == {"hit": 0, "steps": 50, "bp": 0}
+        await bridge.close()
+        await fake.stop()
+    run(main())
+
+
+def test_timeout_reports_the_timeout_of_the_call_and_a_reconnect_reports_its_hello():
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port, timeout=30)
+        hellos = []
+        bridge.on_hello = hellos.append
+        await bridge.connect()
+        assert hellos == []                               # only connections a command had to make
+        queued = await bridge.submit("hang")
+        with pytest.raises(asyncio.TimeoutError):
+            await bridge.request("step", timeout=0.2)
+        assert "within 0.2s" in str(queued.exception())
+        assert [s["cycle"] for s in await bridge.step(1)] == [1]
+        assert [h["cycle"] for h in hellos] == [0]
+        await bridge.close()
+        await fake.stop()
+    run(main())
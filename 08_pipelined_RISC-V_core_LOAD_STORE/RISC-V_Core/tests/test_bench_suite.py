@@ -0,0 +1,45 @@
+import numpy as np
+from benchmarks import suite
+from benchmarks.synthetic import synthetic_records, write_trace, write_vcd
+from live_debug.analytics import trace_columns, vcd_columns
+from live_debug.trace import TraceReader
+
+
+def test_synthetic_vcd_and_trace_hold_the_same_cycles(tmp_path):
+    rec = synthetic_records(300)
+    cols = vcd_columns(write_vcd(str(tmp_path / "run.vcd"), 300))
+    assert len(cols["cycle"]) == 300
+    for name in ("pc.id", "pc.wb", "instr.wb", "hazard.id_stall", "hazard.flush", "fwd.a_sel"):
+        assert np.array_equal(cols[name], rec[name]), name
+    r = TraceReader(write_trace(str(tmp_path / "run.rvt"), 300))
+    assert len(r) == 300 and np.array_equal(trace_columns(r)["pc.wb"], rec["pc.wb"])
+    assert np.array_equal(synthetic_records(100, 200), rec[200:])        # blocks line up
+
+
+def test_regressions_against_the_baseline(tmp_path):
+    base = {"decode": {"cycles_per_s": 1000, "p50_us": 10.0, "p90_us": 20.0, "peak_kib": 100.0},
+            "vcd": {"skipped": "07_VCD not found"}}
+    same = {"decode": {"cycles_per_s": 900, "p50_us": 11.0, "p90_us": 24.0, "peak_kib": 150.0},
+            "vcd": {"cycles_per_s": 1}, "emit": {"cycles_per_s": 1}}                # new/skipped: no verdict
+    assert suite.compare(same, base, 0.25) == []
+    slow = {"decode": {"cycles_per_s": 700, "p50_us": 13.0, "p90_us": 20.0, "peak_kib": 400.0}}
+    assert suite.compare(slow, base, 0.25) == [("decode", "cycles_per_s", 1000, 700), ("decode", "p50_us", 10.0, 13.0),
+                                               ("decode", "peak_kib", 100.0, 400.0)]
+
+    path = str(tmp_path / "baselines.json")
+    suite.save_baseline(path, "quick", base)
+    suite.save_baseline(path, "quick", {"decode": slow["decode"]})        # --only refreshes one component
+    stored = suite.load_baselines(path)["quick"]
+    assert stored["results"]["decode"] == slow["decode"] and "vcd" in stored["results"]
+    assert stored["meta"]["python"]
+
+
+def test_a_quick_run_of_the_cheap_components(tmp_path, monkeypatch):
+    monkeypatch.setattr(suite, "PROFILES", {"quick": dict.fromkeys(suite.COMPONENTS, 50)})
+    monkeypatch.setattr(suite, "SAMPLE", 20)
+    out = str(tmp_path / "results.json")
+    assert suite.main(["--quick", "--only", "decode,render", "--repeat", "1", "--baseline", str(tmp_path / "none.json"),
+                       "--json", out]) == 0
+    rows = suite.load_baselines(out)["results"]
+    assert rows["decode"]["n"] == 50 and rows["render"]["cycles_per_s"] > 0
+    assert rows["decode"]["p50_us"] <= rows["decode"]["p99_us"]
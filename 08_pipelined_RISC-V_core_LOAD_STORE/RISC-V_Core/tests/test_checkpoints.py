@@ -0,0 +1,103 @@
+import asyncio
+from live_debug.checkpoints import Checkpoints, plan
+from live_debug.client import LiveClient
+from live_debug.history import SnapshotHistory
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+from web_visualizer.async_bridge import AsyncChiselBridge
+from web_visualizer.session import Session
+
+
+def recorded_run(tmp_path, n=5000):
+    """A deterministic `simulator`: every cycle of the replayed trace has its own state."""
+    with TraceWriter(str(tmp_path / "run.rvt"), rom=[0x13]) as w:
+        for c in range(n):
+            w.append({"cycle": c, "pc": {"if": 4 * c % 256}, "regs": {"x1": 3 * c, "x2": c // 7}})
+    return ReplayServer(str(tmp_path / "run.rvt"), "127.0.0.1", 0).start()
+
+
+def test_plans_and_the_checkpoint_log():
+    assert plan([5, 6, 7, 20], 100) == [("reset", 0), ("run", 5), ("batch", 2), ("run", 13)]
+    assert plan([0, 1, 2], None) == [("reset", 0), ("batch", 2)]       # the reset reply is cycle 0
+    assert plan([100], 100) == [("run", 0)] and plan([150, 151], 100) == [("run", 50), ("batch", 1)]
+
+    cp = Checkpoints()
+    assert [cp.add({"cycle": c, "regs": {"x1": c}}) for c in (0, 1, 2, 10)] == [None] * 4
+    assert cp.add({"cycle": 1, "regs": {"x1": 1}, "until": {"hit": 1}}) is True    # `until` is not state
+    assert cp.add({"cycle": 2, "regs": {"x1": 99}}) is False and cp.diverged == [2]
+    assert cp.add({"cycle": 5}) is None and cp.cycles.tolist() == [0, 1, 2, 5, 10]
+    assert cp.before(5) == 3 and cp.position(4) is None
+    assert cp.window(3, -1, size=2) == [2, 5] and cp.window(3, 1, size=2) == [5, 10]
+
+
+def test_live_client_rebuilds_evicted_and_pre_reset_cycles(tmp_path):
+    server = recorded_run(tmp_path)
+    cl = LiveClient("127.0.0.1", server.server_address[1], max_history_mb=None)
+    cl.history = SnapshotHistory(keyframe_every=16, max_bytes=20_000)
+    cl.connect()
+    cl.hello()
+    cl.fast_forward(3000)
+    start = cl.history.start
+    assert start > 500 and cl.history[start]["cycle"] == start
+
+    cl.view_idx = start
+    cl.step_delta(-10)                                  # past the oldest kept cycle: replayed from reset
+    assert cl.view_cycle == start - 10 and cl.displaced is not None
+    s, ok = cl.rebuilt[start - 10]
+    assert ok and s["regs"]["x1"] == 3 * (start - 10) and "Rebuilt" in cl.message
+    assert any("REBUILT" in line for line in cl.frame())
+    cl.step_delta(20)                                   # and back into the history
+    assert cl.view_cycle is None and cl.view_idx == start + 10
+
+    cl.step_delta(3000 - cl.view_idx + 1)               # stepping on first returns to the live head
+    assert cl.displaced is None and cl.history[-1]["cycle"] == 3001
+
+    cl.reset()
+    cl.fast_forward(50)
+    cl.goto(2500)                                       # only seen before the reset
+    assert cl.view_cycle == 2500 and cl.rebuilt[2500][1]
+    cl.goto(45)
+    assert cl.view_cycle is None and cl.history[cl.view_idx]["cycle"] == 45
+    cl.checkpoints.hashes[cl.checkpoints.position(1200)] ^= 1     # as if that cycle had come out differently
+    cl.goto(1200)
+    assert not cl.rebuilt[1200][1] and "differ" in cl.message
+    cl.fast_forward(5)
+    assert [cl.history[i]["cycle"] for i in range(len(cl.history) - 3, len(cl.history))] == [53, 54, 55]
+    cl.goto(999999)
+    assert "never recorded" in cl.message
+    cl.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_viewers_go_back_past_eviction_and_reset(tmp_path):
+    server = recorded_run(tmp_path)
+
+    async def main():
+        session = Session(AsyncChiselBridge("127.0.0.1", server.server_address[1]))
+        session.history = SnapshotHistory(keyframe_every=16, max_bytes=20_000)
+        await session.join("a")
+        await session.join("b")
+        await session.extend_to(2000)
+        start = session.history.start
+        assert start > 0
+        session.cursors["a"], session.cursors["b"] = start, session.head
+        await session.move("a", -3)
+        assert session.past["a"] == start - 3 and session.snapshot("a")["regs"]["x1"] == 3 * (start - 3)
+        assert session.snapshot("b")["cycle"] == 2000          # the other viewer stays on the live head
+        await session.move("b", 1)                             # which moves on from where it was
+        assert session.head == 2001 and session.displaced is None and session.snapshot("b")["cycle"] == 2001
+        await session.move("a", 5)
+        assert "a" not in session.past and session.snapshot("a")["cycle"] == start + 2
+
+        await session.reset()
+        r = await session.goto("a", 1500)
+        assert r == {"found": True, "cycle": 1500, "rebuilt": True, "verified": True}
+        assert (await session.goto("a", 0))["rebuilt"] is False and "a" not in session.past
+        assert (await session.goto("a", 10**6))["found"] is False
+        await session.move("a", 3)
+        assert session.history[session.head]["cycle"] == 3 and session.snapshot("a")["cycle"] == 3
+        await session.bridge.close()
+    asyncio.run(asyncio.wait_for(main(), 20))
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,16 @@
+import io
+import json
+import pytest
+from live_debug.client import LiveClient
+
+
+def test_undecodable_lines_are_skipped_but_store_errors_surface(monkeypatch):
+    cl = LiveClient("127.0.0.1", 0)
+    snap = json.dumps({"cycle": 3, "pc": {"if": 12}, "regs": {"x1": 1}}).encode()
+    cl.f = io.BytesIO(b"Cycle: 3 | x1: 1\n" + snap + b"\n" + snap + b"\n")
+    assert cl.recv_snapshot()["cycle"] == 3 and len(cl.history) == 1
+
+    def broken(s): raise KeyError("regs")
+    monkeypatch.setattr(cl, "store", broken)
+    with pytest.raises(KeyError):                 # not swallowed, and not waiting for another reply
+        cl.recv_snapshot()
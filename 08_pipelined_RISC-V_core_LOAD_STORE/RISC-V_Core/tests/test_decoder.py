@@ -0,0 +1,61 @@
+import random
+import numpy as np
+from benchmarks import legacy_decoder
+from live_debug import decoder
+from live_debug.decoder import DECODE_CACHE_SIZE, OPCODES, decode_array, decode_rom, decode_rv32i
+
+
+def words(opcode, n=2000, seed=0):
+    """Random instruction words of one opcode (every funct3/funct7/register/immediate)."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(25) << 7 | opcode for _ in range(n)]
+
+
+def expected(w):
+    """The original decoder's text, except for the OP_IMM words it printed as "opimm?", which are named now."""
+    old = legacy_decoder.decode_rv32i(w)
+    if old != "opimm?": return old
+    rd, f3, rs1, rs2, f7 = (w >> 7) & 0x1F, (w >> 12) & 0x7, (w >> 15) & 0x1F, (w >> 20) & 0x1F, w >> 25
+    imm = ((w >> 20) & 0xFFF) - (0x1000 if w >> 31 else 0)
+    name = {(2, None): "slti", (3, None): "sltiu", (1, 0x00): "slli", (5, 0x00): "srli", (5, 0x20): "srai"}
+    if f3 in (2, 3): return f"{name[f3, None]} x{rd}, x{rs1}, {imm}"
+    return f"{name[f3, f7]} x{rd}, x{rs1}, {rs2}" if (f3, f7) in name else "opimm?"
+
+
+def test_every_opcode_class_matches_the_original_decoder():
+    decoder.clear_cache()
+    renamed = 0
+    for name, op in OPCODES.items():
+        for w in words(op):
+            assert decode_rv32i(w) == expected(w), (name, hex(w))
+            renamed += legacy_decoder.decode_rv32i(w) == "opimm?" != decode_rv32i(w)
+    rng = random.Random(3)
+    every_funct = [f7 << 25 | rng.getrandbits(10) << 15 | f3 << 12 | rng.getrandbits(5) << 7 | OPCODES["OP_IMM"]
+                   for f3 in range(8) for f7 in range(128)]     # rs2/shamt and rs1 random
+    for w in words(0x73) + words(0x0F) + every_funct + [random.Random(1).getrandbits(32) for _ in range(5000)]:
+        assert decode_rv32i(w) == expected(w), hex(w)
+    assert renamed > 500                    # slti/sltiu and the shifts are checked, not skipped
+
+
+def test_immediate_compares_and_shifts_are_named():
+    # what the original decoder printed as "opimm?"
+    assert decode_rv32i(0xFFF0A113) == "slti x2, x1, -1"
+    assert decode_rv32i(0x0050B193) == "sltiu x3, x1, 5"
+    assert decode_rv32i(0x00309093) == "slli x1, x1, 3"
+    assert decode_rv32i(0x01C0D193) == "srli x3, x1, 28"
+    assert decode_rv32i(0x4010D113) == "srai x2, x1, 1"
+    assert decode_rv32i(0x0200D113) == "opimm?"          # funct7 of neither shift
+
+
+def test_cache_full_and_bulk_apis():
+    decoder.clear_cache()
+    ws = words(OPCODES["OP"], DECODE_CACHE_SIZE + 100, seed=2)
+    got = [decode_rv32i(w) for w in ws]             # fills the cache and drops it once
+    assert 0 < len(decoder._cache) <= DECODE_CACHE_SIZE
+    assert got == [legacy_decoder.decode_rv32i(w) for w in ws]
+    assert [decode_rv32i(w) for w in ws] == got     # hits and misses after the drop agree
+
+    arr = np.array(ws[:300] * 3, dtype=np.uint32).reshape(9, 100)
+    assert decode_array(arr).tolist() == np.array(got[:300] * 3, dtype=object).reshape(9, 100).tolist()
+    assert decode_rv32i(0x13) == "nop" and decode_rv32i(0xFFFFFFFF) == "unknown"
+    assert decode_rom(["0x00000013", 0x00A00093], base=0x100) == {0x100: "nop", 0x104: "addi x1, x0, 10"}
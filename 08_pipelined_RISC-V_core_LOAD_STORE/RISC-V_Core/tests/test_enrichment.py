@@ -0,0 +1,33 @@
+import copy
+from collections import OrderedDict
+from types import SimpleNamespace
+from benchmarks.fake_chisel import make_snapshot
+from web_visualizer import server
+
+
+def test_packets_share_the_raw_snapshot_without_changing_it():
+    raw = make_snapshot(0)
+    before = copy.deepcopy(raw)
+    p = server.process_snapshot(raw)
+    assert raw == before and p["raw"] is raw
+    e = p["enriched"]
+    assert e["pc"] is raw["pc"] and e["regs"] is raw["regs"]            # untouched parts are shared
+    assert e["ex"] is not raw["ex"] and e["ex"]["val_a"] == raw["ex"]["alu_op_a"]
+    assert e["asm"]["if"] and len(e["rom_asm"]) == len(raw["rom"]) and len(p["registers"]) == 32
+
+
+def test_packets_are_memoised_per_epoch_and_index(monkeypatch):
+    session = SimpleNamespace(epoch=0, history=[make_snapshot(c) for c in range(10)])
+    monkeypatch.setattr(server, "session", session)
+    monkeypatch.setattr(server, "_packets", OrderedDict())
+    monkeypatch.setattr(server, "PACKET_CACHE_SIZE", 3)
+    built = []
+    process = server.process_snapshot
+    monkeypatch.setattr(server, "process_snapshot", lambda s: built.append(s["cycle"]) or process(s))
+
+    first = server.packet_at(4)
+    assert server.packet_at(4) is first and built == [4]                # shared by every viewer
+    for i in (5, 6, 4, 7): server.packet_at(i)                          # 4 was used again: 5 goes
+    assert list(server._packets) == [(0, 6), (0, 4), (0, 7)] and built == [4, 5, 6, 7]
+    session.epoch = 1                                                   # after a reset, index 4 is another cycle
+    assert server.packet_at(4) is not first and built[-1] == 4
@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from web_visualizer.async_bridge import AsyncChiselBridge
+from live_debug.events import Subscription, parse_event
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+
+
+def test_parse_and_match_events():
+    assert str(parse_event("WRITE=x5,x1,x5")) == "write=x1,x5"
+    assert str(parse_event("store=0x100-0x1ff")) == "store=0x100-0x1ff"
+    for bad in ("nope", "write=x32", "store=0x20-0x10", "stall=1"):
+        with pytest.raises(ValueError): parse_event(bad)
+
+    subs = Subscription()
+    assert subs.command(["stall", "write=x1", "store=0x100-0x1ff"])["ok"]
+    assert not subs.command(["flush", "bogus"])["ok"] and len(subs.events) == 3    # a bad list changes nothing
+    s = {"hazard": {"id_stall": 1}, "wb": {"we": 1, "rd": 2}, "mem": {"wr_op": 0, "addr": 0x180}}
+    assert subs.matches(s) == ["stall", "store=0x100-0x1ff"]
+    assert subs.matches({"wb": {"we": 1, "rd": 1}, "mem": {"wr_op": 1, "addr": 0x180}}) == ["write=x1"]
+    assert subs.command(["clear"])["events"] == []
+
+
+def test_go_streams_only_event_cycles(tmp_path):
+    with TraceWriter(str(tmp_path / "run.rvt"), rom=[0x13]) as w:
+        for c in range(1000):
+            w.append({"cycle": c, "coreDone": int(c >= 900),
+                      "hazard": {"id_stall": int(c % 100 == 50)}, "mem": {"wr_op": 1},
+                      "wb": {"we": 1, "rd": 5 if c % 250 == 0 else 1}})
+    server = ReplayServer(str(tmp_path / "run.rvt"), "127.0.0.1", 0).start()
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        await bridge.connect()
+        assert (await bridge.subscribe("stall write=x5"))["events"] == ["stall", "write=x5"]
+        snaps, ack = await bridge.go(400, heartbeat=0)
+        assert [s["cycle"] for s in snaps] == [50, 150, 250, 350, 400]     # events, then the last cycle
+        assert ack == {"ack": "go", "ok": True, "steps": 400, "events": 4, "done": 0}
+        snaps, ack = await bridge.go(100000, heartbeat=300)                  # heartbeat at 700, stop at 900
+        assert [s["cycle"] for s in snaps] == [450, 500, 550, 650, 700, 750, 850, 900]
+        assert (ack["steps"], ack["done"], snaps[-1]["coreDone"]) == (500, 1, 1)
+        assert (await bridge.step(1))[0]["cycle"] == 901                     # back to plain stepping
+        await bridge.close()
+    asyncio.run(asyncio.wait_for(main(), 20))
+    server.shutdown()
+    server.server_close()
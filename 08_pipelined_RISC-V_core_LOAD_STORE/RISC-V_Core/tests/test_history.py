@@ -0,0 +1,43 @@
+import pytest
+from benchmarks.fake_chisel import make_snapshot
+from live_debug.history import SnapshotHistory
+
+
+def snap(c):
+    s = make_snapshot(c)
+    if c % 5 == 0: s["extra"] = {"note": [c, c + 1]}       # keys that come and go, lists
+    return s
+
+
+def test_every_entry_rebuilds_equal_to_what_was_appended():
+    h = SnapshotHistory(keyframe_every=8)
+    for c in range(50): h.append(snap(c))
+    assert len(h) == 50 and h.start == 0
+    for i in (0, 1, 7, 8, 9, 15, 16, 49):                  # keyframes, the entries around them, the last
+        assert h[i] == snap(i), i
+    assert [h[i] for i in range(20, 12, -1)] == [snap(i) for i in range(20, 12, -1)]   # backwards past a keyframe
+    assert h[-1] == snap(49) and h[-50] == snap(0)
+    assert isinstance(h._groups[1][0], dict) and isinstance(h._groups[1][1], tuple)     # keyframe, then deltas
+    assert len(h._groups[1][1]) < len(h._groups[1][0])
+
+
+def test_eviction_drops_whole_keyframe_groups():
+    h = SnapshotHistory(keyframe_every=16, max_bytes=30_000)
+    for c in range(1000): h.append(snap(c))
+    assert h.start > 0 and h.start % 16 == 0 and h.nbytes <= 30_000
+    assert h[h.start] == snap(h.start) and h[h.start + 17] == snap(h.start + 17) and h[999] == snap(999)
+    with pytest.raises(IndexError): h[h.start - 1]
+    with pytest.raises(IndexError): h[1000]
+    assert len(h) == 1000 and h.bytes_per_entry() > 0
+
+
+def test_clear_starts_over_with_the_same_settings():
+    h = SnapshotHistory(keyframe_every=4, max_bytes=10_000)
+    for c in range(500): h.append(snap(c))
+    h[h.start + 2]
+    h.clear()
+    assert (len(h), h.start, h.nbytes, bool(h)) == (0, 0, 0, False)
+    assert (h.keyframe_every, h.max_bytes) == (4, 10_000)
+    with pytest.raises(IndexError): h[0]
+    h.append(snap(7))
+    assert h[0] == snap(7)
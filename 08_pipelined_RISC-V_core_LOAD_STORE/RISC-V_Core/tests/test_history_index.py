@@ -0,0 +1,38 @@
+import pytest
+from live_debug import history_index
+from live_debug.history_index import HistoryIndex, parse_query, snapshot_keys
+
+
+def snap(c):
+    return {"cycle": c, "pc": {"if": 4 * (c % 10), "wb": 4 * ((c - 4) % 10)},
+            "wb": {"rd": 5, "we": int(c % 3 == 0)},
+            "mem": {"addr": 0x100, "wr_op": 0 if c % 25 == 0 else 2, "rd_op": 2},
+            "hazard": {"if_stall": int(c % 7 == 0), "flush": 0}}
+
+
+def test_queries_and_keys():
+    assert parse_query("pc 0x40") == ("pc", "if", 0x40) and parse_query("ex_pc 8") == ("pc", "ex", 8)
+    assert parse_query("x5") == parse_query("wb_rd 5") == ("wb_rd", 5)
+    assert parse_query("mem_wr 0x100") == ("mem_wr", 0x100) and parse_query("stall") == ("stall",)
+    for bad in ("", "x40", "pc", "frob 1"):
+        with pytest.raises(ValueError): parse_query(bad)
+    keys = snapshot_keys(snap(0))
+    assert ("wb_rd", 5) in keys and ("mem_wr", 0x100) in keys and ("stall",) in keys and ("flush",) not in keys
+
+
+def test_next_and_prev_bisect_around_eviction(monkeypatch):
+    monkeypatch.setattr(history_index, "TRIM_EVERY", 64)
+    idx = HistoryIndex()
+    for i in range(300): idx.add(i, snap(i))
+    pc = ("pc", "if", 12)                                   # cycles 3, 13, 23, ...
+    assert (idx.next(pc, 13), idx.prev(pc, 13), idx.count(pc)) == (23, 3, 30)
+    assert idx.next(("mem_wr", 0x100), 0) == 25 and idx.next(("flush",), 0) is None
+
+    idx.evict(50)                                           # not compacted yet: answers still respect start
+    assert (idx.prev(pc, 55), idx.prev(pc, 53), idx.next(pc, 0)) == (53, None, 53)
+    assert idx.count(pc) == 25 and idx.prev(("wb_rd", 5), 51) is None
+    idx.evict(130)                                          # compacted
+    assert idx.lists[pc][0] == 133 and idx.next(pc, 0) == 133 and idx.prev(pc, 140) == 133
+    assert idx.prev(("mem_wr", 0x100), 150) is None and idx.next(("mem_wr", 0x100), 0) == 150
+    idx.clear()
+    assert idx.next(pc, 0) is None and idx.start == 0
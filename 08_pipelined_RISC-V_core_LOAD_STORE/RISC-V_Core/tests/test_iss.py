@@ -0,0 +1,126 @@
+import asyncio
+from web_visualizer.async_bridge import AsyncChiselBridge
+from live_debug.iss import Cosim, Iss, IssServer, check_trace
+from live_debug.trace import TraceWriter
+
+UNIMP = 0xC0001073
+
+
+# A few encoders, enough for the programs below
+def i_type(op, rd, f3, rs1, imm, f7=0): return (f7 << 25) | ((imm & 0xFFF) << 20) | (rs1 << 15) | (f3 << 12) | (rd << 7) | op
+def r_type(f3, rd, rs1, rs2, f7=0): return (f7 << 25) | (rs2 << 20) | (rs1 << 15) | (f3 << 12) | (rd << 7) | 0x33
+def s_type(f3, rs1, rs2, imm): return ((imm >> 5 & 0x7F) << 25) | (rs2 << 20) | (rs1 << 15) | (f3 << 12) | ((imm & 0x1F) << 7) | 0x23
+def b_type(f3, rs1, rs2, off):
+    o = off & 0x1FFF
+    return ((o >> 12) << 31) | ((o >> 5 & 0x3F) << 25) | (rs2 << 20) | (rs1 << 15) | (f3 << 12) | ((o >> 1 & 0xF) << 8) | ((o >> 11 & 1) << 7) | 0x63
+def jal(rd, off):
+    o = off & 0x1FFFFF
+    return ((o >> 20) << 31) | ((o >> 1 & 0x3FF) << 21) | ((o >> 11 & 1) << 20) | ((o >> 12 & 0xFF) << 12) | (rd << 7) | 0x6F
+def addi(rd, rs1, imm): return i_type(0x13, rd, 0, rs1, imm)
+
+PROGRAM = [
+    addi(1, 0, -8),                  # 0x00 x1 = -8
+    i_type(0x13, 2, 5, 1, 1, 0x20),  # 0x04 srai x2 = -4
+    i_type(0x13, 3, 5, 1, 28),       # 0x08 srli x3 = 0xf
+    r_type(2, 4, 1, 3),              # 0x0c slt  x4 = -8 < 15 = 1
+    r_type(3, 5, 1, 3),              # 0x10 sltu x5 = 0
+    s_type(2, 0, 1, 0x100),          # 0x14 sw   x1 -> [0x100]
+    i_type(0x03, 6, 4, 0, 0x101),    # 0x18 lbu  x6 = 0xff
+    i_type(0x03, 7, 1, 0, 0x102),    # 0x1c lh   x7 = -1
+    s_type(0, 0, 4, 0x103),          # 0x20 sb   x4 -> [0x103]
+    i_type(0x03, 8, 2, 0, 0x100),    # 0x24 lw   x8 = 0x01fffff8
+    b_type(4, 1, 0, 8),              # 0x28 blt  x1 < 0: to 0x30
+    addi(9, 0, 99),                  # 0x2c skipped
+    jal(10, 8),                      # 0x30 x10 = 0x34, to 0x38
+    addi(9, 0, 98),                  # 0x34 skipped
+    addi(0, 0, 5),                   # 0x38 x0 stays 0
+    i_type(0x67, 11, 0, 10, 0x10),   # 0x3c jalr x11 = 0x40, to 0x44
+    addi(9, 0, 97),                  # 0x40 skipped
+    UNIMP,                           # 0x44 end
+]
+
+
+def test_rv32i_semantics_and_the_end_of_the_program():
+    iss = Iss(PROGRAM)
+    assert iss.run(1000) == 15 and iss.done and iss.pc == 0x44
+    r = iss.regs
+    assert (r[1], r[2], r[3], r[4], r[5]) == (0xFFFFFFF8, 0xFFFFFFFC, 0xF, 1, 0)
+    assert (r[6], r[7], r[8], r[9], r[10], r[11], r[0]) == (0xFF, 0xFFFFFFFF, 0x01FFFFF8, 0, 0x34, 0x40, 0)
+    assert iss.run(10) == 0 and iss.step() is None
+
+    stepped = Iss(PROGRAM)                           # the recording path agrees with the fast one
+    trail = [stepped.step() for _ in range(15)]
+    assert stepped.regs == iss.regs and bytes(stepped.mem) == bytes(iss.mem)
+    assert (trail[5].store, trail[5].addr, trail[5].mdata) == (True, 0x100, 0xFFFFFFF8)
+    assert (trail[9].load, trail[9].rd, trail[9].wdata) == (True, 8, 0x01FFFFF8)
+    assert [t.pc for t in trail[10:]] == [0x28, 0x30, 0x38, 0x3c, 0x44]
+    s = stepped.snapshot()
+    assert s["coreDone"] == 1 and s["cycle"] == 15 and s["regs"]["x11"] == 0x40
+
+
+def rtl_like(program, delay=4):
+    """Snapshots shaped like the core's: each write-back `delay` cycles late, bubbles in between."""
+    iss, snaps, cycle = Iss(program), [], 0
+    snaps.append({"cycle": 0, "wb": {"we": 0, "rd": 0}, "pc": {"wb": 0}})
+    while (t := iss.step()):
+        for _ in range(delay - 1):
+            cycle += 1
+            snaps.append({"cycle": cycle, "wb": {"we": 0, "rd": 0, "wdata": 0}, "pc": {"wb": 0}})
+        cycle += 1
+        snaps.append({"cycle": cycle, "wb": {"we": int(bool(t.rd)), "rd": t.rd, "wdata": t.wdata},
+                      "pc": {"wb": t.pc}, "instr": {"wb": t.instr}})
+    return snaps
+
+
+def test_cosim_flags_the_first_wrong_write_back():
+    snaps = rtl_like(PROGRAM)
+    c = Cosim(PROGRAM)
+    assert not any(c.add(s) for s in snaps) and c.checked == 10 and c.active
+
+    snaps[8]["wb"]["wdata"] = 0x0FFFFFFC                # srai done as a logical shift
+    c = Cosim(PROGRAM)
+    found = [m for s in snaps if (m := c.add(s))]
+    assert found[0].cycle == 8 and found[0].pc == 0x4 and found[0].field == "wdata"
+    assert "at 0x4 is 0xffffffc, ISS says 0xfffffffc" in str(found[0])
+
+    snaps = rtl_like(PROGRAM)
+    c = Cosim(PROGRAM)                                  # a skipped cycle stops the checker
+    for s in snaps[:10] + snaps[11:]: c.add(s)
+    assert c.gap == 10 and c.mismatch is None and "stopped at cycle 10" in c.status()
+    c.add(snaps[0])                                     # back at cycle 0 (reset): checking again
+    assert c.active and c.checked == 0
+
+
+def test_check_a_recorded_trace(tmp_path):
+    path = str(tmp_path / "run.rvt")
+    snaps = rtl_like(PROGRAM)
+    snaps[40]["wb"]["rd"] = 12                           # lw's write-back to the wrong register
+    with TraceWriter(path, rom=PROGRAM) as w:
+        for s in snaps: w.append(s)
+    c = check_trace(path)
+    assert c.mismatch and c.mismatch.field == "rd" and c.mismatch.cycle == 40 and c.checked == 7
+
+
+def test_served_over_the_protocol(tmp_path):
+    prog = tmp_path / "prog.hex"
+    prog.write_text("\n".join(f"{w:08x}" for w in PROGRAM) + "\n")
+    server = IssServer(str(prog), "127.0.0.1", 0).start()
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        first = await bridge.connect()
+        assert first["cycle"] == 0 and first["rom"][0] == f"0x{PROGRAM[0]:08x}"
+        s = (await bridge.step(6))[-1]
+        assert s["pc"]["wb"] == 0x14 and s["mem"]["wr_op"] == 0 and s["mem"]["addr"] == 0x100
+        await bridge.bp("add 0x3c")
+        snap = await bridge.until_bp(1000)
+        assert (snap["pc"]["if"], snap["until"]["hit"], snap["regs"]["x10"]) == (0x3c, 1, 0x34)
+        await bridge.reset()
+        await bridge.subscribe("write=x8 done")
+        snaps, ack = await bridge.go(1000, 0)
+        assert [s["wb"]["rd"] for s in snaps] == [8, 0] and snaps[-1]["coreDone"] == 1
+        assert (ack["events"], ack["done"], ack["steps"]) == (2, 1, 15)
+        await bridge.close()
+    asyncio.run(asyncio.wait_for(main(), 20))
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,76 @@
+import socket
+import sys
+import time
+import pytest
+from live_debug.launcher import Simulator, SimulatorPool, free_port
+
+# Stand-in for LivePipelineTest: comes up after a delay, prints the accept() marker, serves clients in turn
+FAKE = [sys.executable, "-u", "-c", """
+import os, socket, time
+time.sleep(0.5)
+s = socket.socket()
+s.bind(("localhost", int(os.environ["LIVE_PORT"])))
+s.listen(1)
+print("Waiting for Python on port", os.environ["LIVE_PORT"])
+while True:
+    c, _ = s.accept()
+    c.sendall(('{"cycle": 0, "program": "%s"}\\n' % os.environ.get("LIVE_PROGRAM", "")).encode())
+    c.recv(16)
+    c.close()
+"""]
+
+
+def first_line(port):
+    with socket.create_connection(("localhost", port)) as s:
+        return s.makefile().readline()
+
+
+def test_ready_as_soon_as_the_simulator_accepts(tmp_path):
+    sim = Simulator(free_port(), "a.hex", log_path=str(tmp_path / "sim.log"), command=FAKE).wait_ready(timeout=10)
+    try:
+        assert 0.4 < sim.ready_s < 5
+        assert '"program": "a.hex"' in first_line(sim.port)
+        assert first_line(sim.port)          # reconnects are served by the same process
+    finally:
+        sim.stop()
+
+
+def test_a_dead_simulator_fails_fast(tmp_path):
+    sim = Simulator(free_port(), log_path=str(tmp_path / "sim.log"),
+                    command=[sys.executable, "-c", "print('elaboration failed'); raise SystemExit(1)"])
+    with pytest.raises(RuntimeError, match="elaboration failed"):
+        sim.wait_ready(timeout=10)
+
+
+def test_pool_hands_out_warm_simulators(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                       # the pool's logs go to the working directory
+    pool = SimulatorPool(1, "a.hex", command=FAKE)
+    try:
+        pool.warm[0].wait_ready(timeout=10)
+        sim = pool.claim()
+        assert sim.ready_s is not None and '"a.hex"' in first_line(sim.port)
+        other = pool.claim("b.hex", timeout=10)      # no warm one for b.hex: started on demand
+        assert '"b.hex"' in first_line(other.port)
+    finally:
+        pool.close()
+
+
+def test_only_our_port_in_the_log_means_ready(tmp_path):
+    # an sbt server relays the marker of its own test, on its own port
+    other = [sys.executable, "-u", "-c", "import time; print('Waiting for Python on port 8888...'); time.sleep(60)"]
+    sim = Simulator(free_port(), log_path=str(tmp_path / "sim.log"), command=other)
+    try:
+        time.sleep(0.5)
+        assert not sim.poll_ready()
+    finally:
+        sim.stop()
+
+
+def test_client_mode_only_serves_the_default_port_and_program(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="--launch client"):
+        Simulator(free_port(), mode="client")
+    with pytest.raises(ValueError, match="--launch client"):
+        Simulator(8888, "a.hex", mode="client")
+    with pytest.raises(ValueError, match="--launch client"):
+        SimulatorPool(0, mode="client")
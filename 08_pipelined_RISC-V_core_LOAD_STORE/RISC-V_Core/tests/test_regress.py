@@ -0,0 +1,74 @@
+import sys
+from live_debug.regress import ResultCache, run_all, run_program
+
+# Stand-in for LivePipelineTest speaking JSON lines: the "program" says when coreDone rises and gp then.
+# Each launch appends to launches.txt next to the program.
+FAKE = [sys.executable, "-u", "-c", """
+import json, os, socket
+prog = os.environ["LIVE_PROGRAM"]
+with open(os.path.join(os.path.dirname(prog), "launches.txt"), "a") as f: f.write(prog + "\\n")
+cfg = dict(kv.split("=") for kv in open(prog).read().split())
+done_at, gp = int(cfg["done"]), int(cfg["gp"])
+s = socket.socket()
+s.bind(("localhost", int(os.environ["LIVE_PORT"])))
+s.listen(1)
+print("Waiting for Python on port", os.environ["LIVE_PORT"])
+c, _ = s.accept()
+f = c.makefile("rw")
+def snap(cyc):
+    busy = cyc >= 5                      # retires every other cycle once the pipeline is full
+    return {"cycle": cyc, "rom": [], "coreDone": int(cyc == done_at), "gpRegVal": gp if cyc >= done_at - 3 else 0,
+            "result": 42, "pc": {"wb": 4 * cyc if busy and cyc % 2 else 0}, "instr": {"wb": 0x13}}
+def send(m): f.write(json.dumps(m) + "\\n"); f.flush()
+send(snap(0))
+for line in f:
+    cmd = line.split()
+    if cmd[0] == "sub": send({"ack": "sub", "ok": True, "events": cmd[1:]})
+    elif cmd[0] == "go":
+        n = 0
+        while n < int(cmd[1]):
+            n += 1
+            send(snap(n))
+            if n == done_at: break
+        send({"ack": "go", "ok": True, "steps": n, "events": int(n == done_at), "done": int(n == done_at)})
+    elif cmd[0] == "quit": break
+    else: send(snap(0))                  # no `proto`: stays on JSON lines
+"""]
+
+
+def program(tmp_path, name, done, gp):
+    p = tmp_path / name
+    p.write_text(f"done={done} gp={gp}")
+    return str(p)
+
+
+def test_verdicts_cycles_and_cpi(tmp_path):
+    progs = [program(tmp_path, "add.hex", 40, 1), program(tmp_path, "beq.hex", 30, 7),
+             program(tmp_path, "loop.hex", 10**9, 0)]
+    rows = run_all(progs, jobs=3, max_cycles=200, command=FAKE, log_dir=str(tmp_path / "logs"))
+    assert [r["verdict"] for r in rows] == ["pass", "fail", "timeout"]
+    assert [r["program"] for r in rows] == progs
+    assert rows[0]["cycles"] == 40 and rows[0]["result"] == 42 and rows[0]["test"] is None
+    assert rows[0]["retired"] == 18 and abs(rows[0]["cpi"] - 41 / 18) < 1e-9
+    assert rows[1]["test"] == 3                       # RVTEST_FAIL: gp = testnum << 1 | 1
+    assert rows[2]["cycles"] == 200
+
+
+def test_cache_skips_unchanged_programs(tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    a, b = program(tmp_path, "a.hex", 20, 1), program(tmp_path, "b.hex", 25, 1)
+    run_all([a, b], jobs=2, command=FAKE, cache=ResultCache(cache_path), log_dir=str(tmp_path / "logs"))
+    program(tmp_path, "b.hex", 25, 5)                 # b changed: only b runs again
+    rows = run_all([a, b], jobs=2, command=FAKE, cache=ResultCache(cache_path), log_dir=str(tmp_path / "logs"))
+    assert rows[0].get("cached") and rows[0]["verdict"] == "pass"
+    assert not rows[1].get("cached") and rows[1]["verdict"] == "fail"
+    assert sorted((tmp_path / "launches.txt").read_text().splitlines()) == [a, b, b]
+
+
+def test_a_simulator_that_dies_is_an_error_and_not_cached(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.json"))
+    row = run_program(program(tmp_path, "x.hex", 5, 1), command=[sys.executable, "-c", "raise SystemExit(3)"],
+                      log_dir=str(tmp_path / "logs"), timeout=10)
+    assert row["verdict"] == "error" and "exited" in row["error"]
+    cache.put("k", row)
+    assert cache.get("k") is None
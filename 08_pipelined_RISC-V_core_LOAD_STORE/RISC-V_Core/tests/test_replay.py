@@ -0,0 +1,109 @@
+import asyncio
+from web_visualizer.async_bridge import AsyncChiselBridge
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+
+
+def record(path, cycles):
+    with TraceWriter(str(path), rom=[0x13]) as w:
+        for c in cycles:
+            w.append({"cycle": c, "pc": {"if": 4 * c}, "regs": {"x1": c // 10}})
+
+
+def replay(path):
+    return ReplayServer(str(path), "127.0.0.1", 0).start()
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 20))
+
+
+def test_replay_steps_batches_and_resets(tmp_path):
+    record(tmp_path / "run.rvt", range(100))
+    server = replay(tmp_path / "run.rvt")
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        first = await bridge.connect()
+        assert (first["cycle"], first["rom"]) == (0, [0x13])
+        assert [s["cycle"] for s in await bridge.step(3)] == [1, 2, 3]
+        sparse = await bridge.step(1000, every=10)
+        assert sparse[0]["cycle"] == 13 and sparse[-1]["cycle"] == 99   # time stops at the last record
+        assert sparse[-1]["regs"]["x1"] == 9
+        assert (await bridge.reset())["pc"]["if"] == 0
+        await bridge.close()
+    run(main())
+    server.shutdown()
+    server.server_close()
+
+
+def test_negative_breakpoint_values_are_sent_unsigned(tmp_path):
+    from live_debug.breakpoints import parse_bp
+    args = parse_bp("x1 == -1").args()
+    assert args == "x1 == 0xffffffff 1"                         # LivePipelineTest's parseBigInt rejects -0x1
+    assert parse_bp("cycle >= 0x100000000 2").args() == "cycle >= 0x100000000 2"
+    with TraceWriter(str(tmp_path / "run.rvt")) as w:
+        for c in range(50):
+            w.append({"cycle": c, "regs": {"x1": 0xFFFFFFFF if c == 30 else c}})
+    server = replay(tmp_path / "run.rvt")
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        await bridge.connect()
+        assert (await bridge.bp("add " + args))["ok"]
+        assert (await bridge.until_bp(100))["cycle"] == 30
+        await bridge.close()
+    run(main())
+    server.shutdown()
+    server.server_close()
+
+
+def test_replay_breakpoints_and_skipped_cycles(tmp_path):
+    record(tmp_path / "run.rvt", range(0, 200, 2))              # every other cycle was recorded
+    server = replay(tmp_path / "run.rvt")
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        await bridge.connect()
+        assert (await bridge.step(1))[0]["pc"]["if"] == 0        # cycle 1 shows the record of cycle 0
+        assert (await bridge.bp("add x1 >= 5 2"))["id"] == 1
+        assert not (await bridge.bp("add nope 3"))["ok"]
+        snap = await bridge.until_bp(1000)                      # x1 >= 5 from cycle 50, 2nd hit at 52
+        assert (snap["cycle"], snap["until"]) == (52, {"hit": 1, "steps": 51, "bp": 1})
+        assert (await bridge.bp("list"))["bps"][0]["hits"] == 2
+        snap = await bridge.until_bp(10)
+        assert (snap["cycle"], snap["until"]["hit"]) == (54, 1)
+        await bridge.close()
+    run(main())
+    server.shutdown()
+    server.server_close()
+
+
+def test_a_recording_across_a_reset_stays_seekable(tmp_path):
+    from live_debug.client import LiveClient
+    from live_debug.trace import TraceReader
+    record(tmp_path / "run.rvt", range(500))
+    server = replay(tmp_path / "run.rvt")
+    cl = LiveClient("127.0.0.1", server.server_address[1])
+    cl.connect()
+    cl.hello()
+    cl.record(str(tmp_path / "rec.rvt"))
+    cl.fast_forward(300)
+    cl.reset()                                      # cycles restart at 0: a new segment
+    cl.fast_forward(40)
+    cl.record(None)
+    cl.close()
+    server.shutdown()
+    server.server_close()
+
+    first, second = TraceReader(str(tmp_path / "rec.rvt")), TraceReader(str(tmp_path / "rec.1.rvt"))
+    assert (len(first), len(second)) == (300, 41)
+    assert first.at_cycle(250)["regs"]["x1"] == 25 and second.at_cycle(35)["cycle"] == 35
+    assert second[0]["rom"] == [0x13] and (second.cycles[1:] > second.cycles[:-1]).all()
+
+
+def test_traces_keep_the_whole_write_back_result(tmp_path):
+    from live_debug.trace import TraceReader
+    with TraceWriter(str(tmp_path / "run.rvt")) as w:
+        w.append({"cycle": 0, "wb": {"wdata": 0x1234, "check_res": 0xDEADBEEF}})
+    assert TraceReader(str(tmp_path / "run.rvt"))[0]["wb"]["check_res"] == 0xDEADBEEF
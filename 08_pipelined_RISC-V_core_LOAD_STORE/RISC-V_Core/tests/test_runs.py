@@ -0,0 +1,65 @@
+import asyncio
+from web_visualizer.async_bridge import AsyncChiselBridge
+from web_visualizer.session import Session
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+
+
+def test_background_runs_stream_pause_and_cancel(tmp_path):
+    with TraceWriter(str(tmp_path / "run.rvt"), rom=[0x13]) as w:
+        for c in range(20000):
+            w.append({"cycle": c, "pc": {"if": 4 * c}})
+    server = ReplayServer(str(tmp_path / "run.rvt"), "127.0.0.1", 0).start()
+
+    async def main():
+        session = Session(AsyncChiselBridge("127.0.0.1", server.server_address[1]))
+        await session.join("a")
+        frames = []
+        async def on_frame(run): frames.append(run.status())
+
+        run = session.start_run("a", 5000, on_frame)
+        await run.task
+        assert frames[-1]["state"] == "done" and session.cursor("a") == session.head == 5000
+        assert len(frames) < 100 and all(f["cycles"] <= 5000 for f in frames)   # rate-limited, not per cycle
+
+        frames.clear()
+        run = session.start_run("a", 100000, on_frame)
+        await asyncio.sleep(0.05)
+        run.pause()
+        await asyncio.sleep(0.1)
+        paused_at = session.head
+        await asyncio.sleep(0.1)
+        assert session.head == paused_at and run.status()["state"] == "paused"
+        run.resume()
+        await asyncio.sleep(0.05)
+        run.cancel()
+        await run.task
+        st = frames[-1]
+        assert st["state"] == "cancelled" and paused_at < st["index"] < 20000
+        assert session.cursor("a") == session.head == st["index"]                 # left on the last simulated cycle
+        assert session.history[session.head]["cycle"] == st["index"]
+
+        frames.clear()
+        run = session.start_run("a", 100000, on_frame)
+        await asyncio.sleep(0.05)
+        session.leave("a")                                  # mid-chunk: the run must not bring "a" back
+        sent = len(frames)
+        await run.task
+        assert run.state == "cancelled" and "a" not in session.cursors and len(frames) == sent
+
+        await session.join("a")
+        old_frames, new_frames = [], []
+        async def old_frame(run): old_frames.append(run.status())
+        async def new_frame(run): new_frames.append(run.status())
+        old = session.start_run("a", 100000, old_frame)
+        await asyncio.sleep(0.05)
+        sent = len(old_frames)
+        new = session.start_run("a", 10, new_frame)         # replaces the old run mid-chunk
+        await asyncio.gather(old.task, new.task)
+        assert old.state == "cancelled" and len(old_frames) == sent
+        assert new_frames[-1]["state"] == "done" and session.cursor("a") == new.start + 10
+
+        await session.bridge.close()
+    asyncio.run(asyncio.wait_for(main(), 60))
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,64 @@
+import asyncio
+from web_visualizer.async_bridge import AsyncChiselBridge
+from web_visualizer.session import Session
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+
+
+def test_viewers_share_one_simulation_with_their_own_cursors(tmp_path):
+    with TraceWriter(str(tmp_path / "run.rvt"), rom=[0x13]) as w:
+        for c in range(1000):
+            w.append({"cycle": c, "pc": {"if": 4 * c}})
+    server = ReplayServer(str(tmp_path / "run.rvt"), "127.0.0.1", 0).start()
+
+    async def main():
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1])
+        session = Session(bridge)
+        steps = []
+        step = bridge.step
+        async def counted(n, *a, **kw):
+            steps.append(n)
+            return await step(n, *a, **kw)
+        bridge.step = counted
+
+        assert await session.join("a") == await session.join("b") == 0
+        await asyncio.gather(session.move("a", 100), session.move("b", 100))
+        assert steps == [100] and session.head == 100                     # simulated once, for both
+        assert session.snapshot("a")["cycle"] == session.snapshot("b")["cycle"] == 100
+
+        await session.move("a", -60)                                       # history only: no simulation
+        await session.move("b", 20)
+        assert steps == [100, 20] and (session.cursor("a"), session.cursor("b")) == (40, 120)
+        assert session.snapshot("a")["pc"]["if"] == 160
+
+        session.leave("b")
+        assert "b" not in session.cursors and session.cursor("b") == session.head   # unknown: the live head
+        await session.join("b")
+        epoch = session.epoch
+        await session.reset()
+        assert session.epoch == epoch + 1 and session.head == 0
+        assert session.cursors == {"a": 0, "b": 0} and session.snapshot("b")["rom"] == [0x13]
+        await bridge.close()
+    asyncio.run(asyncio.wait_for(main(), 20))
+    server.shutdown()
+    server.server_close()
+
+
+def test_a_reconnect_keeps_its_hello_snapshot():
+    from test_async_bridge import FakeChisel
+
+    async def main():
+        fake = await FakeChisel().start()
+        bridge = AsyncChiselBridge("127.0.0.1", fake.port, timeout=0.2)
+        session = Session(bridge)
+        await session.join("a")
+        await session.move("a", 3)
+        try: await bridge.request("hang")
+        except asyncio.TimeoutError: pass
+        epoch = session.epoch
+        await session.move("a", 1)                        # the simulator it reconnects to starts over
+        assert session.epoch == epoch + 1
+        assert [s["cycle"] for s in session.history] == [0, 1] and session.cursor("a") == 1
+        await bridge.close()
+        await fake.stop()
+    asyncio.run(asyncio.wait_for(main(), 20))
@@ -0,0 +1,44 @@
+import numpy as np
+from live_debug import trace
+from live_debug.shadow_mem import PAGE_WORDS, ShadowMemory
+
+
+def snap(cycle, addr=None, data=0):
+    mem = {"wr_op": 1, "addr": 0, "wdata": 0} if addr is None else {"wr_op": 0, "addr": addr, "wdata": data}
+    return {"cycle": cycle, "mem": mem}
+
+
+def test_memory_at_any_past_cycle():
+    m = ShadowMemory()
+    for c in range(100):
+        m.add(snap(c, 0x100 + 4 * (c % 3), c) if c % 10 == 0 else snap(c))
+    assert m.add(snap(99, 0x100, 7)) is False                  # repeated cycle (time stopped): ignored
+    assert (m.stores, m.missed) == (10, 0)
+    assert m.read(0x100, 0) == 0 and m.read(0x100, 29) == 0 and m.read(0x100, 30) == 30
+    assert m.read(0x102) == m.read(0x100) == 90                # word aligned, latest by default
+    assert m.read(0x104, 9) is None and m.read(0x104, 10) == 10
+    assert m.read(0x2000) is None
+    page = m.page(0x13c, 40)
+    assert len(page) == PAGE_WORDS and page[:3] == [(30, 30), (40, 40), (20, 20)] and page[3] is None
+    assert m.touched() == [0x100] and m.touched(-1) == []
+    assert "0000001e " in m.format(0x100, 40, 4)[0] and "00000028*" in m.format(0x100, 40, 4)[0]
+
+    m.add(snap(120, 0x100, 1))                                 # 20 cycles the history never saw
+    assert m.missed == 20
+
+
+def test_trace_records_give_the_same_memory():
+    rec = np.zeros(500, dtype=trace.DTYPE)
+    rec["cycle"] = np.arange(0, 1000, 2)
+    rec["mem.wr_op"] = np.where(np.arange(500) % 7 == 0, 0, 1)
+    rec["mem.addr"] = np.arange(500) % 64 * 4
+    rec["mem.wdata"] = np.arange(500) * 3
+    a, b = ShadowMemory(), ShadowMemory()
+    a.add_records(rec[:200])
+    a.add_records(rec[200:])
+    for r in rec:
+        b.add({"cycle": int(r["cycle"]), "mem": {"wr_op": int(r["mem.wr_op"]), "addr": int(r["mem.addr"]),
+                                                "wdata": int(r["mem.wdata"])}})
+    assert (a.stores, a.missed, a.last_cycle) == (b.stores, b.missed, b.last_cycle) == (72, 499, 998)
+    for c in (0, 13, 500, 998):
+        assert a.page(0, c) == b.page(0, c)
@@ -0,0 +1,57 @@
+import asyncio
+import io
+from web_visualizer.async_bridge import AsyncChiselBridge
+from live_debug.replay import ReplayServer
+from live_debug.trace import TraceWriter
+from live_debug.wire import HEAD, Decoder, Encoder, read_frame
+from benchmarks.fake_chisel import make_snapshot
+
+
+def test_frames_round_trip_with_register_deltas():
+    enc, dec = Encoder(), Decoder(["0x13"])
+    buf = io.BytesIO(b"".join(enc.snapshot(make_snapshot(c)) for c in range(40)) + enc.json({"ack": "bp", "ok": True}))
+    sizes = []
+    for c in range(40):
+        start = buf.tell()
+        s = dec.decode(*read_frame(buf))
+        sizes.append(buf.tell() - start)
+        want = make_snapshot(c)
+        want["until"]["bp"] = 0
+        assert s["rom"] == (["0x13"] if c == 0 else [])
+        assert {k: v for k, v in s.items() if k != "rom"} == {k: v for k, v in want.items() if k != "rom"}
+    assert sizes[0] == 5 + HEAD.size + 4 + 32 * 4         # all registers once, then only the ones that changed
+    assert max(sizes[32:]) <= 5 + HEAD.size + 4 + 4
+    assert dec.decode(*read_frame(buf)) == {"ack": "bp", "ok": True}
+
+
+def test_write_back_results_keep_all_32_bits():
+    s = make_snapshot(5)
+    s["wb"]["check_res"] = 0xDEADBEEF                 # a load or ALU result, not a byte
+    buf = io.BytesIO(Encoder().snapshot(s))
+    assert Decoder().decode(*read_frame(buf))["wb"]["check_res"] == 0xDEADBEEF
+
+
+def test_binary_and_json_modes_see_the_same_run(tmp_path):
+    with TraceWriter(str(tmp_path / "run.rvt"), rom=[0x13]) as w:
+        for c in range(100):
+            w.append({"cycle": c, "pc": {"if": 4 * c}, "regs": {"x1": c // 10, "x2": c % 3}})
+    server = ReplayServer(str(tmp_path / "run.rvt"), "127.0.0.1", 0).start()
+
+    async def session(proto):
+        bridge = AsyncChiselBridge("127.0.0.1", server.server_address[1], proto=proto)
+        first = await bridge.connect()
+        snaps = await bridge.step(60, every=7)
+        ack = await bridge.bp("add x1 == 8")
+        stop = await bridge.until_bp(1000)
+        reset = await bridge.reset()
+        binary = bridge.wire is not None
+        await bridge.close()
+        return binary, [first, *snaps, ack, stop, reset]
+
+    async def main():
+        (b, got), (j, want) = await session("binary"), await session("json")
+        assert b and not j
+        assert got == want and got[-1]["rom"] == [0x13] and got[-2]["cycle"] == 80
+    asyncio.run(asyncio.wait_for(main(), 20))
+    server.shutdown()
+    server.server_close()
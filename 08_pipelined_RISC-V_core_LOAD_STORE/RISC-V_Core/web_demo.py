@@ -1,3 +1,4 @@
+import os
 import uvicorn
 import argparse
 from live_debug.launcher import ensure_server_running # Reuse your existing launcher!
@@ -5,10 +6,23 @@ from live_debug.launcher import ensure_server_running # Reuse your existing laun
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--replay", default=None, help="serve a recorded trace (.rvt or .jsonl) instead of launching Chisel")
+    parser.add_argument("--iss", default=None, metavar="PROGRAM", help="run a hex program on the instruction-set simulator instead of Chisel")
+    parser.add_argument("--program", default=None, help="ROM hex file (default: src/test/programs/BinaryFile)")
+    parser.add_argument("--launch", default="auto", choices=["auto", "java", "client", "sbt"])
     args = parser.parse_args()
+    os.environ["LIVE_PORT"] = str(args.port)   # read by the web server's bridge (also under --reload)
 
-    # 1. Start Chisel (reuses your existing logic)
-    ensure_server_running("localhost", args.port)
+    # 1. Start Chisel (reuses your existing logic), or replay a recording / run the ISS without the JVM
+    if args.replay:
+        from live_debug.replay import serve_in_background
+        serve_in_background(args.replay, "localhost", args.port)
+    elif args.iss:
+        from live_debug.iss import serve_in_background
+        serve_in_background(args.iss, "localhost", args.port)
+    else:
+        try: ensure_server_running("localhost", args.port, args.program, args.launch)
+        except ValueError as e: parser.error(str(e))
 
     # 2. Start Web Server
     print("🚀 Starting Web Visualizer at http://localhost:8080")
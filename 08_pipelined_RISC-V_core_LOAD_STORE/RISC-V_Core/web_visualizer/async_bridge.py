@@ -0,0 +1,186 @@
+import asyncio
+import json
+from collections import deque
+import time
+from typing import Optional
+from live_debug.protocol import batch_plan, batch_reply_count
+from live_debug.metrics import metrics
+from live_debug.packet_log import log_packet
+from live_debug.breakpoints import is_ack
+from live_debug.events import GO_MAX, HEARTBEAT
+from live_debug.wire import SNAPSHOT, Decoder, is_proto_ack, read_frame_async
+
+class AsyncChiselBridge:
+    """asyncio-native client for the LivePipelineTest line protocol.
+
+    Commands are queued and written as soon as there is room in the in-flight window, while a
+    reader task hands each reply group to the future of the command that asked for it. A full
+    queue makes callers wait (backpressure), and every reply is bounded by `timeout`.
+    With proto="binary" it switches to the compact frames of live_debug.wire after the first snapshot.
+    """
+
+    def __init__(self, host="localhost", port=8888, max_in_flight=8, timeout=30.0, connect_timeout=60.0,
+                 proto="binary"):
+        self.host = host
+        self.port = port
+        self.proto = proto
+        self.wire = None                 # wire.Decoder while the simulator sends frames
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.reader = None
+        self.writer = None
+        self.latest = {}
+        self.on_hello = None             # called with the initial snapshot when a command has to reconnect
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending = deque()          # (reply count or None = up to an ack, future, replies so far, send time)
+        self._reader_task = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        """Connect (retrying until connect_timeout) and return the initial snapshot."""
+        async with self._connect_lock:
+            if self.connected: return self.latest
+            print(f"🔌 Connecting to Chisel at {self.host}:{self.port}...")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.connect_timeout
+            while True:
+                try:
+                    self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=2**20)
+                    break
+                except OSError:
+                    if loop.time() >= deadline:
+                        raise TimeoutError(f"no simulator on {self.host}:{self.port} after {self.connect_timeout:.0f}s")
+                    print("   Waiting for simulation...")
+                    await asyncio.sleep(1)
+            print("✅ Connected to Hardware!")
+            self.wire = None
+            await self._slots.acquire()
+            hello = loop.create_future()
+            self._pending.append((1, hello, [], time.perf_counter()))
+            self._reader_task = asyncio.create_task(self._read_loop())
+            snaps = await asyncio.wait_for(hello, self.timeout)
+            if self.proto == "binary":
+                # the read loop switches on the ack; an older simulator replies with a snapshot instead
+                await self.request("proto binary")
+            return snaps[-1] if snaps else {}
+
+    async def _read_loop(self):
+        """Hand each incoming snapshot to the oldest command still waiting for replies."""
+        try:
+            while True:
+                if self.wire:
+                    try: kind, payload = await read_frame_async(self.reader)
+                    except asyncio.IncompleteReadError: raise ConnectionError("simulator closed the connection")
+                    log_packet(payload.hex() if kind == SNAPSHOT else payload.decode())
+                    with metrics.timer("parse"):
+                        snap = self.wire.decode(kind, payload)
+                else:
+                    line = await self.reader.readline()
+                    if not line: raise ConnectionError("simulator closed the connection")
+                    log_packet(line.decode())
+                    try:
+                        with metrics.timer("parse"):
+                            snap = json.loads(line)
+                    except json.JSONDecodeError:
+                        print("❌ JSON Decode Error")
+                        continue
+                if is_proto_ack(snap):
+                    self.wire = Decoder(snap.get("rom")) if snap.get("mode") == "binary" else None
+                if not is_ack(snap): self.latest = snap
+                if not self._pending: continue
+                count, fut, got, sent = self._pending[0]
+                got.append(snap)
+                if len(got) >= count if count else is_ack(snap):
+                    self._pending.popleft()
+                    metrics.observe("chisel", time.perf_counter() - sent)
+                    self._slots.release()
+                    if not fut.done(): fut.set_result(got)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self._fail(e)
+
+    def _fail(self, exc):
+        """Fail every waiting command and drop the connection; the next command reconnects."""
+        while self._pending:
+            fut = self._pending.popleft()[1]
+            if fut is not None and not fut.done(): fut.set_exception(exc)
+            self._slots.release()
+        if self._reader_task and self._reader_task is not asyncio.current_task(): self._reader_task.cancel()
+        self._reader_task = None
+        if self.writer: self.writer.close()
+
+    async def submit(self, cmd: str, count: Optional[int] = 1) -> asyncio.Future:
+        """Queue a command and return the future of its `count` replies, or of all of them up to an ack
+        if count is None (waits for a free slot)."""
+        if not self.connected:
+            hello = await self.connect()
+            if hello and self.on_hello: self.on_hello(hello)
+        await self._slots.acquire()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((count, fut, [], time.perf_counter()))
+        self.writer.write((cmd.strip() + "\n").encode())
+        await self.writer.drain()
+        return fut
+
+    async def request(self, cmd: str, count: Optional[int] = 1, timeout: Optional[float] = None):
+        fut = await self.submit(cmd, count)
+        timeout = timeout or self.timeout
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self._fail(TimeoutError(f"no reply to {cmd!r} within {timeout}s"))
+            raise
+
+    async def step(self, steps=1, every=1):
+        """Advance N cycles and return the snapshots that came back (every k-th and the last)."""
+        metrics.add_cycles(steps)
+        if steps == 1: return await self.request("step")
+        futs = [await self.submit(f"batch {n} {k}", batch_reply_count(n, k)) for n, k in batch_plan(steps, every)]
+        try:
+            groups = await asyncio.wait_for(asyncio.gather(*futs), self.timeout * max(1, len(futs)))
+        except asyncio.TimeoutError:
+            self._fail(TimeoutError(f"no reply to a {steps}-cycle run"))
+            raise
+        return [s for g in groups for s in g]
+
+    async def bp(self, args: str):
+        """`bp add|del|clear|list ...` on the simulator; returns its ack (never a snapshot)."""
+        return (await self.request(f"bp {args}"))[-1]
+
+    async def until_bp(self, max_cycles=100000):
+        """Run until a server-side breakpoint fires, in one round-trip; returns the stopping snapshot."""
+        snap = (await self.request(f"until bp {max_cycles}"))[-1]
+        metrics.add_cycles(snap.get("until", {}).get("steps", 0))
+        return snap
+
+    async def subscribe(self, events: str = "list"):
+        """`sub <events>` (see live_debug.events); returns the ack listing the subscription."""
+        return (await self.request(f"sub {events}"))[-1]
+
+    async def go(self, max_cycles=GO_MAX, heartbeat=HEARTBEAT):
+        """Run freely, getting only the snapshots of subscribed events, heartbeats and the last cycle.
+        Returns (snapshots, ack); the ack has the steps run, the event count and whether the core finished."""
+        replies = await self.request(f"go {max_cycles} {heartbeat}", None,
+                                     self.timeout * max(1, max_cycles // GO_MAX))
+        ack = replies.pop()
+        metrics.add_cycles(ack.get("steps", 0))
+        return replies, ack
+
+    async def reset(self):
+        snaps = await self.request("reset")
+        return snaps[-1] if snaps else {}
+
+    def get_latest(self):
+        return self.latest
+
+    async def close(self):
+        if self.connected:
+            self.writer.write(b"quit\n")
+            self.writer.close()
+            try: await self.writer.wait_closed()
+            except OSError: pass
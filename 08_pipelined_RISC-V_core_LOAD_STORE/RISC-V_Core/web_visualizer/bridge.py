@@ -1,14 +1,23 @@
 import socket
 import json
 import time
+from live_debug.protocol import stream_batches
+from live_debug.history import SnapshotHistory
+from live_debug.metrics import metrics
+from live_debug.packet_log import log_packet
 
 class ChiselBridge:
-    def __init__(self, host="localhost", port=8888):
+    """Blocking client for the LivePipelineTest line protocol, kept for benchmarks/bench_stepping.py
+    and the `bridge` case of benchmarks/suite.py. The web server uses AsyncChiselBridge; new
+    protocol commands go there, not here."""
+
+    def __init__(self, host="localhost", port=8888, max_history_bytes=64 * 2**20):
         self.host = host
         self.port = port
         self.sock = None
         self.f = None
-        self.history = []
+        self.history = SnapshotHistory(max_bytes=max_history_bytes)
+        self.latest = {}
 
     def connect(self):
         """Connect to the Chisel TCP server."""
@@ -33,36 +42,39 @@ class ChiselBridge:
         """Read one JSON line from Chisel and log it."""
         if not self.f: return None
         try:
-            line = self.f.readline()
+            with metrics.timer("chisel"):
+                line = self.f.readline()
             if not line: return None
 
-            # --- DEBUG LOGGING ---
-            # Appends every packet to a file so we can inspect it later
-            with open("chisel_debug.log", "a") as log_file:
-                log_file.write(f"RAW: {line.strip()}\n")
-            # ---------------------
+            # Raw packet log goes through a background writer (see live_debug/packet_log.py)
+            log_packet(line)
 
-            data = json.loads(line)
+            with metrics.timer("parse"):
+                data = json.loads(line)
             self.history.append(data)
+            self.latest = data
             return data
         except json.JSONDecodeError:
             print("❌ JSON Decode Error")
             return None
 
-    def step(self, steps=1):
-        """Advance N cycles."""
-        for _ in range(steps):
+    def step(self, steps=1, every=1):
+        """Advance N cycles, keeping every k-th snapshot."""
+        metrics.add_cycles(steps)
+        if steps == 1:
             self.send_command("step")
             self.receive_snapshot()
+        elif steps > 1:
+            for _ in stream_batches(self.send_command, self.receive_snapshot, steps, every): pass
         return self.get_latest()
 
     def get_latest(self):
         """Return the most recent snapshot."""
-        if not self.history: return {}
-        return self.history[-1]
+        return self.latest
 
     def reset(self):
         self.send_command("reset")
-        self.history = []
+        self.history.clear()
+        self.latest = {}
         self.receive_snapshot() # Get cycle 0
         return self.get_latest()
\ No newline at end of file
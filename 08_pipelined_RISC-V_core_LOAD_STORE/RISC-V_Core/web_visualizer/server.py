@@ -1,14 +1,22 @@
+import asyncio
+import os
 import socketio
-import copy
+from collections import OrderedDict
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from .bridge import ChiselBridge
-from live_debug.decoder import decode_rv32i
+from fastapi.responses import FileResponse, PlainTextResponse, JSONResponse
+from .async_bridge import AsyncChiselBridge
+from .session import Session
+from live_debug.decoder import decode_rv32i, decode_rom
+from live_debug.metrics import metrics
+from live_debug.breakpoints import parse_bp
+from live_debug.history_index import parse_query
 
-bridge = ChiselBridge()
+bridge = AsyncChiselBridge(port=int(os.environ.get("LIVE_PORT", 8888)))
 
-debug_state = { "cursor": -1, "history": [] }
+# One shared simulation; each browser has its own cursor. The history keeps raw
+# snapshots only; packets are enriched when a cycle is sent to a browser.
+session = Session(bridge)
 
 sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
 app = FastAPI()
@@ -22,6 +30,12 @@ socket_app = socketio.ASGIApp(sio, app)
 async def read_index():
     return FileResponse('web_visualizer/templates/index.html')
 
+@app.get("/metrics")
+async def read_metrics(format: str = "prometheus"):
+    """Per-stage latency histograms and cycles/sec (Prometheus text, or ?format=json)."""
+    if format == "json": return JSONResponse(metrics.as_dict())
+    return PlainTextResponse(metrics.prometheus())
+
 def extract_registers(instr_int):
     if not instr_int: return {"rs1":0, "rs2":0, "rd":0}
     return {
@@ -42,18 +56,23 @@ def safe_int(val):
     return 0
 
 def process_snapshot(raw_data):
-    data = copy.deepcopy(raw_data)
+    """Build the packet a browser sees. Nothing is copied deeply: the enriched view is a new top
+    level dict that shares every untouched sub-dict with `raw_data`, which is never mutated."""
+    data = dict(raw_data)
+    instr = raw_data.get('instr', {})
+    pc = raw_data.get('pc', {})
 
     # 1. Decode Instructions (Just for text display)
     data['asm'] = {}
     data['pc_hex'] = {}
     for stage in ['if', 'id', 'ex', 'mem', 'wb']:
-        raw_instr = data.get('instr', {}).get(stage, 0)
-        data['asm'][stage] = decode_rv32i(safe_int(raw_instr))
-        data['pc_hex'][stage] = f"0x{safe_int(data.get('pc', {}).get(stage, 0)):08x}"
+        data['asm'][stage] = decode_rv32i(safe_int(instr.get(stage, 0)))
+        data['pc_hex'][stage] = f"0x{safe_int(pc.get(stage, 0)):08x}"
+    if raw_data.get('rom'):
+        data['rom_asm'] = list(decode_rom(raw_data['rom']).values())
 
     # 2. Hardware Register File (Direct from JSON)
-    reg_map = data.get("regs", {})
+    reg_map = raw_data.get("regs", {})
     regs_list = [0] * 32
     if isinstance(reg_map, dict):
         for k, v in reg_map.items():
@@ -61,14 +80,12 @@ def process_snapshot(raw_data):
             if 0 <= idx < 32:
                 regs_list[idx] = safe_int(v)
 
-    # 3. EX Stage: Use Hardware Signals
-    if 'ex' not in data: data['ex'] = {}
-    data['ex']['val_a'] = safe_int(data['ex'].get('alu_op_a', 0))
-    data['ex']['val_b'] = safe_int(data['ex'].get('alu_op_b', 0))
+    # 3. EX Stage: Use Hardware Signals (a fresh dict, so the raw 'ex' stays untouched)
+    ex = raw_data.get('ex', {})
+    data['ex'] = {**ex, 'val_a': safe_int(ex.get('alu_op_a', 0)), 'val_b': safe_int(ex.get('alu_op_b', 0))}
 
     # 4. ID Info
-    id_instr = data.get('instr', {}).get('id', 0)
-    data['id_info'] = extract_registers(id_instr)
+    data['id_info'] = extract_registers(instr.get('id', 0))
 
     return {
         "raw": raw_data,
@@ -76,61 +93,161 @@ def process_snapshot(raw_data):
         "registers": regs_list
     }
 
-def add_to_history(raw_snap):
-    if not raw_snap: return
-    processed = process_snapshot(raw_snap)
-    debug_state["history"].append(processed)
-    debug_state["cursor"] = len(debug_state["history"]) - 1
-    return processed
+# Enriched packets are built the first time a cycle is shown and kept in a small LRU shared by
+# every viewer, keyed by (reset epoch, history index). Packets are read-only once cached.
+PACKET_CACHE_SIZE = 1024
+_packets = OrderedDict()
+
+def packet_at(index):
+    key = (session.epoch, index)
+    packet = _packets.get(key)
+    if packet is not None:
+        _packets.move_to_end(key)
+        return packet
+    with metrics.timer("enrich"):
+        packet = process_snapshot(session.history[index])
+    _packets[key] = packet
+    if len(_packets) > PACKET_CACHE_SIZE: _packets.popitem(last=False)
+    return packet
+
+def current_packet(sid):
+    """Enriched packet for the cycle under this client's cursor (or the rebuilt cycle it views)."""
+    if sid in session.past:
+        snap, ok = session.rebuilt[session.past[sid]]
+        return {**process_snapshot(snap), "rebuilt": {"cycle": snap.get("cycle"), "verified": ok}}
+    if not session.history: return None
+    return packet_at(session.cursor(sid))
+
+async def send_update(sid):
+    packet = current_packet(sid)
+    if packet:
+        with metrics.timer("emit"):
+            await sio.emit('update', packet, to=sid)
+            view = session.memory_view(sid)
+            if view: await sio.emit('memory', view, to=sid)
+
+async def run_frame(run):
+    """One coalesced progress frame of a background run: the cycle under the cursor and the run state."""
+    await send_update(run.sid)
+    await sio.emit('run_state', run.status(), to=run.sid)
 
 @sio.event
 async def connect(sid, environ):
-    if not bridge.sock:
-        bridge.connect()
-        # FIX: Explicitly read the FIRST snapshot (Cycle 0) from the buffer
-        # 'step(0)' in bridge.py does nothing, so we use receive_snapshot() directly.
-        if not debug_state["history"]:
-            initial_data = bridge.receive_snapshot()
-            add_to_history(initial_data)
-
-    # Send the latest state to the web client
-    if debug_state["history"]:
-        await sio.emit('update', debug_state["history"][debug_state["cursor"]])
+    # Each socket.io client is in its own room (its sid), so updates never leak to other viewers
+    try:
+        await session.join(sid)
+    except (asyncio.TimeoutError, TimeoutError, ConnectionError) as e:
+        print(f"❌ {e}")
+        return
+    await send_update(sid)
+    await sio.emit('breakpoints', {"bps": session.breakpoints}, to=sid)
+    await sio.emit('events', {"events": session.events}, to=sid)
+
+@sio.event
+async def disconnect(sid):
+    session.leave(sid)
 
 @sio.event
 async def command(sid, data):
+    with metrics.timer("command"):
+        await handle_command(sid, data)
+
+async def handle_command(sid, data):
     action = data.get('action')
-    val = int(data.get('value', 1)) # Default to 1 if not specified
-    response = None
-
-    if action == 'step':
-        # Step Forward logic (existing)
-        target = debug_state["cursor"] + 1
-        if target < len(debug_state["history"]):
-            debug_state["cursor"] = target
-            response = debug_state["history"][debug_state["cursor"]]
-        else:
-            response = add_to_history(bridge.step(1))
-
-    elif action == 'run':
-        # Fast Forward logic
-        for _ in range(val):
-            if debug_state["cursor"] < len(debug_state["history"]) - 1:
-                debug_state["cursor"] += 1
-                response = debug_state["history"][debug_state["cursor"]]
+    raw_val = data.get('value', 1)
+    val = int(raw_val) if action not in ('bp', 'seek', 'sub', 'run_control', 'mem') else 1 # Default to 1 if not specified
+    metrics.inc("commands")
+
+    try:
+        if action == 'step':
+            await session.move(sid, 1)
+
+        elif action == 'run':
+            # Fast Forward in the background: walks shared history first, simulates the rest in chunks
+            # and streams at most RUN_FPS updates a second; `run_control` pauses, resumes or cancels it
+            session.start_run(sid, val, run_frame)
+            return
+
+        elif action == 'run_control':
+            run = session.runs.get(sid)
+            if run and run.active:
+                {'pause': run.pause, 'resume': run.resume, 'cancel': run.cancel}.get(str(raw_val), lambda: None)()
+                await sio.emit('run_state', run.status(), to=sid)
+            return
+
+        elif action == 'back':
+            # Fast Backward: clamps at the oldest retained cycle
+            await session.move(sid, -val)
+
+        elif action == 'bp':
+            # Breakpoints live in the simulator and are shared by every viewer
+            args = str(raw_val).strip()
+            if args.startswith("add "):
+                try:
+                    args = "add " + parse_bp(args[4:]).args()
+                except ValueError as e:
+                    await sio.emit('breakpoints', {"bps": session.breakpoints, "error": str(e)}, to=sid)
+                    return
+            ack = await session.bp(args)
+            await sio.emit('breakpoints', {"bps": session.breakpoints}, skip_sid=sid)
+            await sio.emit('breakpoints', {"bps": session.breakpoints, "error": ack.get("error")}, to=sid)
+            return
+
+        elif action == 'seek':
+            # Jump through recorded history: {"value": "x5" | "ex_pc 0x40" | "mem_wr 0x100" | "stall", "dir": "next"|"prev"}
+            try:
+                key = parse_query(str(raw_val))
+            except ValueError as e:
+                await sio.emit('seek_result', {"found": False, "error": str(e)}, to=sid)
+                return
+            i = session.seek(sid, key, data.get('dir', 'next') != 'prev')
+            await sio.emit('seek_result', {"found": i is not None, "index": i}, to=sid)
+
+        elif action == 'goto':
+            # Any cycle seen so far, also evicted or from before a reset (replayed and verified): {"value": 1234}
+            await sio.emit('goto_result', await session.goto(sid, val), to=sid)
+
+        elif action == 'mem':
+            # Memory panel: {"value": "0x100"} watches that page (it follows the cursor), "off" stops
+            text = str(raw_val).strip()
+            if text == 'off': session.mem_views.pop(sid, None)
             else:
-                response = add_to_history(bridge.step(1))
-
-    elif action == 'back':
-        # Fast Backward logic (NEW)
-        # Move cursor back by 'val' amount, clamping at 0
-        new_cursor = max(0, debug_state["cursor"] - val)
-        debug_state["cursor"] = new_cursor
-        response = debug_state["history"][debug_state["cursor"]]
-
-    elif action == 'reset':
-        bridge.reset()
-        debug_state["history"] = []
-        response = add_to_history(bridge.step(0))
-
-    if response: await sio.emit('update', response)
\ No newline at end of file
+                try: session.mem_views[sid] = int(text, 0)
+                except ValueError:
+                    await sio.emit('memory', {"error": f"bad address {text!r}"}, to=sid)
+                    return
+
+        elif action == 'stats':
+            # Performance panel: vectorized over the history's columns, off the event loop
+            report = await asyncio.to_thread(session.stats, val if 'value' in data else 10)
+            await sio.emit('stats', report, to=sid)
+            return
+
+        elif action == 'sub':
+            # Event subscription for `go`, shared like the breakpoints: {"value": "stall flush write=x10"}
+            ack = await session.subscribe(str(raw_val).strip() or "list")
+            await sio.emit('events', {"events": session.events}, skip_sid=sid)
+            await sio.emit('events', {"events": session.events, "error": ack.get("error")}, to=sid)
+            return
+
+        elif action == 'go':
+            # Free run: only cycles with a subscribed event (and heartbeats) come back into the history
+            ack = await session.go(sid, val if 'value' in data else 100000, int(data.get('heartbeat', 10000)))
+            await sio.emit('go_result', ack, to=sid)
+
+        elif action == 'continue':
+            # Run to breakpoint: one `until bp` round-trip however many cycles it takes
+            await session.continue_to_bp(sid, val if 'value' in data else 100000)
+            await sio.emit('breakpoints', {"bps": session.breakpoints})
+
+        elif action == 'reset':
+            await session.reset()
+            _packets.clear()
+            # Everyone is back at cycle 0 of the new run
+            for other in list(session.cursors):
+                if other != sid: await send_update(other)
+    except (asyncio.TimeoutError, TimeoutError, ConnectionError) as e:
+        # Keep serving: report it and show whatever history we have
+        print(f"❌ Simulator error during '{action}': {e}")
+
+    await send_update(sid)
@@ -0,0 +1,331 @@
+import asyncio
+import time
+from collections import OrderedDict
+from live_debug import checkpoints
+from live_debug.history import SnapshotHistory
+from live_debug.history_index import HistoryIndex
+from live_debug.analytics import ColumnBuffer, analyze
+from live_debug.shadow_mem import ShadowMemory
+from live_debug.events import GO_MAX
+
+RUN_FPS = 30                 # progress frames per second of a background run
+RUN_CHUNK = (64, 8192)       # cycles per step of a run, sized to about one frame between these bounds
+REBUILT_KEEP = 16 * checkpoints.WINDOW   # rebuilt snapshots kept for viewers of the past
+
+class Run:
+    """A long `run` of one client, simulated in frame-sized chunks in a background task.
+
+    Pause and cancel take effect between chunks, never in the middle of a simulator request,
+    so the shared history always matches the simulator. `on_frame(run)` is awaited at most
+    RUN_FPS times a second and once more when the run stops; the client's cursor follows the run
+    and stays on the last cycle it reached. A run that was replaced or whose client left touches
+    neither the cursor nor the client's frames again.
+    """
+
+    def __init__(self, session, sid, cycles, on_frame=None, fps=RUN_FPS):
+        self.session, self.sid, self.on_frame = session, sid, on_frame
+        self.start = self.pos = session.cursor(sid)
+        self.target = self.start + max(0, cycles)
+        self.interval = 1 / fps
+        self.state = "running"       # running, paused, done, cancelled or failed
+        self.error = None
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._cancel = False
+        self.task = asyncio.create_task(self._run())
+
+    def status(self):
+        return {"state": self.state, "cycles": self.pos - self.start, "total": self.target - self.start,
+                "index": self.pos, "error": self.error}
+
+    def pause(self):
+        if self.state == "running": self.state = "paused"; self._resume.clear()
+
+    def resume(self):
+        if self.state == "paused": self.state = "running"; self._resume.set()
+
+    def cancel(self):
+        self._cancel = True
+        self._resume.set()
+
+    @property
+    def active(self):
+        return not self.task.done()
+
+    @property
+    def current(self):
+        """Still this client's run: not replaced by a newer one, and the client has not left."""
+        return self.session.runs.get(self.sid) is self
+
+    async def _frame(self):
+        if self.on_frame: await self.on_frame(self)
+
+    async def _run(self):
+        chunk, last = RUN_CHUNK[0], 0.0
+        try:
+            while self.pos < self.target and not self._cancel:
+                if not self._resume.is_set():
+                    await self._frame()
+                    await self._resume.wait()
+                    continue
+                # 1. One chunk, then size the next one to take about one frame
+                want = min(chunk, self.target - self.pos)
+                t0 = time.perf_counter()
+                await self.session.extend_to(self.pos + want)
+                dt = time.perf_counter() - t0
+                reached = min(self.pos + want, self.session.head)
+                if reached <= self.pos: break                        # the simulator ran out of cycles
+                self.pos = reached
+                if not self.current: break       # replaced, or the client left, during the chunk
+                self.session.cursors[self.sid] = reached
+                chunk = max(RUN_CHUNK[0], min(RUN_CHUNK[1], int(want * self.interval / max(dt, 1e-6))))
+                # 2. Coalesced progress: whatever the latest cycle is when a frame is due
+                if t0 + dt - last >= self.interval:
+                    last = t0 + dt
+                    await self._frame()
+            self.state = "cancelled" if self._cancel else "done"
+        except (asyncio.TimeoutError, TimeoutError, ConnectionError) as e:
+            self.state, self.error = "failed", str(e) or type(e).__name__
+        if self.current: await self._frame()
+
+class Session:
+    """One simulation shared by every browser: an append-only history and a cursor per client.
+
+    Moving past the live head simulates the missing cycles once, under a lock, so viewers that
+    ask for the same cycles at the same time share a single run instead of stepping twice.
+    Moving before the oldest retained cycle (or `goto` a cycle from before a reset) replays the
+    simulator through a window of logged cycles instead (see live_debug.checkpoints); the simulator
+    goes back to the live head before anything advances it again.
+    """
+
+    def __init__(self, bridge, max_history_bytes=256 * 2**20):
+        self.bridge = bridge
+        self.history = SnapshotHistory(max_bytes=max_history_bytes)
+        self.index = HistoryIndex()  # PCs, register writes, memory accesses... -> history indices
+        self.columns = ColumnBuffer()  # hazard/forwarding/PC columns for the stats panel
+        self.memory = ShadowMemory()   # data memory at any cycle, rebuilt from the stores
+        self.mem_views = {}          # sid -> base of the memory page its panel shows
+        self.rom = []
+        self.cursors = {}            # sid -> absolute history index
+        self.epoch = 0               # bumped by reset, which restarts the shared history
+        self.breakpoints = []        # simulator-side breakpoints, as listed by the last `bp` ack
+        self.events = []             # simulator-side event subscription, as listed by the last `sub` ack
+        self.runs = {}               # sid -> its background Run
+        self.checkpoints = checkpoints.Checkpoints()   # every cycle seen, across resets
+        self.rebuilt = OrderedDict() # cycle -> (snapshot, matches its checkpoint), LRU
+        self.past = {}               # sid -> rebuilt cycle it views (instead of its cursor)
+        self.displaced = None        # the simulator's cycle while it is off the live head
+        self._advance = asyncio.Lock()
+        bridge.on_hello = self._hello
+
+    @property
+    def head(self):
+        return len(self.history) - 1
+
+    def _append(self, snap):
+        self.history.append(snap)
+        if self.checkpoints.add(snap) is False: print(f"❌ Cycle {snap.get('cycle')} differs from the earlier run")
+        self.index.add(self.head, snap)
+        self.index.evict(self.history.start)
+        self.columns.add(snap)
+        self.memory.add(snap)
+        self.columns.evict(self.history.start)
+        if snap.get("rom"): self.rom = snap["rom"]
+
+    async def join(self, sid):
+        """Attach a client at the live head (connecting to the simulator on first use)."""
+        async with self._advance:
+            if not self.bridge.connected:
+                initial = await self.bridge.connect()
+                if initial: self._hello(initial)
+        self.cursors[sid] = self.head
+        return self.head
+
+    def leave(self, sid):
+        run = self.runs.pop(sid, None)
+        if run: run.cancel()
+        self.cursors.pop(sid, None)
+        self.mem_views.pop(sid, None)
+        self.past.pop(sid, None)
+
+    def start_run(self, sid, cycles, on_frame=None):
+        """Run `cycles` forward in the background (replacing this client's previous run)."""
+        old = self.runs.get(sid)
+        if old: old.cancel()
+        self.past.pop(sid, None)
+        self.runs[sid] = run = Run(self, sid, cycles, on_frame)
+        return run
+
+    def cursor(self, sid):
+        c = self.cursors.get(sid, self.head)
+        return max(self.history.start, min(c, self.head))
+
+    def snapshot(self, sid):
+        if sid in self.past: return self.rebuilt[self.past[sid]][0]
+        if not self.history: return None
+        return self.history[self.cursor(sid)]
+
+    # --- the past, rebuilt from checkpoints ---------------------------------
+    async def _replay(self, steps):
+        out = []
+        for op, n in steps:
+            if op == "reset": out.append(await self.bridge.reset())
+            elif op == "run": out += await self.bridge.request(f"run {n}", 1, self.bridge.timeout * max(1, n // GO_MAX))
+            else: out += await self.bridge.step(n)
+        return out
+
+    async def _restore(self):
+        """Back to the live head after a rebuild (call under _advance)."""
+        if self.displaced is None: return
+        head, at = self.history[-1], self.displaced
+        self.displaced = None
+        s = (await self._replay(checkpoints.plan([head.get("cycle")], at)))[-1]
+        if checkpoints.state_hash(s) != checkpoints.state_hash(head):
+            print(f"❌ Replaying to cycle {head.get('cycle')} did not reproduce the live head")
+
+    async def _show(self, sid, p, direction=0):
+        """Put this client on the p-th logged cycle, rebuilding a window around it if needed."""
+        c = self.checkpoints.cycles[p]
+        if c not in self.rebuilt:
+            cycles = self.checkpoints.window(p, direction)
+            async with self._advance:
+                at = self.displaced if self.displaced is not None else self.history[-1].get("cycle")
+                snaps = await self._replay(checkpoints.plan(cycles, at))
+                self.displaced = snaps[-1].get("cycle")
+            self.rebuilt.update(checkpoints.rebuild(self.checkpoints, cycles, snaps))
+            viewed = set(self.past.values()) | {c}
+            for old in [k for k in self.rebuilt if k not in viewed][:max(0, len(self.rebuilt) - REBUILT_KEEP)]:
+                del self.rebuilt[old]
+        self.rebuilt.move_to_end(c)
+        self.past[sid] = c
+
+    def _kept(self, cycle):
+        return bool(self.history) and self.history[self.history.start].get("cycle") <= cycle <= self.history[-1].get("cycle")
+
+    async def goto(self, sid, cycle):
+        """Move this client to any cycle seen so far: into the history if it is kept there, else rebuilt."""
+        if self._kept(cycle):
+            lo, hi = self.history.start, self.head
+            while lo < hi:               # the last history entry at or before `cycle`
+                mid = (lo + hi + 1) // 2
+                if self.history[mid].get("cycle") <= cycle: lo = mid
+                else: hi = mid - 1
+            self.past.pop(sid, None)
+            self.cursors[sid] = lo
+            return {"found": True, "cycle": self.history[lo].get("cycle"), "rebuilt": False}
+        p = self.checkpoints.position(cycle)
+        if p is None: return {"found": False, "error": f"cycle {cycle} was never recorded"}
+        await self._show(sid, p)
+        return {"found": True, "cycle": cycle, "rebuilt": True, "verified": self.rebuilt[cycle][1]}
+
+    async def extend_to(self, index):
+        """Make sure `index` exists in the history, simulating only cycles nobody has run yet."""
+        async with self._advance:
+            missing = index - self.head
+            if missing > 0:
+                await self._restore()
+                for snap in await self.bridge.step(missing):
+                    self._append(snap)
+
+    async def move(self, sid, delta):
+        """Move one client's cursor by `delta`, extending the shared history if needed (or, before the
+        oldest retained cycle, rebuilding the past)."""
+        if sid in self.past:
+            p = max(0, min(self.checkpoints.position(self.past[sid]) + delta, len(self.checkpoints) - 1))
+            c = self.checkpoints.cycles[p]
+            if self._kept(c): await self.goto(sid, c)
+            else: await self._show(sid, p, delta)
+            return self.cursor(sid)
+        target = self.cursor(sid) + delta
+        if target < self.history.start and self.history:
+            first = self.checkpoints.before(self.history[self.history.start].get("cycle"))
+            if first > 0:
+                await self._show(sid, max(0, first - (self.history.start - target)), -1)
+                return self.cursor(sid)
+        if target > self.head: await self.extend_to(target)
+        self.cursors[sid] = max(self.history.start, min(target, self.head))
+        return self.cursors[sid]
+
+    def seek(self, sid, key, forward=True):
+        """Move this client to the nearest recorded cycle matching an index key; None if there is none."""
+        c = self.cursor(sid)
+        i = self.index.next(key, c) if forward else self.index.prev(key, c)
+        if i is not None:
+            self.cursors[sid] = i
+            self.past.pop(sid, None)
+        return i
+
+    def stats(self, top=10):
+        """CPI, stalls, flushes, forwarding and per-PC hotspots over the retained history."""
+        return analyze(self.columns.columns(), self.rom, top)
+
+    def memory_view(self, sid):
+        """The memory page this client watches, at the cycle under its cursor (None if it watches none)."""
+        base = self.mem_views.get(sid)
+        snap = self.snapshot(sid)
+        if base is None or snap is None: return None
+        return self.memory.view(base, snap.get("cycle"))
+
+    async def bp(self, args):
+        """Edit the shared breakpoints (`add ...`, `del <id>`, `clear`, `list`); returns the ack."""
+        async with self._advance:
+            ack = await self.bridge.bp(args)
+        self.breakpoints = ack.get("bps", [])
+        return ack
+
+    async def continue_to_bp(self, sid, max_cycles=100000):
+        """Run the simulator from the live head until a breakpoint fires and put this client there."""
+        async with self._advance:
+            await self._restore()
+            snap = await self.bridge.until_bp(max_cycles)
+            self._append(snap)
+            self.breakpoints = (await self.bridge.bp("list")).get("bps", [])   # fresh hit counts
+        self.cursors[sid] = self.head
+        self.past.pop(sid, None)
+        return snap.get("until", {})
+
+    async def subscribe(self, events):
+        """Set (or with "list" just read) the shared event subscription; returns the ack."""
+        async with self._advance:
+            ack = await self.bridge.subscribe(events)
+        self.events = ack.get("events", [])
+        return ack
+
+    async def go(self, sid, max_cycles=100000, heartbeat=10000):
+        """Run from the live head keeping only subscribed events and heartbeats; this client ends at the last cycle."""
+        async with self._advance:
+            await self._restore()
+            snaps, ack = await self.bridge.go(max_cycles, heartbeat)
+            for snap in snaps: self._append(snap)
+        self.cursors[sid] = self.head
+        self.past.pop(sid, None)
+        return ack
+
+    def _new_run(self, initial):
+        """Start the shared history again from `initial`; every client goes back to its start."""
+        self.displaced = None
+        self.past.clear()
+        self.history.clear()
+        self.index.clear()
+        self.columns.clear()
+        self.memory.clear()
+        if initial: self._append(initial)
+        self.epoch += 1
+        for sid in self.cursors: self.cursors[sid] = 0
+
+    def _hello(self, snap):
+        """The snapshot a (re)connection starts with: the next cycle of this run, the head again,
+        or a simulator that started over."""
+        c = snap.get("cycle", 0)
+        if self.displaced is not None:       # it was replaying the past, and is wherever that left it
+            self.displaced = c
+            return
+        head = self.history[self.head].get("cycle", -1) if self.history else -1
+        if c > head: self._append(snap)
+        elif c < head: self._new_run(snap)
+
+    async def reset(self):
+        """Reset the core; every client goes back to cycle 0 of the new history (runs are cancelled)."""
+        for run in list(self.runs.values()): run.cancel()
+        async with self._advance:
+            self._new_run(await self.bridge.reset())
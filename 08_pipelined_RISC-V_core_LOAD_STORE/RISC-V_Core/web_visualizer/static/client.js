@@ -15,6 +15,7 @@ for (let i = 0; i < 32; i++) {
 document.addEventListener('keydown', (e) => {
     if (e.key === "ArrowRight") sendCommand('step');
     if (e.key === "ArrowLeft")  sendCommand('back');
+    if (e.key === "Escape")     sendCommand('run_control', 'cancel');
 });
 
 // --- NEW: Toggle Listeners (Instant Update) ---
@@ -38,6 +39,8 @@ socket.on('update', (packet) => {
     const regs = packet.registers;
 
     document.getElementById('cycle-display').innerText = data.cycle || 0;
+    const rb = packet.rebuilt;
+    document.getElementById('rebuilt-badge').innerText = rb ? (rb.verified ? '♻️ rebuilt ✓' : '♻️ rebuilt ❌ differs from the recorded run') : '';
 
     // A. Update Register Grid
     for(let i=0; i<32; i++) {
@@ -64,6 +67,7 @@ socket.on('update', (packet) => {
     }
 
     // C. Update Lists & Visuals
+    updateBreakpointStatus(data);
     updateInstList(packet.enriched);
     updateHazardPanel(data);
     updateSVG(data);
@@ -273,13 +277,16 @@ function updateInstList(data) {
         data.rom.forEach((hex, index) => {
             const pcVal = index * 4;
             const pcHex = "0x" + pcVal.toString(16).padStart(8, '0');
-            const asm = disassemble(hex);
+            const asm = data.rom_asm ? data.rom_asm[index] : disassemble(hex);
             const row = document.createElement('div');
             row.id = `rom-addr-${pcHex}`;
             row.style.borderBottom = "1px solid #333";
             row.style.padding = "2px 5px";
             row.style.fontFamily = "monospace";
             row.style.fontSize = "12px";
+            row.style.cursor = "pointer";
+            row.title = "Click to break when this PC is fetched";
+            row.onclick = () => sendCommand('bp', `add if_pc ${pcHex}`);
             row.innerHTML = `
                 <span style="color:#666; display:inline-block; width:70px;">${pcHex}</span>
                 <span style="color:#4caf50; display:inline-block; width:80px;">${hex}</span>
@@ -302,6 +309,139 @@ function updateInstList(data) {
     }
 }
 
+// --- 7. BREAKPOINTS (kept by the simulator, shared by all viewers) ---
+socket.on('breakpoints', (msg) => {
+    const list = document.getElementById('bp-list');
+    if (!list) return;
+    if (!msg.bps || msg.bps.length === 0) {
+        list.innerHTML = '<div style="color:#666; padding:5px;">No breakpoints</div>';
+    } else {
+        list.innerHTML = msg.bps.map(bp => {
+            const from = bp.count > 1 ? ` (from hit ${bp.count})` : "";
+            return `<div style="padding:3px 5px; border-bottom:1px solid #333;">
+                <span style="color:#f44747;">●</span> #${bp.id} ${bp.kind} ${bp.op} 0x${Number(bp.value).toString(16)}${from}
+                <span style="color:#888;">hits=${bp.hits}</span>
+                <button onclick="sendCommand('bp', 'del ${bp.id}')" style="float:right;">✕</button></div>`;
+        }).join('');
+    }
+    document.getElementById('bp-error').innerText = msg.error || "";
+});
+
+function addBreakpoint() {
+    const input = document.getElementById('bp-input');
+    if (input.value.trim()) sendCommand('bp', 'add ' + input.value.trim());
+    input.value = "";
+}
+
+function updateBreakpointStatus(data) {
+    const status = document.getElementById('bp-status');
+    if (!status || !data.until) return;
+    if (data.until.hit && data.until.bp) status.innerText = `🔴 Breakpoint #${data.until.bp} hit after ${data.until.steps} cycles`;
+    else if (data.until.steps) status.innerText = `No breakpoint hit in ${data.until.steps} cycles`;
+    else status.innerText = "";
+}
+
+// --- 7b. BACKGROUND RUNS (progress frames are rate-limited on the server) ---
+let runState = null;
+
+function toggleRunPause() {
+    sendCommand('run_control', runState === 'paused' ? 'resume' : 'pause');
+}
+
+socket.on('run_state', (st) => {
+    runState = st.state;
+    const active = st.state === 'running' || st.state === 'paused';
+    document.getElementById('run-controls').style.display = (active || st.state === 'failed') ? 'inline' : 'none';
+    document.getElementById('run-pause').innerText = st.state === 'paused' ? '▶ Resume' : '⏸ Pause';
+    const pct = st.total ? Math.floor(100 * st.cycles / st.total) : 100;
+    document.getElementById('run-progress').innerText = st.state === 'failed'
+        ? `Run failed: ${st.error}` : `${st.state} ${st.cycles}/${st.total} (${pct}%)`;
+});
+
+// --- 8. HISTORY SEARCH (indexed on the server, no linear scans) ---
+function seek(dir) {
+    const query = document.getElementById('seek-input').value.trim();
+    if (query) socket.emit('command', { action: 'seek', value: query, dir: dir });
+}
+
+// Any cycle seen so far; the server replays evicted and pre-reset ones and checks them against their hashes
+function gotoCycle() {
+    const cycle = parseInt(document.getElementById('goto-input').value);
+    if (!isNaN(cycle)) socket.emit('command', { action: 'goto', value: cycle });
+}
+
+socket.on('goto_result', (res) => {
+    document.getElementById('seek-status').innerText = res.found ? "" : res.error;
+});
+
+socket.on('seek_result', (res) => {
+    const status = document.getElementById('seek-status');
+    if (res.error) status.innerText = res.error;
+    else status.innerText = res.found ? "" : "No match in recorded history";
+});
+
+// --- 9. RUN TO EVENTS (the simulator only sends cycles with a subscribed event, plus heartbeats) ---
+function subscribe() {
+    const input = document.getElementById('sub-input');
+    sendCommand('sub', input.value.trim() || 'list');
+    input.value = "";
+}
+
+function goEvents() {
+    const n = parseInt(document.getElementById('go-cycles').value) || 100000;
+    socket.emit('command', { action: 'go', value: n, heartbeat: 10000 });
+    document.getElementById('go-status').innerText = `Running up to ${n} cycles...`;
+}
+
+socket.on('events', (msg) => {
+    document.getElementById('sub-list').innerText = msg.events && msg.events.length ? msg.events.join(' · ') : 'no events (heartbeats only)';
+    document.getElementById('sub-error').innerText = msg.error || "";
+});
+
+socket.on('go_result', (ack) => {
+    document.getElementById('go-status').innerText =
+        `${ack.events} events in ${ack.steps} cycles` + (ack.done ? ' · core finished' : '');
+});
+
+// --- 10. DATA MEMORY (shadow memory on the server, at the cycle under the cursor) ---
+function watchMemory(addr) {
+    if (addr) sendCommand('mem', addr);
+}
+
+socket.on('memory', (m) => {
+    const status = document.getElementById('mem-status');
+    if (m.error) { status.innerText = m.error; return; }
+    const hex = (x) => '0x' + x.toString(16).padStart(8, '0');
+    status.innerText = `Cycle ${m.cycle} · ${m.stores} stores` + (m.missed ? ` · ${m.missed} cycles skipped (stores there missing)` : '');
+    const pages = document.getElementById('mem-pages');
+    pages.innerHTML = '<option value="">touched pages</option>' +
+        m.pages.map(p => `<option value="${hex(p)}" ${p === m.base ? 'selected' : ''}>${hex(p)}</option>`).join('');
+    let rows = '';
+    for (let i = 0; i < m.words.length; i += 4) {
+        const cells = m.words.slice(i, i + 4).map((w, k) => {
+            const now = m.stored_at[i + k] === m.cycle;
+            return `<td style="color:${w === null ? '#555' : now ? '#ffcc00' : '#9cdcfe'};">${w === null ? '--------' : w.toString(16).padStart(8, '0')}</td>`;
+        }).join('');
+        rows += `<tr><td style="color:#888;">${hex(m.base + 4 * i)}</td>${cells}</tr>`;
+    }
+    document.getElementById('mem-table').innerHTML = rows;
+});
+
+// --- 11. PERFORMANCE (CPI, stall/flush attribution, hotspots over the recorded history) ---
+socket.on('stats', (r) => {
+    const pct = (x) => r.records ? (100 * x / r.records).toFixed(1) + '%' : '-';
+    const fwd = (op) => Object.entries(r.forwarding[op]).map(([src, n]) => `${src} ${n}`).join(' · ');
+    document.getElementById('stats-summary').innerHTML = `
+        <div>Cycles <b>${r.cycles}</b> · retired <b>${r.retired}</b> · CPI <b style="color:#ffcc00;">${r.cpi ? r.cpi.toFixed(3) : '-'}</b>${r.dense ? '' : ' (sampled)'}</div>
+        <div>Stalls ${r.stall_cycles} (${pct(r.stall_cycles)}) · flushes ${r.flush_cycles} (${pct(r.flush_cycles)}, ${r.flushes} redirects)</div>
+        <div>Fwd A: ${fwd('a')}</div><div>Fwd B: ${fwd('b')}</div>`;
+    const rows = r.hotspots.map(h => `<tr style="border-bottom:1px solid #333; cursor:pointer;" onclick="sendCommand('bp', 'add if_pc 0x${h.pc.toString(16)}')">
+        <td>0x${h.pc.toString(16).padStart(4, '0')}</td><td>${h.executed}</td><td style="color:#f44747;">${h.stall_cycles}</td>
+        <td>${h.waited_cycles}</td><td style="color:#ffcc00;">${h.flush_cycles}</td><td style="color:#9cdcfe;">${h.asm}</td></tr>`).join('');
+    document.getElementById('stats-hotspots').innerHTML =
+        `<tr style="color:#888;"><th>PC</th><th>exec</th><th>stall</th><th>waited</th><th>flush</th><th></th></tr>` + rows;
+});
+
 function getControlSignals(hexStr) {
     const inst = Number(hexStr);
     if (isNaN(inst) || inst === 0) return { type: 'BUBBLE', usesEx: false, usesMem: false, usesWB: false };